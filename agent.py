@@ -28,7 +28,8 @@ def handle_agent_chat():
             # Generate full job description using advanced method
             from services.job_service import generate_full_job_description
             use_ruler = st.session_state.get("use_ruler", False)
-            num_candidates = st.session_state.get("ruler_num_candidates", 3)
+            from helpers.config_helper import get_num_candidates_from_session
+            num_candidates = get_num_candidates_from_session()
             job_dict = generate_full_job_description(
                 job_title, 
                 config, 
@@ -39,7 +40,7 @@ def handle_agent_chat():
             from helpers.config_helper import update_session_from_job_body
             update_session_from_job_body(job_dict)
             if use_ruler:
-                answer = f"I generated {num_candidates} candidates, ranked them with RULER, and selected the best one. All sections have been filled."
+                answer = f"I generated {job_dict.get('ruler_num_candidates') or num_candidates} candidates, ranked them with RULER, and selected the best one. All sections have been filled."
             else:
                 answer = "I generated a complete job description using advanced AI generation and filled all sections."
         else:
@@ -14,6 +14,27 @@ try:
 except Exception as e:
     logger.warning(f"Style index startup check failed (will use defaults): {e}")
 
+# Compile the blackboard graph once per process and warm the checkpointer pool
+try:
+    from services.startup import ensure_graph_runtime
+    ensure_graph_runtime()
+except Exception as e:
+    logger.warning(f"Graph runtime startup failed (will start lazily): {e}")
+
+# Start the generation job workers (JOB_QUEUE_ENABLED)
+try:
+    from services.startup import ensure_job_workers
+    ensure_job_workers()
+except Exception as e:
+    logger.warning(f"Job worker startup failed: {e}")
+
+# Serve Prometheus metrics on a side port (METRICS_ENABLED)
+try:
+    from services.startup import ensure_metrics_server
+    ensure_metrics_server()
+except Exception as e:
+    logger.warning(f"Metrics endpoint startup failed: {e}")
+
 # Initialize Langfuse tracing (standard when API keys are configured)
 from config import LANGFUSE_ENABLED, LANGFUSE_SECRET_KEY, LANGFUSE_PUBLIC_KEY
 if LANGFUSE_ENABLED:
@@ -0,0 +1 @@
+# benchmarks — latency / overhead harnesses (run with python -m benchmarks.<name>)
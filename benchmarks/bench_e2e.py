@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+End-to-end latency benchmark for the blackboard graph with per-node percentiles.
+
+Runs N scenarios from ``evals/eval_dataset.json`` through the full graph
+(``generate_with_graph``) against one of three backends:
+
+  live      whatever OPENROUTER_BASE_URL / OPENROUTER_API_KEY point at
+  standin   benchmarks/fake_openrouter.py, started in-process with the given
+            latency / error model
+  cassette  a recording from benchmarks/bench_orchestration.py (replayed with
+            the recorded timings)
+
+Reported per run: total latency p50/p95/p99, per-node wall time (style_router,
+scrape_company, generator, ruler_scorer, style_expert, ruler_scorer_after_style,
+curator, persist), LLM tokens per generation (LangChain calls; the LiteLLM
+judge is not included), and queue wait (concurrency governor per model,
+checkpointer pool).  Results are written to JSON; pass a previous file as
+``--baseline`` to diff against it with a regression threshold.
+
+Usage
+─────
+    python -m benchmarks.bench_e2e --backend standin --scenarios 20 --concurrency 4 \\
+        --output benchmarks/baselines/e2e_standin.json
+    python -m benchmarks.bench_e2e --backend standin --scenarios 20 --concurrency 4 \\
+        --baseline benchmarks/baselines/e2e_standin.json --max-regression 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+GRAPH_NODES = (
+    "style_router",
+    "scrape_company",
+    "generator",
+    "ruler_scorer",
+    "style_expert",
+    "ruler_scorer_after_style",
+    "curator",
+    "persist",
+)
+
+_DEFAULT_DATASET = Path(__file__).resolve().parent.parent / "evals" / "eval_dataset.json"
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _dist(samples: List[float]) -> Dict[str, float]:
+    return {
+        "n": len(samples),
+        "mean_ms": round(statistics.fmean(samples), 2) if samples else 0.0,
+        "p50_ms": round(_percentile(samples, 50), 2),
+        "p95_ms": round(_percentile(samples, 95), 2),
+        "p99_ms": round(_percentile(samples, 99), 2),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Per-generation recorder (LangChain callback attached through a context var)
+# ---------------------------------------------------------------------------
+
+_recorder_var: contextvars.ContextVar = contextvars.ContextVar("bench_e2e_recorder", default=None)
+
+
+def _make_recorder_cls():
+    from langchain_core.callbacks import BaseCallbackHandler
+    from langchain_core.tracers.context import register_configure_hook
+
+    class NodeRecorder(BaseCallbackHandler):
+        """Node wall time + LLM tokens for one generation."""
+
+        run_inline = True  # time on the event loop, not in an executor
+
+        def __init__(self):
+            self.node_ms: Dict[str, float] = {}
+            self.tokens = {"prompt": 0, "completion": 0, "llm_calls": 0}
+            self._open: Dict[Any, tuple] = {}
+
+        def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+            node = (metadata or {}).get("langgraph_node")
+            if node and kwargs.get("name") == node:
+                self._open[run_id] = (node, time.perf_counter())
+
+        def _close(self, run_id) -> None:
+            opened = self._open.pop(run_id, None)
+            if opened:
+                node, t0 = opened
+                self.node_ms[node] = self.node_ms.get(node, 0.0) + (time.perf_counter() - t0) * 1000
+
+        def on_chain_end(self, outputs, *, run_id, **kwargs):
+            self._close(run_id)
+
+        def on_chain_error(self, error, *, run_id, **kwargs):
+            self._close(run_id)
+
+        def on_llm_end(self, response, *, run_id, **kwargs):
+            self.tokens["llm_calls"] += 1
+            for generations in response.generations:
+                for gen in generations:
+                    usage = getattr(getattr(gen, "message", None), "usage_metadata", None) or {}
+                    self.tokens["prompt"] += usage.get("input_tokens", 0)
+                    self.tokens["completion"] += usage.get("output_tokens", 0)
+
+    register_configure_hook(_recorder_var, True)
+    return NodeRecorder
+
+
+# ---------------------------------------------------------------------------
+# Backends / scenarios
+# ---------------------------------------------------------------------------
+
+def _start_backend(args) -> Optional[Any]:
+    """Start the stand-in / cassette server if requested and point the app at it."""
+    server = None
+    if args.backend == "standin":
+        from benchmarks.fake_openrouter import start_server
+        server = start_server(
+            latency_ms=args.latency_ms,
+            latency_sigma=args.latency_sigma,
+            ttft_ms=args.ttft_ms,
+            error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limit_rate,
+            seed=args.seed,
+        )
+    elif args.backend == "cassette":
+        from benchmarks.cassette import start_cassette_server
+        server = start_cassette_server(args.cassette, mode="replay", timing="recorded")
+    if server is not None:
+        os.environ["OPENROUTER_BASE_URL"] = server.base_url
+        os.environ["OPENROUTER_API_BASE"] = server.base_url  # LiteLLM (RULER judge)
+        os.environ.setdefault("OPENROUTER_API_KEY", "bench")
+    if not args.with_caches:
+        for flag in ("RESULT_CACHE_ENABLED", "LLM_CACHE_ENABLED"):
+            os.environ[flag] = "false"
+    return server
+
+
+def _load_scenarios(dataset: str, limit: int, seed: int) -> List[Dict[str, Any]]:
+    path = Path(dataset)
+    if path.exists():
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    else:
+        from evals.generate_eval_dataset import generate_dataset
+        chunks = Path(__file__).resolve().parent.parent / "duty_chunks.jsonl"
+        print(f"[bench] {path} not found, sampling scenarios from {chunks.name}")
+        raw = generate_dataset(str(chunks), num_categories=max(1, (limit + 1) // 2), seed=seed)
+    return raw[:limit] if limit else raw
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+async def run_benchmark(scenarios: List[Dict[str, Any]], concurrency: int) -> Dict[str, Any]:
+    from graph.runtime import get_graph_runtime
+    from models.job_models import JobGenerationConfig
+    from services.concurrency import get_governor
+    from services.graph_service import generate_with_graph
+
+    recorder_cls = _make_recorder_cls()
+    semaphore = asyncio.Semaphore(concurrency)
+    totals: List[float] = []
+    node_samples: Dict[str, List[float]] = {node: [] for node in GRAPH_NODES}
+    tokens: List[Dict[str, int]] = []
+    errors: List[str] = []
+
+    async def one(scenario: Dict[str, Any]) -> None:
+        cfg = JobGenerationConfig(
+            language=scenario["language"],
+            formality=scenario["formality"],
+            company_type=scenario["company_type"],
+            seniority_label=scenario["seniority_label"],
+        )
+        async with semaphore:
+            recorder = recorder_cls()
+            _recorder_var.set(recorder)  # this task's context only
+            t0 = time.perf_counter()
+            try:
+                await generate_with_graph(scenario["job_title"], cfg, user_id="bench_e2e", regenerate=True)
+            except Exception as e:
+                errors.append(f"{scenario.get('scenario_id', scenario['job_title'])}: {type(e).__name__}: {e}")
+                return
+            totals.append((time.perf_counter() - t0) * 1000)
+            for node, ms in recorder.node_ms.items():
+                node_samples.setdefault(node, []).append(ms)
+            tokens.append(dict(recorder.tokens))
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*[one(s) for s in scenarios])
+    wall_s = time.perf_counter() - t0
+
+    return {
+        "scenarios": len(scenarios),
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_per_min": round(len(totals) / wall_s * 60, 2) if wall_s > 0 else 0.0,
+        "total": _dist(totals),
+        "nodes": {node: _dist(samples) for node, samples in node_samples.items() if samples},
+        "tokens_per_generation": {
+            key: round(statistics.fmean(t[key] for t in tokens), 1) if tokens else 0.0
+            for key in ("prompt", "completion", "llm_calls")
+        },
+        "queue": {
+            "governor": {
+                model: {"avg_wait_ms": s["avg_wait_ms"], "peak_in_flight": s["peak_in_flight"], "limit": s["limit"]}
+                for model, s in get_governor().stats().items()
+            },
+            "checkpointer_avg_wait_ms": get_graph_runtime().stats().get("avg_wait_ms", 0.0),
+        },
+    }
+
+
+def _print_report(result: Dict[str, Any]) -> None:
+    total = result["total"]
+    print(
+        f"[bench] {total['n']} generation(s), {result['throughput_per_min']}/min, "
+        f"total p50={total['p50_ms']:.0f} ms  p95={total['p95_ms']:.0f}  p99={total['p99_ms']:.0f}"
+    )
+    print(f"  {'node':<26}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for node in GRAPH_NODES:
+        row = result["nodes"].get(node)
+        if row:
+            print(f"  {node:<26}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}")
+    print(f"  tokens/generation: {result['tokens_per_generation']}")
+    print(f"  queue wait: {result['queue']}")
+    if result["errors"]:
+        print(f"  errors ({len(result['errors'])}): {result['errors'][:3]}")
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], max_regression: float, min_delta_ms: float) -> List[str]:
+    """Diff percentiles against *baseline*; a metric regresses if it grew by more than
+    *max_regression* (relative) AND *min_delta_ms* (absolute, filters noise on tiny nodes)."""
+    failures = []
+    pairs = [("total", result["total"], baseline.get("total", {}))]
+    pairs += [
+        (f"node:{node}", row, baseline.get("nodes", {}).get(node, {}))
+        for node, row in result["nodes"].items()
+    ]
+    for label, now, base in pairs:
+        for metric in ("p50_ms", "p95_ms"):
+            old, new = base.get(metric), now.get(metric)
+            if not old or new is None:
+                continue
+            growth = (new - old) / old
+            if growth > max_regression and new - old > min_delta_ms:
+                failures.append(f"{label} {metric} {old:.1f} -> {new:.1f} ({growth:+.0%})")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="End-to-end graph latency benchmark with per-node percentiles.")
+    parser.add_argument("--backend", choices=("live", "standin", "cassette"), default="standin")
+    parser.add_argument("--dataset", default=str(_DEFAULT_DATASET), help="Eval dataset JSON")
+    parser.add_argument("--scenarios", type=int, default=20, help="Number of scenarios (0 = all)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent generations (default: 4)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--with-caches", action="store_true", help="Keep result / LLM response caches on")
+    # stand-in latency model
+    parser.add_argument("--latency-ms", type=float, default=1500.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.4)
+    parser.add_argument("--ttft-ms", type=float, default=300.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    # cassette backend
+    parser.add_argument("--cassette", help="Cassette for --backend cassette")
+    # output / comparison
+    parser.add_argument("--output", help="Write results JSON here (usable as a later --baseline)")
+    parser.add_argument("--baseline", help="Previous results JSON to diff against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Relative budget (default: 0.2)")
+    parser.add_argument("--min-delta-ms", type=float, default=25.0, help="Ignore smaller absolute changes")
+    args = parser.parse_args()
+    if args.backend == "cassette" and not args.cassette:
+        parser.error("--backend cassette requires --cassette")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Environment first: config is read on first import
+        os.environ["GRAPH_THREADS_DB_PATH"] = str(Path(tmp) / "bench_threads.sqlite")
+        server = _start_backend(args)
+        scenarios = _load_scenarios(args.dataset, args.scenarios, args.seed)
+        print(f"[bench] backend={args.backend} scenarios={len(scenarios)} concurrency={args.concurrency}")
+        try:
+            result = asyncio.run(run_benchmark(scenarios, args.concurrency))
+        finally:
+            if server is not None:
+                server.shutdown()
+    result["backend"] = args.backend
+    _print_report(result)
+
+    if args.output:
+        path = Path(args.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+        print(f"[bench] results written to {path}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        failures = compare(result, baseline, args.max_regression, args.min_delta_ms)
+        if failures:
+            print(f"[bench] REGRESSION vs {args.baseline}:")
+            for failure in failures:
+                print(f"  - {failure}")
+            sys.exit(1)
+        print(f"[bench] within budget vs {args.baseline} (+{args.max_regression:.0%})")
+
+
+if __name__ == "__main__":
+    main()
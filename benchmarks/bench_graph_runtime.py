@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Per-request graph setup overhead — before vs. after the pooled runtime.
+
+Measures only the orchestration setup that happens before the first node
+runs (no LLM calls):
+
+  before  build_job_graph() per request: declare + compile the StateGraph,
+          aiosqlite.connect(), new InMemoryStore, close the connection.
+  after   GraphRuntime.borrow(): take a pooled, pre-compiled graph bound
+          to an open checkpointer connection and hand it back.
+
+Usage
+─────
+    python -m benchmarks.bench_graph_runtime                    # defaults
+    python -m benchmarks.bench_graph_runtime --requests 200 --concurrency 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List
+
+from graph.job_graph import build_job_graph
+from graph.runtime import GraphRuntime
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _report(label: str, samples_ms: List[float], wall_s: float) -> dict:
+    row = {
+        "label": label,
+        "n": len(samples_ms),
+        "mean_ms": round(statistics.fmean(samples_ms), 3) if samples_ms else 0.0,
+        "p50_ms": round(_percentile(samples_ms, 50), 3),
+        "p95_ms": round(_percentile(samples_ms, 95), 3),
+        "p99_ms": round(_percentile(samples_ms, 99), 3),
+        "req_per_s": round(len(samples_ms) / wall_s, 1) if wall_s > 0 else 0.0,
+    }
+    print(
+        f"  {label:<8} n={row['n']:<5} mean={row['mean_ms']:>8.3f} ms  "
+        f"p50={row['p50_ms']:>8.3f}  p95={row['p95_ms']:>8.3f}  "
+        f"p99={row['p99_ms']:>8.3f}  ({row['req_per_s']} req/s)"
+    )
+    return row
+
+
+async def _drive(
+    one_request: Callable[[], Awaitable[None]],
+    requests: int,
+    concurrency: int,
+) -> tuple[List[float], float]:
+    """Run *requests* calls with bounded concurrency; return per-call ms + wall time."""
+    semaphore = asyncio.Semaphore(concurrency)
+    samples: List[float] = []
+
+    async def timed() -> None:
+        async with semaphore:
+            t0 = time.perf_counter()
+            await one_request()
+            samples.append((time.perf_counter() - t0) * 1000)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*[timed() for _ in range(requests)])
+    return samples, time.perf_counter() - t0
+
+
+async def run_benchmark(requests: int, concurrency: int, pool_size: int) -> List[dict]:
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_path = str(Path(tmp) / "bench_threads.sqlite")
+
+        async def before() -> None:
+            graph, conn, store = await build_job_graph(sqlite_path=sqlite_path)
+            if conn is not None:
+                await conn.close()
+
+        runtime = GraphRuntime(sqlite_path=sqlite_path, pool_size=pool_size)
+        t0 = time.perf_counter()
+        await runtime.start()
+        startup_ms = (time.perf_counter() - t0) * 1000
+
+        async def after() -> None:
+            async with runtime.borrow():
+                pass
+
+        print(
+            f"[bench] requests={requests} concurrency={concurrency} "
+            f"pool_size={pool_size} (runtime startup: {startup_ms:.1f} ms, paid once)"
+        )
+        rows = []
+        samples, wall = await _drive(before, requests, concurrency)
+        rows.append(_report("before", samples, wall))
+        samples, wall = await _drive(after, requests, concurrency)
+        rows.append(_report("after", samples, wall))
+
+        print(f"[bench] pool stats: {runtime.stats()}")
+        await runtime.close()
+
+    if rows[1]["mean_ms"] > 0:
+        print(f"[bench] per-request overhead reduced {rows[0]['mean_ms'] / rows[1]['mean_ms']:.0f}x")
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark per-request graph setup: build_job_graph vs pooled GraphRuntime."
+    )
+    parser.add_argument("--requests", type=int, default=100, help="Requests per variant (default: 100)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent requests (default: 4)")
+    parser.add_argument("--pool-size", type=int, default=4, help="Checkpointer pool size (default: 4)")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.requests, args.concurrency, args.pool_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Judge prompt size and ranking agreement: compact vs legacy RULER trajectories.
+
+For N scenarios from ``evals/eval_dataset.json`` a group of candidates is
+generated once, wrapped with ``jd_candidate_to_trajectory`` in both formats,
+and the judge prompt RULER would send is rebuilt (common message prefix sent
+once, then one block per trajectory) to count its input tokens.  Tokens are
+counted with tiktoken (``o200k_base``) when available, else estimated as
+chars / 4.
+
+With ``--judge`` both groups are also scored (response caches off) and the
+rankings compared per scenario: top-1 agreement and Kendall tau.  Against the
+live backend the run exits 1 when mean tau or top-1 agreement falls below
+``--min-agreement`` (stand-in judge scores are random, so it only reports).
+
+Usage
+─────
+    python -m benchmarks.bench_judge_tokens --backend standin --scenarios 10
+    python -m benchmarks.bench_judge_tokens --backend live --scenarios 10 --judge \\
+        --output benchmarks/baselines/judge_tokens.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.bench_e2e import _DEFAULT_DATASET, _load_scenarios
+
+
+def _token_counter() -> Callable[[str], int]:
+    try:
+        import tiktoken
+        enc = tiktoken.get_encoding("o200k_base")
+        return lambda text: len(enc.encode(text))
+    except Exception:
+        print("[bench] tiktoken unavailable, estimating tokens as chars / 4")
+        return lambda text: (len(text) + 3) // 4
+
+
+def _as_messages(traj) -> List[Dict[str, Any]]:
+    messages = []
+    for item in traj.messages_and_choices:
+        if isinstance(item, dict):
+            messages.append(item)
+        else:
+            messages.append({"role": item.message.role, "content": item.message.content})
+    return messages
+
+
+def judge_prompt(trajectories) -> str:
+    """Approximate the user prompt RULER builds: shared prefix once, then each trajectory's tail."""
+    lists = [_as_messages(t) for t in trajectories]
+    prefix = 0
+    while all(len(m) > prefix and m[prefix] == lists[0][prefix] for m in lists):
+        prefix += 1
+    text = ""
+    if prefix:
+        text += "<context>\n" + json.dumps(lists[0][:prefix]) + "\n</context>\n\n"
+    blocks = [
+        f'<trajectory id="{i}">\n' + json.dumps(m[prefix:]) + "\n</trajectory>"
+        for i, m in enumerate(lists, start=1)
+    ]
+    return text + "Trajectories:\n\n" + "\n\n".join(blocks)
+
+
+def kendall_tau(a: List[float], b: List[float]) -> float:
+    """Kendall tau-a between two score lists over the same candidates (ties count as 0)."""
+    pairs = list(combinations(range(len(a)), 2))
+    if not pairs:
+        return 1.0
+    sign = lambda x: (x > 0) - (x < 0)
+    return sum(sign(a[i] - a[j]) * sign(b[i] - b[j]) for i, j in pairs) / len(pairs)
+
+
+def _start_backend(backend: str, seed: int):
+    server = None
+    if backend == "standin":
+        from benchmarks.fake_openrouter import start_server
+        server = start_server(latency_ms=50.0, latency_sigma=0.1, ttft_ms=10.0, seed=seed)
+        os.environ["OPENROUTER_BASE_URL"] = server.base_url
+        os.environ["OPENROUTER_API_BASE"] = server.base_url
+        os.environ.setdefault("OPENROUTER_API_KEY", "bench")
+    for flag in ("RESULT_CACHE_ENABLED", "LLM_CACHE_ENABLED"):
+        os.environ[flag] = "false"
+    return server
+
+
+async def run_benchmark(scenarios: List[Dict[str, Any]], num_candidates: int, judge: bool) -> Dict[str, Any]:
+    import art
+    from config import MODEL_RULER_JUDGE
+    from generators.job_generator import generate_job_body_candidate_async
+    from models.job_models import JobGenerationConfig
+    from ruler.ruler_utils import jd_candidate_to_trajectory, score_group_with_fallback
+
+    count = _token_counter()
+    rows: List[Dict[str, Any]] = []
+    errors: List[str] = []
+
+    for scenario in scenarios:
+        sid = scenario.get("scenario_id", scenario["job_title"])
+        cfg = JobGenerationConfig(
+            language=scenario["language"],
+            formality=scenario["formality"],
+            company_type=scenario["company_type"],
+            seniority_label=scenario["seniority_label"],
+            duty_keywords=scenario.get("duty_bullets") or [],
+        )
+        try:
+            candidates = await asyncio.gather(*[
+                generate_job_body_candidate_async(scenario["job_title"], cfg, temp_jitter=0.1 * i, cache=False)
+                for i in range(num_candidates)
+            ])
+        except Exception as e:
+            errors.append(f"{sid}: generation {type(e).__name__}: {e}")
+            continue
+
+        row: Dict[str, Any] = {"scenario": sid}
+        for mode, compact in (("legacy", False), ("compact", True)):
+            trajectories = [
+                jd_candidate_to_trajectory(scenario["job_title"], cfg, jb, compact=compact) for jb in candidates
+            ]
+            row[f"{mode}_tokens"] = count(judge_prompt(trajectories))
+            if judge:
+                scored = await score_group_with_fallback(
+                    art.TrajectoryGroup(trajectories), MODEL_RULER_JUDGE, cache=False,
+                )
+                if scored is None:
+                    errors.append(f"{sid}: {mode} judge failed")
+                else:
+                    row[f"{mode}_scores"] = [t.reward for t in scored.trajectories]
+        if "legacy_scores" in row and "compact_scores" in row:
+            legacy, compact_scores = row["legacy_scores"], row["compact_scores"]
+            row["tau"] = round(kendall_tau(legacy, compact_scores), 3)
+            row["top1_agree"] = legacy.index(max(legacy)) == compact_scores.index(max(compact_scores))
+        rows.append(row)
+        print(f"[bench] {sid}: legacy={row['legacy_tokens']} compact={row['compact_tokens']} tokens"
+              + (f" tau={row['tau']}" if "tau" in row else ""))
+
+    legacy_tokens = [r["legacy_tokens"] for r in rows]
+    compact_tokens = [r["compact_tokens"] for r in rows]
+    judged = [r for r in rows if "tau" in r]
+    result: Dict[str, Any] = {
+        "scenarios": len(rows),
+        "candidates": num_candidates,
+        "errors": errors,
+        "legacy_tokens_mean": round(statistics.fmean(legacy_tokens), 1) if rows else 0.0,
+        "compact_tokens_mean": round(statistics.fmean(compact_tokens), 1) if rows else 0.0,
+        "saving": round(1 - sum(compact_tokens) / sum(legacy_tokens), 3) if rows else 0.0,
+        "rows": rows,
+    }
+    if judged:
+        result["kendall_tau_mean"] = round(statistics.fmean(r["tau"] for r in judged), 3)
+        result["top1_agreement"] = round(sum(r["top1_agree"] for r in judged) / len(judged), 3)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare judge prompt tokens and rankings for compact vs legacy trajectories.")
+    parser.add_argument("--backend", choices=("live", "standin"), default="standin")
+    parser.add_argument("--dataset", default=str(_DEFAULT_DATASET), help="Eval dataset JSON")
+    parser.add_argument("--scenarios", type=int, default=10, help="Number of scenarios (0 = all)")
+    parser.add_argument("--candidates", type=int, default=3, help="Candidates per group (default: 3)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--judge", action="store_true", help="Also score both formats and compare rankings")
+    parser.add_argument("--min-agreement", type=float, default=0.6,
+                        help="Fail when mean Kendall tau or top-1 agreement is below this (default: 0.6)")
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args()
+
+    server: Optional[Any] = None
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["GRAPH_THREADS_DB_PATH"] = str(Path(tmp) / "bench_threads.sqlite")
+        server = _start_backend(args.backend, args.seed)
+        scenarios = _load_scenarios(args.dataset, args.scenarios, args.seed)
+        print(f"[bench] backend={args.backend} scenarios={len(scenarios)} candidates={args.candidates}")
+        try:
+            result = asyncio.run(run_benchmark(scenarios, args.candidates, args.judge))
+        finally:
+            if server is not None:
+                server.shutdown()
+    result["backend"] = args.backend
+
+    print(f"[bench] judge input tokens/group: legacy {result['legacy_tokens_mean']}, "
+          f"compact {result['compact_tokens_mean']} ({result['saving']:.0%} saved)")
+    if result["errors"]:
+        print(f"[bench] {len(result['errors'])} error(s): {result['errors'][:3]}")
+
+    if args.output:
+        path = Path(args.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+        print(f"[bench] results written to {path}")
+
+    if "kendall_tau_mean" in result:
+        tau, top1 = result["kendall_tau_mean"], result["top1_agreement"]
+        print(f"[bench] ranking agreement: kendall tau {tau:.2f}, top-1 {top1:.0%}")
+        if args.backend == "live" and min(tau, top1) < args.min_agreement:
+            print(f"[bench] AGREEMENT below {args.min_agreement:.2f}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Orchestration-overhead benchmark and regression check on recorded cassettes.
+
+Record once against real OpenRouter, then replay the identical LLM, judge and
+embedding responses with zero latency.  The replay time of a full
+``generate_with_graph`` run is then pure orchestration: LangGraph, the
+checkpointer, store sync, prompt assembly, Swiss-German post-processing,
+local checks and (local) HTTP/JSON handling.
+
+The result and LLM response caches and hedging are switched off so every run
+does the full amount of work.
+
+Usage
+─────
+    # 1. record (needs OPENROUTER_API_KEY; writes scenarios into the cassette)
+    python -m benchmarks.bench_orchestration --record benchmarks/cassettes/graph.jsonl.gz
+
+    # 2. replay and store a baseline
+    python -m benchmarks.bench_orchestration --cassette benchmarks/cassettes/graph.jsonl.gz \\
+        --runs 5 --write-baseline benchmarks/baselines/orchestration.json
+
+    # 3. regression check (exit code 1 if p50 or mean grew by more than 25 %)
+    python -m benchmarks.bench_orchestration --cassette benchmarks/cassettes/graph.jsonl.gz \\
+        --runs 5 --baseline benchmarks/baselines/orchestration.json --max-regression 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks.cassette import start_cassette_server
+
+# Small default set: one EN and one DE scenario exercise both prompt paths
+DEFAULT_SCENARIOS: List[Dict[str, Any]] = [
+    {
+        "job_title": "Senior Data Engineer",
+        "config": {"language": "en", "formality": "neutral", "company_type": "scaleup", "seniority_label": "senior"},
+    },
+    {
+        "job_title": "Pflegefachperson HF",
+        "config": {"language": "de", "formality": "formal", "company_type": "public_sector", "seniority_label": "junior"},
+    },
+]
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _configure_env(base_url: str, threads_db: str, *, replay: bool) -> None:
+    """Point every client at the cassette server; must run before config is imported."""
+    os.environ["OPENROUTER_BASE_URL"] = base_url
+    os.environ["OPENROUTER_API_BASE"] = base_url  # LiteLLM (RULER judge)
+    if replay:
+        os.environ.setdefault("OPENROUTER_API_KEY", "cassette-replay")
+    os.environ["GRAPH_THREADS_DB_PATH"] = threads_db
+    for flag in ("RESULT_CACHE_ENABLED", "LLM_CACHE_ENABLED", "LLM_HEDGING_ENABLED"):
+        os.environ[flag] = "false"
+
+
+def _load_scenarios(dataset: Optional[str], limit: int) -> List[Dict[str, Any]]:
+    if not dataset:
+        return DEFAULT_SCENARIOS[:limit] if limit else DEFAULT_SCENARIOS
+    raw = json.loads(Path(dataset).read_text(encoding="utf-8"))
+    scenarios = [
+        {
+            "job_title": s["job_title"],
+            "config": {
+                "language": s["language"],
+                "formality": s["formality"],
+                "company_type": s["company_type"],
+                "seniority_label": s["seniority_label"],
+            },
+        }
+        for s in raw
+    ]
+    return scenarios[:limit] if limit else scenarios
+
+
+async def _run_scenarios(scenarios: List[Dict[str, Any]]) -> List[float]:
+    """Run each scenario through the full graph once; return per-run wall ms."""
+    from models.job_models import JobGenerationConfig
+    from services.graph_service import generate_with_graph
+
+    samples = []
+    for scenario in scenarios:
+        cfg = JobGenerationConfig(**scenario["config"])
+        t0 = time.perf_counter()
+        await generate_with_graph(scenario["job_title"], cfg, user_id="bench_orchestration", regenerate=True)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def _summary(samples_ms: List[float]) -> Dict[str, float]:
+    return {
+        "n": len(samples_ms),
+        "mean_ms": round(statistics.fmean(samples_ms), 2) if samples_ms else 0.0,
+        "p50_ms": round(_percentile(samples_ms, 50), 2),
+        "p95_ms": round(_percentile(samples_ms, 95), 2),
+        "max_ms": round(max(samples_ms), 2) if samples_ms else 0.0,
+    }
+
+
+def _compare(current: Dict[str, float], baseline: Dict[str, float], max_regression: float) -> List[str]:
+    """Return human-readable regressions (empty list = within budget)."""
+    failures = []
+    for metric in ("p50_ms", "mean_ms"):
+        base, now = baseline.get(metric), current.get(metric)
+        if not base or now is None:
+            continue
+        growth = (now - base) / base
+        marker = "REGRESSION" if growth > max_regression else "ok"
+        print(f"  {metric:<8} baseline={base:>9.2f}  now={now:>9.2f}  ({growth:+.1%})  {marker}")
+        if growth > max_regression:
+            failures.append(f"{metric} grew {growth:.1%} (budget {max_regression:.0%})")
+    return failures
+
+
+async def record(cassette_path: str, scenarios: List[Dict[str, Any]], threads_db: str) -> None:
+    server = start_cassette_server(cassette_path, mode="record")
+    _configure_env(server.base_url, threads_db, replay=False)
+    print(f"[bench] recording {len(scenarios)} scenario(s) through {server.base_url}")
+    try:
+        samples = await _run_scenarios(scenarios)
+    finally:
+        server.shutdown()
+    server.cassette.meta = {"scenarios": scenarios, "recorded_at": time.time()}
+    server.cassette.save()
+    print(
+        f"[bench] saved {len(server.cassette.interactions)} interactions to {cassette_path} "
+        f"(live run: {_summary(samples)})"
+    )
+
+
+async def replay(
+    cassette_path: str,
+    runs: int,
+    timing: str,
+    threads_db: str,
+    scenarios_override: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    server = start_cassette_server(cassette_path, mode="replay", timing=timing)
+    _configure_env(server.base_url, threads_db, replay=True)
+    scenarios = scenarios_override or server.cassette.meta.get("scenarios") or DEFAULT_SCENARIOS
+    print(
+        f"[bench] replaying {len(server.cassette.interactions)} interactions, "
+        f"{len(scenarios)} scenario(s) x {runs} run(s), timing={timing}"
+    )
+    try:
+        # Warm-up pass: graph compile, pool start-up, imports (not measured)
+        await _run_scenarios(scenarios)
+        samples: List[float] = []
+        for _ in range(runs):
+            server.cassette.reset()
+            samples.extend(await _run_scenarios(scenarios))
+    finally:
+        server.shutdown()
+
+    summary = _summary(samples)
+    summary["timing"] = timing
+    summary["cassette"] = server.cassette.stats()
+    print(
+        f"[bench] per-generation overhead: mean={summary['mean_ms']:.2f} ms  "
+        f"p50={summary['p50_ms']:.2f}  p95={summary['p95_ms']:.2f}  max={summary['max_ms']:.2f}"
+    )
+    print(f"[bench] cassette: {summary['cassette']}")
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure orchestration overhead of full graph runs on recorded cassettes."
+    )
+    parser.add_argument("--record", metavar="CASSETTE", help="Record a new cassette against the live upstream")
+    parser.add_argument("--cassette", help="Cassette to replay")
+    parser.add_argument("--dataset", help="eval_dataset.json to take scenarios from (default: built-in pair)")
+    parser.add_argument("--scenarios", type=int, default=0, help="Limit number of scenarios (0 = all)")
+    parser.add_argument("--runs", type=int, default=3, help="Measured replay passes (default: 3)")
+    parser.add_argument("--timing", choices=("zero", "recorded"), default="zero",
+                        help="zero = pure overhead, recorded = realistic end-to-end")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--write-baseline", help="Write this run's summary as the new baseline")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="Allowed growth of p50/mean vs. baseline (default: 0.25)")
+    args = parser.parse_args()
+
+    if not args.record and not args.cassette:
+        parser.error("either --record or --cassette is required")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        threads_db = str(Path(tmp) / "bench_threads.sqlite")
+        if args.record:
+            scenarios = _load_scenarios(args.dataset, args.scenarios)
+            asyncio.run(record(args.record, scenarios, threads_db))
+            return
+
+        override = _load_scenarios(args.dataset, args.scenarios) if args.dataset else None
+        summary = asyncio.run(replay(args.cassette, args.runs, args.timing, threads_db, override))
+
+    if args.write_baseline:
+        path = Path(args.write_baseline)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        print(f"[bench] baseline written to {path}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        print(f"[bench] comparing with {args.baseline} (budget +{args.max_regression:.0%})")
+        failures = _compare(summary, baseline, args.max_regression)
+        if summary["cassette"]["misses"]:
+            failures.append(f"{summary['cassette']['misses']} request(s) missing from the cassette")
+        if failures:
+            print("[bench] FAILED: " + "; ".join(failures))
+            sys.exit(1)
+        print("[bench] within budget")
+
+
+if __name__ == "__main__":
+    main()
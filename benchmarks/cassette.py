@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Record / replay cassettes for LLM, judge and embedding traffic.
+
+A cassette is a gzip-compressed JSON-lines file with one recorded HTTP
+interaction per line (request key, endpoint, model, status, response body,
+time-to-first-byte and total time).  The ``CassetteServer`` sits where
+OpenRouter normally is, so it sees every client the app uses: the pooled
+ChatOpenAI clients, LiteLLM (RULER judge) and OpenAIEmbeddings.
+
+  record  proxy each request to the real upstream and append it to the cassette
+  replay  answer from the cassette, either immediately (``timing="zero"``) or
+          with the recorded time-to-first-byte / total time (``"recorded"``)
+
+Requests are matched on a hash of the endpoint and the request body.  If a
+body is not in the cassette (e.g. a prompt changed), replay falls back to the
+next unused interaction for the same endpoint / model / stream mode and
+counts a fallback; ``strict=True`` answers unmatched requests with HTTP 404.
+
+Usage
+─────
+    # record while using the app against real OpenRouter
+    python -m benchmarks.cassette record --cassette cassettes/session.jsonl.gz
+    # replay it
+    python -m benchmarks.cassette replay --cassette cassettes/session.jsonl.gz --timing recorded
+
+    # point the app at it (same variables as the stand-in server)
+    export OPENROUTER_BASE_URL=http://127.0.0.1:8766/api/v1
+    export OPENROUTER_API_BASE=$OPENROUTER_BASE_URL
+
+See ``benchmarks/bench_orchestration.py`` for the orchestration-overhead
+regression check built on top of this.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+DEFAULT_UPSTREAM = "https://openrouter.ai/api/v1"
+
+# Request fields that do not influence the response content
+_VOLATILE_FIELDS = ("user", "stream_options")
+# Client headers worth forwarding upstream
+_FORWARD_HEADERS = ("authorization", "content-type", "http-referer", "x-title", "openai-organization")
+
+
+def _endpoint(path: str) -> str:
+    """Normalise ``/api/v1/chat/completions`` and ``/chat/completions`` to ``chat/completions``."""
+    path = path.split("?", 1)[0].strip("/")
+    for prefix in ("api/v1/", "v1/"):
+        if path.startswith(prefix):
+            return path[len(prefix):]
+    return path
+
+
+def request_key(endpoint: str, body: Dict[str, Any]) -> str:
+    """Content hash identifying a request (endpoint + body without volatile fields)."""
+    material = {k: v for k, v in body.items() if k not in _VOLATILE_FIELDS}
+    raw = json.dumps([endpoint, material], sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _fallback_slot(endpoint: str, body: Dict[str, Any]) -> Tuple[str, str, bool]:
+    return endpoint, str(body.get("model", "")), bool(body.get("stream"))
+
+
+class Cassette:
+    """In-memory interaction list with load/save and replay matching (thread-safe)."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.interactions: List[Dict[str, Any]] = []
+        self.meta: Dict[str, Any] = {}  # free-form, e.g. the scenarios a benchmark recorded
+        self._by_key: Dict[str, Deque[int]] = {}
+        self._by_slot: Dict[Tuple[str, str, bool], Deque[int]] = {}
+        self._used: set = set()
+        self.hits = 0
+        self.fallbacks = 0
+        self.misses = 0
+
+    # -- persistence -------------------------------------------------------
+
+    def load(self) -> "Cassette":
+        with gzip.open(self.path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                if "meta" in row:
+                    self.meta = row["meta"]
+                else:
+                    self._index(row)
+        return self
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            rows = list(self.interactions)
+        with gzip.open(self.path, "wt", encoding="utf-8") as fh:
+            if self.meta:
+                fh.write(json.dumps({"meta": self.meta}, ensure_ascii=False) + "\n")
+            for row in rows:
+                fh.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def _index(self, row: Dict[str, Any]) -> None:
+        idx = len(self.interactions)
+        self.interactions.append(row)
+        self._by_key.setdefault(row["key"], deque()).append(idx)
+        slot = (row["endpoint"], row.get("model", ""), bool(row.get("stream")))
+        self._by_slot.setdefault(slot, deque()).append(idx)
+
+    def add(self, row: Dict[str, Any]) -> None:
+        with self._lock:
+            self._index(row)
+
+    # -- replay ------------------------------------------------------------
+
+    def _take(self, queue: Deque[int], reuse: bool) -> Optional[int]:
+        for idx in queue:
+            if idx not in self._used:
+                self._used.add(idx)
+                return idx
+        # Every exact match already served once: identical requests share it
+        return queue[-1] if (reuse and queue) else None
+
+    def match(self, endpoint: str, body: Dict[str, Any], *, strict: bool = False) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            queue = self._by_key.get(request_key(endpoint, body))
+            if queue:
+                self.hits += 1
+                return self.interactions[self._take(queue, reuse=True)]
+            if not strict:
+                queue = self._by_slot.get(_fallback_slot(endpoint, body))
+                idx = self._take(queue, reuse=False) if queue else None
+                if idx is not None:
+                    self.fallbacks += 1
+                    return self.interactions[idx]
+            self.misses += 1
+            return None
+
+    def reset(self) -> None:
+        """Forget which interactions were served (start of a new replay pass)."""
+        with self._lock:
+            self._used.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "interactions": len(self.interactions),
+                "hits": self.hits,
+                "fallbacks": self.fallbacks,
+                "misses": self.misses,
+            }
+
+
+# ---------------------------------------------------------------------------
+# HTTP server
+# ---------------------------------------------------------------------------
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "CassetteServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/").endswith("/stats"):
+            self._send(200, json.dumps(self.server.cassette.stats()).encode())
+        elif self.path.rstrip("/").endswith("/models"):
+            self._send(200, b'{"object": "list", "data": []}')
+        else:
+            self._send(404, b'{"error": {"message": "unknown path"}}')
+
+    def do_POST(self) -> None:
+        raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        try:
+            body = json.loads(raw or b"{}")
+        except json.JSONDecodeError:
+            self._send(400, b'{"error": {"message": "invalid JSON"}}')
+            return
+        endpoint = _endpoint(self.path)
+        if self.server.mode == "record":
+            self._record(endpoint, body, raw)
+        else:
+            self._replay(endpoint, body)
+
+    # -- record ------------------------------------------------------------
+
+    def _record(self, endpoint: str, body: Dict[str, Any], raw: bytes) -> None:
+        import httpx
+
+        headers = {k: v for k, v in self.headers.items() if k.lower() in _FORWARD_HEADERS}
+        headers["Accept-Encoding"] = "identity"
+        url = f"{self.server.upstream.rstrip('/')}/{endpoint}"
+        started = time.perf_counter()
+        ttfb_ms: Optional[float] = None
+        chunks: List[bytes] = []
+
+        with httpx.Client(timeout=self.server.upstream_timeout_s) as client:
+            with client.stream("POST", url, content=raw, headers=headers) as response:
+                content_type = response.headers.get("content-type", "application/json")
+                streaming = content_type.startswith("text/event-stream")
+                self.send_response(response.status_code)
+                self.send_header("Content-Type", content_type)
+                if streaming:
+                    self.send_header("Connection", "close")
+                    self.close_connection = True
+                    self.end_headers()
+                    for chunk in response.iter_bytes():
+                        if ttfb_ms is None:
+                            ttfb_ms = (time.perf_counter() - started) * 1000
+                        chunks.append(chunk)
+                        self.wfile.write(chunk)
+                        self.wfile.flush()
+                else:
+                    data = response.read()
+                    ttfb_ms = (time.perf_counter() - started) * 1000
+                    chunks.append(data)
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                status = response.status_code
+
+        self.server.cassette.add({
+            "key": request_key(endpoint, body),
+            "endpoint": endpoint,
+            "model": str(body.get("model", "")),
+            "stream": bool(body.get("stream")),
+            "status": status,
+            "content_type": content_type,
+            "body": b"".join(chunks).decode("utf-8", errors="replace"),
+            "ttfb_ms": round(ttfb_ms or 0.0, 1),
+            "total_ms": round((time.perf_counter() - started) * 1000, 1),
+        })
+
+    # -- replay ------------------------------------------------------------
+
+    def _replay(self, endpoint: str, body: Dict[str, Any]) -> None:
+        row = self.server.cassette.match(endpoint, body, strict=self.server.strict)
+        if row is None:
+            self._send(404, json.dumps({"error": {"message": f"no cassette entry for {endpoint}"}}).encode())
+            return
+        recorded = self.server.timing == "recorded"
+        payload = row["body"].encode("utf-8")
+
+        if not row.get("stream") or not row["content_type"].startswith("text/event-stream"):
+            if recorded:
+                time.sleep(row.get("total_ms", 0.0) / 1000.0)
+            self._send(row["status"], payload, row["content_type"])
+            return
+
+        events = [e + b"\n\n" for e in payload.split(b"\n\n") if e.strip()]
+        self.send_response(row["status"])
+        self.send_header("Content-Type", row["content_type"])
+        self.send_header("Connection", "close")
+        self.close_connection = True
+        self.end_headers()
+        if recorded:
+            time.sleep(row.get("ttfb_ms", 0.0) / 1000.0)
+        gap_s = (
+            max(0.0, row.get("total_ms", 0.0) - row.get("ttfb_ms", 0.0)) / 1000.0 / max(1, len(events) - 1)
+            if recorded else 0.0
+        )
+        for i, event in enumerate(events):
+            if i and gap_s:
+                time.sleep(gap_s)
+            self.wfile.write(event)
+            self.wfile.flush()
+
+
+class CassetteServer(ThreadingHTTPServer):
+    """Record/replay proxy; ``mode`` is "record" or "replay"."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        cassette: Cassette,
+        *,
+        mode: str = "replay",
+        timing: str = "zero",
+        strict: bool = False,
+        upstream: str = DEFAULT_UPSTREAM,
+        upstream_timeout_s: float = 180.0,
+    ):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"mode must be 'record' or 'replay', got {mode!r}")
+        if timing not in ("zero", "recorded"):
+            raise ValueError(f"timing must be 'zero' or 'recorded', got {timing!r}")
+        super().__init__(address, _Handler)
+        self.cassette = cassette
+        self.mode = mode
+        self.timing = timing
+        self.strict = strict
+        self.upstream = upstream
+        self.upstream_timeout_s = upstream_timeout_s
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+
+def start_cassette_server(
+    cassette_path: str,
+    *,
+    mode: str = "replay",
+    host: str = "127.0.0.1",
+    port: int = 0,
+    **kwargs: Any,
+) -> CassetteServer:
+    """Start a cassette server on a daemon thread (replay loads the file first)."""
+    cassette = Cassette(cassette_path)
+    if mode == "replay":
+        cassette.load()
+    server = CassetteServer((host, port), cassette, mode=mode, **kwargs)
+    threading.Thread(target=server.serve_forever, name=f"cassette-{mode}", daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record / replay LLM, judge and embedding traffic.")
+    parser.add_argument("mode", choices=("record", "replay"))
+    parser.add_argument("--cassette", required=True, help="Cassette path (.jsonl.gz)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--upstream", default=DEFAULT_UPSTREAM, help="Upstream base URL for record mode")
+    parser.add_argument("--timing", choices=("zero", "recorded"), default="zero", help="Replay timing")
+    parser.add_argument("--strict", action="store_true", help="Replay: 404 instead of fallback matching")
+    args = parser.parse_args()
+
+    cassette = Cassette(args.cassette)
+    if args.mode == "replay":
+        cassette.load()
+    server = CassetteServer(
+        (args.host, args.port), cassette,
+        mode=args.mode, timing=args.timing, strict=args.strict, upstream=args.upstream,
+    )
+    print(f"[cassette] {args.mode} on {server.base_url} ({len(cassette.interactions)} interactions loaded)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.mode == "record":
+            cassette.save()
+            print(f"[cassette] saved {len(cassette.interactions)} interactions to {args.cassette}")
+        else:
+            print(f"[cassette] {cassette.stats()}")
+
+
+if __name__ == "__main__":
+    main()
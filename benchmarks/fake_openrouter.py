@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+Local OpenAI-compatible stand-in for OpenRouter (offline load testing).
+
+Speaks the endpoints every benchmarkable path uses:
+
+  POST …/chat/completions  writer / style calls (tool-calling or json_schema
+                           structured output, streamed or not) and the RULER
+                           judge (LiteLLM ``response_format``)
+  POST …/embeddings        deterministic unit vectors (text or token ids)
+  GET  …/models            model list
+  GET  /stats              request / error / concurrency counters
+
+Structured outputs are generated from the request's JSON schema, so
+``JobBody`` payloads validate and RULER gets one score per
+``<trajectory id="…">``.  Content is deterministic per (model, messages,
+temperature); latency is drawn from a log-normal distribution and errors /
+429s are injected at configurable rates, so provider behaviour can be varied
+while framework overhead is measured separately.
+
+Usage
+─────
+    python -m benchmarks.fake_openrouter --port 8765 --latency-ms 1200 --rate-limit-rate 0.02
+
+    # in another shell (LiteLLM reads OPENROUTER_API_BASE for the judge)
+    export OPENROUTER_BASE_URL=http://127.0.0.1:8765/api/v1
+    export OPENROUTER_API_BASE=$OPENROUTER_BASE_URL
+    export OPENROUTER_API_KEY=local
+    streamlit run app.py
+
+Programmatic use (benchmarks):
+    server = start_server(port=0, latency_ms=0)
+    ... server.base_url ...
+    server.shutdown()
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+_WORDS = (
+    "team product platform customers quality delivery data cloud process "
+    "ownership growth impact collaboration stakeholders roadmap security "
+    "reliability analytics insights operations strategy innovation service "
+    "design engineering support learning culture flexibility development"
+).split()
+
+_TRAJECTORY_ID = re.compile(r'<trajectory id="([^"]+)">')
+
+
+@dataclass
+class StandInConfig:
+    """Latency / failure model of the stand-in (all times in milliseconds)."""
+
+    latency_ms: float = 1500.0      # median end-to-end chat latency
+    latency_sigma: float = 0.4      # log-normal sigma (0 = fixed latency)
+    ttft_ms: float = 300.0          # median time to first streamed token
+    embed_latency_ms: float = 80.0
+    error_rate: float = 0.0         # fraction of requests answered with HTTP 500
+    rate_limit_rate: float = 0.0    # fraction of requests answered with HTTP 429
+    max_concurrent: int = 0         # >0: requests beyond this many in flight get 429
+    embedding_dim: int = 1536
+    seed: Optional[int] = None
+
+
+@dataclass
+class _Stats:
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    requests: Dict[str, int] = field(default_factory=dict)
+    rate_limited: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "requests": dict(self.requests),
+                "rate_limited": self.rate_limited,
+                "errors": self.errors,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+            }
+
+
+# ---------------------------------------------------------------------------
+# Deterministic content
+# ---------------------------------------------------------------------------
+
+def _seeded_rng(*parts: Any) -> random.Random:
+    digest = hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(_WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _text_for(name: str, rng: random.Random) -> str:
+    if name in ("job_description", "description", "explanation"):
+        return " ".join(_sentence(rng, rng.randint(10, 16)) for _ in range(3))
+    return _sentence(rng, rng.randint(6, 12))
+
+
+def _resolve(schema: Dict[str, Any], root: Dict[str, Any]) -> Dict[str, Any]:
+    ref = schema.get("$ref")
+    if not ref:
+        return schema
+    node: Any = root
+    for part in ref.lstrip("#/").split("/"):
+        node = node.get(part, {})
+    return node
+
+
+def _example(schema: Dict[str, Any], root: Dict[str, Any], rng: random.Random, name: str, ctx: Dict[str, Any]) -> Any:
+    """Build a value that validates against *schema* (the subset pydantic emits)."""
+    schema = _resolve(schema, root)
+    for combinator in ("anyOf", "oneOf"):
+        if combinator in schema:
+            options = [s for s in schema[combinator] if _resolve(s, root).get("type") != "null"]
+            return _example(options[0] if options else {"type": "null"}, root, rng, name, ctx)
+    if "allOf" in schema:
+        return _example(schema["allOf"][0], root, rng, name, ctx)
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    if "const" in schema:
+        return schema["const"]
+
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+    if kind == "object" or "properties" in schema:
+        return {
+            prop: _example(sub, root, rng, prop, ctx)
+            for prop, sub in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        items = _resolve(schema.get("items", {}), root)
+        if "trajectory_id" in items.get("properties", {}) and ctx.get("trajectory_ids"):
+            # RULER: exactly one score per trajectory in the prompt
+            return [
+                {
+                    "trajectory_id": tid,
+                    "explanation": _text_for("explanation", rng),
+                    "score": round(rng.uniform(0.3, 0.95), 3),
+                }
+                for tid in ctx["trajectory_ids"]
+            ]
+        low = schema.get("minItems", 4)
+        high = max(low, min(schema.get("maxItems", 7), 7))
+        return [_example(items, root, rng, name, ctx) for _ in range(rng.randint(low, high))]
+    if kind == "string":
+        return _text_for(name, rng)
+    if kind == "integer":
+        return rng.randint(schema.get("minimum", 0), schema.get("maximum", 10))
+    if kind == "number":
+        return round(rng.uniform(schema.get("minimum", 0.0), schema.get("maximum", 1.0)), 3)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    return None
+
+
+def _message_text(messages: List[Dict[str, Any]]) -> str:
+    parts = []
+    for m in messages:
+        content = m.get("content")
+        if isinstance(content, list):
+            content = " ".join(b.get("text", "") for b in content if isinstance(b, dict))
+        parts.append(str(content or ""))
+    return "\n".join(parts)
+
+
+def _embedding(item: Any, dim: int) -> List[float]:
+    rng = _seeded_rng("embedding", item)
+    vec = [rng.gauss(0.0, 1.0) for _ in range(dim)]
+    norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+    return [v / norm for v in vec]
+
+
+# ---------------------------------------------------------------------------
+# HTTP handler
+# ---------------------------------------------------------------------------
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "StandInServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt: str, *args: Any) -> None:  # keep benchmark output clean
+        pass
+
+    # -- helpers -----------------------------------------------------------
+
+    def _send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        raw = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _sleep_ms(self, median_ms: float) -> None:
+        if median_ms <= 0:
+            return
+        sigma = self.server.config.latency_sigma
+        delay = median_ms * (math.exp(self.server.rng.gauss(0.0, sigma)) if sigma > 0 else 1.0)
+        time.sleep(delay / 1000.0)
+
+    def _inject_failure(self) -> bool:
+        """Send a 429 / 500 if the failure model says so; returns True if it did."""
+        cfg, stats = self.server.config, self.server.stats
+        roll = self.server.rng.random()
+        with stats.lock:
+            over_limit = cfg.max_concurrent > 0 and stats.in_flight > cfg.max_concurrent
+            if over_limit or roll < cfg.rate_limit_rate:
+                stats.rate_limited += 1
+                kind = 429
+            elif roll < cfg.rate_limit_rate + cfg.error_rate:
+                stats.errors += 1
+                kind = 500
+            else:
+                return False
+        if kind == 429:
+            self._send_json(
+                429,
+                {"error": {"message": "Rate limit exceeded (stand-in)", "type": "rate_limit_error", "code": 429}},
+                {"Retry-After": "1"},
+            )
+        else:
+            self._send_json(500, {"error": {"message": "Upstream error (stand-in)", "type": "server_error", "code": 500}})
+        return True
+
+    # -- routing -----------------------------------------------------------
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/").endswith("/stats"):
+            self._send_json(200, self.server.stats.snapshot())
+        elif self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "stand-in", "object": "model"}]})
+        else:
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+
+    def do_POST(self) -> None:
+        path = self.path.split("?", 1)[0].rstrip("/")
+        endpoint = "chat" if path.endswith("/chat/completions") else "embeddings" if path.endswith("/embeddings") else None
+        if endpoint is None:
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+
+        stats = self.server.stats
+        with stats.lock:
+            stats.requests[endpoint] = stats.requests.get(endpoint, 0) + 1
+            stats.in_flight += 1
+            stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        try:
+            body = self._read_json()
+            if self._inject_failure():
+                return
+            if endpoint == "chat":
+                self._chat(body)
+            else:
+                self._embeddings(body)
+        finally:
+            with stats.lock:
+                stats.in_flight -= 1
+
+    # -- endpoints ---------------------------------------------------------
+
+    def _chat(self, body: Dict[str, Any]) -> None:
+        cfg = self.server.config
+        messages = body.get("messages") or []
+        model = body.get("model", "stand-in")
+        text = _message_text(messages)
+        rng = _seeded_rng(model, messages, body.get("temperature"), cfg.seed)
+        ctx = {"trajectory_ids": _TRAJECTORY_ID.findall(text)}
+
+        tool = None
+        tools = body.get("tools") or []
+        if tools:
+            tool = tools[0].get("function", {})
+            payload = json.dumps(_example(tool.get("parameters", {}), tool.get("parameters", {}), rng, "", ctx))
+        else:
+            fmt = body.get("response_format") or {}
+            schema = (fmt.get("json_schema") or {}).get("schema") if fmt.get("type") == "json_schema" else None
+            if schema:
+                payload = json.dumps(_example(schema, schema, rng, "", ctx))
+            elif fmt.get("type") == "json_object":
+                payload = json.dumps({"result": _text_for("description", rng)})
+            else:
+                payload = " ".join(_sentence(rng, rng.randint(8, 14)) for _ in range(3))
+
+        usage = {
+            "prompt_tokens": max(1, len(text) // 4),
+            "completion_tokens": max(1, len(payload) // 4),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        if body.get("stream"):
+            self._stream_chat(completion_id, created, model, payload, tool, usage, body)
+            return
+
+        self._sleep_ms(cfg.latency_ms)
+        message: Dict[str, Any] = {"role": "assistant", "content": None if tool else payload}
+        if tool:
+            message["tool_calls"] = [{
+                "id": f"call_{uuid.uuid4().hex[:16]}",
+                "type": "function",
+                "function": {"name": tool.get("name", "output"), "arguments": payload},
+            }]
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": message, "finish_reason": "tool_calls" if tool else "stop"}],
+            "usage": usage,
+        })
+
+    def _stream_chat(self, completion_id, created, model, payload, tool, usage, body) -> None:
+        cfg = self.server.config
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def emit(delta: Dict[str, Any], finish: Optional[str] = None, extra: Optional[Dict[str, Any]] = None) -> None:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }
+            if extra:
+                chunk.update(extra)
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        pieces = [payload[i:i + 24] for i in range(0, len(payload), 24)] or [""]
+        self._sleep_ms(cfg.ttft_ms)
+        per_piece_ms = max(0.0, cfg.latency_ms - cfg.ttft_ms) / len(pieces)
+
+        if tool:
+            emit({"role": "assistant", "content": None, "tool_calls": [{
+                "index": 0,
+                "id": f"call_{uuid.uuid4().hex[:16]}",
+                "type": "function",
+                "function": {"name": tool.get("name", "output"), "arguments": ""},
+            }]})
+        else:
+            emit({"role": "assistant", "content": ""})
+        for piece in pieces:
+            if tool:
+                emit({"tool_calls": [{"index": 0, "function": {"arguments": piece}}]})
+            else:
+                emit({"content": piece})
+            if per_piece_ms > 0:
+                time.sleep(per_piece_ms / 1000.0)
+        emit({}, "tool_calls" if tool else "stop")
+        if (body.get("stream_options") or {}).get("include_usage"):
+            self.wfile.write(
+                f"data: {json.dumps({'id': completion_id, 'object': 'chat.completion.chunk', 'created': created, 'model': model, 'choices': [], 'usage': usage})}\n\n".encode("utf-8")
+            )
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _embeddings(self, body: Dict[str, Any]) -> None:
+        cfg = self.server.config
+        inputs = body.get("input")
+        # A single string / token list, or a batch of either
+        if isinstance(inputs, str) or (isinstance(inputs, list) and inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+        dim = int(body.get("dimensions") or cfg.embedding_dim)
+        self._sleep_ms(cfg.embed_latency_ms)
+        data = [
+            {"object": "embedding", "index": i, "embedding": _embedding(item, dim)}
+            for i, item in enumerate(inputs or [])
+        ]
+        tokens = sum(len(item) if isinstance(item, list) else max(1, len(str(item)) // 4) for item in inputs or [])
+        self._send_json(200, {
+            "object": "list",
+            "data": data,
+            "model": body.get("model", "stand-in"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        })
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the stand-in config, RNG and counters."""
+
+    daemon_threads = True
+
+    def __init__(self, address, config: StandInConfig):
+        super().__init__(address, _Handler)
+        self.config = config
+        self.stats = _Stats()
+        self.rng = random.Random(config.seed)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+
+def start_server(host: str = "127.0.0.1", port: int = 0, **config: Any) -> StandInServer:
+    """Start the stand-in on a daemon thread (``port=0`` picks a free port)."""
+    server = StandInServer((host, port), StandInConfig(**config))
+    threading.Thread(target=server.serve_forever, name="fake-openrouter", daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stand-in for OpenRouter.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=1500.0, help="Median chat latency (default: 1500)")
+    parser.add_argument("--latency-sigma", type=float, default=0.4, help="Log-normal sigma (default: 0.4)")
+    parser.add_argument("--ttft-ms", type=float, default=300.0, help="Median time to first token (default: 300)")
+    parser.add_argument("--embed-latency-ms", type=float, default=80.0, help="Median embedding latency (default: 80)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of HTTP 500s (default: 0)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of HTTP 429s (default: 0)")
+    parser.add_argument("--max-concurrent", type=int, default=0, help="429 above this many in flight (0 = off)")
+    parser.add_argument("--embedding-dim", type=int, default=1536)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = StandInServer(
+        (args.host, args.port),
+        StandInConfig(
+            latency_ms=args.latency_ms,
+            latency_sigma=args.latency_sigma,
+            ttft_ms=args.ttft_ms,
+            embed_latency_ms=args.embed_latency_ms,
+            error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limit_rate,
+            max_concurrent=args.max_concurrent,
+            embedding_dim=args.embedding_dim,
+            seed=args.seed,
+        ),
+    )
+    print(f"[stand-in] listening on {server.base_url}")
+    print(f"[stand-in]   export OPENROUTER_BASE_URL={server.base_url}")
+    print(f"[stand-in]   export OPENROUTER_API_BASE={server.base_url}   # LiteLLM / RULER judge")
+    print("[stand-in]   export OPENROUTER_API_KEY=local")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -45,9 +45,61 @@ LOG_FILE = os.getenv('LOG_FILE')  # Set to filename to enable file logging
 LOG_DIR = os.getenv('LOG_DIR', './logs')
 
 # RULER / Concurrency Defaults
-# 0 disables pruning by default; set >0 to enable top-K pruning.
+# Candidates sent to the judge after local pre-scoring (ruler/local_checks.py); hard failures are
+# always dropped. 0 disables top-K pruning by default; set >0 to judge only the best K.
 RULER_TOP_K_DEFAULT = int(os.getenv("RULER_TOP_K_DEFAULT", "0"))
 
+# Candidates generated per graph run (overridable per request via num_candidates). Groups larger
+# than RULER_TOURNAMENT_GROUP_SIZE are judged as a tournament: brackets of at most that size in
+# parallel, then pairwise matches between the bracket leaders (0 = always one group).
+RULER_NUM_CANDIDATES = int(os.getenv("RULER_NUM_CANDIDATES", "3"))
+RULER_TOURNAMENT_GROUP_SIZE = int(os.getenv("RULER_TOURNAMENT_GROUP_SIZE", "4"))
+
+# Load shedding (services/load_shedding.py): graph runs step down one tier (fewer candidates,
+# no re-score, no refinement, pre-score instead of the judge) per multiple of these soft limits
+# on in-flight generations / LLM calls queued at the concurrency governor.
+LOAD_SHEDDING_ENABLED = os.getenv("LOAD_SHEDDING_ENABLED", "true").lower() in ("1", "true", "yes")
+LOAD_SHED_INFLIGHT = int(os.getenv("LOAD_SHED_INFLIGHT", "6"))
+LOAD_SHED_QUEUE = int(os.getenv("LOAD_SHED_QUEUE", "16"))
+# Job worker processes: jobs waiting in the shared job queue per tier step
+LOAD_SHED_JOB_QUEUE = int(os.getenv("LOAD_SHED_JOB_QUEUE", "8"))
+
+# Latency budgets (services/deadline.py): generate_with_graph(..., deadline_s=12) bounds a run;
+# nodes skip optional work that no longer fits and LLM calls are cancelled once it is spent.
+# DEADLINE_DEFAULT_S applies to requests without their own budget (0 = unbounded).
+DEADLINE_DEFAULT_S = float(os.getenv("DEADLINE_DEFAULT_S", "0"))
+DEADLINE_RESERVE_S = float(os.getenv("DEADLINE_RESERVE_S", "1.0"))  # kept free for curator + persist
+# The writer asks for a shorter JobBody when the time left for writing is below this many
+# typical generator durations
+DEADLINE_SHORT_WRITER_RATIO = float(os.getenv("DEADLINE_SHORT_WRITER_RATIO", "1.5"))
+
+# Adaptive candidate count (services/candidate_policy.py): requests without an explicit
+# num_candidates get N from the historical RULER score spread of their config bucket.
+# Buckets with fewer than RULER_ADAPTIVE_MIN_RUNS recorded runs use RULER_NUM_CANDIDATES.
+RULER_ADAPTIVE_CANDIDATES = os.getenv("RULER_ADAPTIVE_CANDIDATES", "true").lower() in ("1", "true", "yes")
+RULER_ADAPTIVE_MIN_CANDIDATES = int(os.getenv("RULER_ADAPTIVE_MIN_CANDIDATES", "2"))
+RULER_ADAPTIVE_MAX_CANDIDATES = int(os.getenv("RULER_ADAPTIVE_MAX_CANDIDATES", "6"))
+RULER_ADAPTIVE_MIN_GAIN = float(os.getenv("RULER_ADAPTIVE_MIN_GAIN", "0.02"))  # expected best-score gain per extra candidate
+RULER_ADAPTIVE_EXPLORE = float(os.getenv("RULER_ADAPTIVE_EXPLORE", "0.1"))  # share of requests with a random N
+RULER_ADAPTIVE_MIN_RUNS = int(os.getenv("RULER_ADAPTIVE_MIN_RUNS", "10"))
+RULER_ADAPTIVE_REFRESH_S = float(os.getenv("RULER_ADAPTIVE_REFRESH_S", "300"))
+
+# In-process memo of RULER judgements keyed by (judge model, job title/config, ordered candidate
+# hashes) so identical groups are not re-judged within a process (0 disables).
+RULER_JUDGE_MEMO_SIZE = int(os.getenv("RULER_JUDGE_MEMO_SIZE", "256"))
+
+# Judge trajectory format (ruler_utils.jd_candidate_to_trajectory): minified JSON, judge-relevant
+# config fields only and the job body sent once. Set false for the legacy indented format.
+RULER_COMPACT_TRAJECTORIES = os.getenv("RULER_COMPACT_TRAJECTORIES", "true").lower() in ("1", "true", "yes")
+
+# Pipelined candidate generation (graph/job_graph.node_generator_expert)
+# Candidates are checked locally as they arrive; once RULER_PIPELINE_QUORUM pass, stragglers
+# get RULER_STRAGGLER_TIMEOUT_S seconds before they are dropped and the judge group is dispatched.
+RULER_PIPELINED = os.getenv("RULER_PIPELINED", "true").lower() in ("1", "true", "yes")
+RULER_PIPELINE_QUORUM = int(os.getenv("RULER_PIPELINE_QUORUM", "2"))
+RULER_STRAGGLER_TIMEOUT_S = float(os.getenv("RULER_STRAGGLER_TIMEOUT_S", "8.0"))
+RULER_MAX_REPLACEMENTS = int(os.getenv("RULER_MAX_REPLACEMENTS", "1"))  # per candidate slot
+
 # LLM Model Configuration
 # All model names used throughout the application are centralized here.
 # Models are specified as OpenRouter model identifiers WITHOUT the "openrouter/" prefix
@@ -92,6 +144,50 @@ MODEL_RULER_JUDGE_FALLBACKS: list[str] = [
 # Format: "openai/text-embedding-3-small" (routed via OpenRouter)
 MODEL_EMBEDDING = os.getenv("MODEL_EMBEDDING", "openai/text-embedding-3-small")
 
+# Hedged LLM requests (services/llm_hedging.py)
+# Writer / style calls that have not returned by the rolling per-model p90 fire one duplicate;
+# the first good result wins. LLM_HEDGE_BUDGET_RATIO caps duplicates (0.1 = at most ~10% extra calls).
+LLM_HEDGING_ENABLED = os.getenv("LLM_HEDGING_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_HEDGE_BUDGET_RATIO = float(os.getenv("LLM_HEDGE_BUDGET_RATIO", "0.1"))
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "90"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))  # no hedging until measured
+LLM_HEDGE_MIN_DELAY_S = float(os.getenv("LLM_HEDGE_MIN_DELAY_S", "1.0"))
+
+# Process-wide adaptive concurrency (services/concurrency.py)
+# Every LLM / judge / embedding call takes a per-model slot. Limits grow additively while calls are
+# fast and halve on 429s or timeouts. Eval/batch traffic may use at most BATCH_SHARE of a limit.
+LLM_CONCURRENCY_ENABLED = os.getenv("LLM_CONCURRENCY_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CONCURRENCY_INITIAL = int(os.getenv("LLM_CONCURRENCY_INITIAL", "8"))
+LLM_CONCURRENCY_MIN = int(os.getenv("LLM_CONCURRENCY_MIN", "1"))
+LLM_CONCURRENCY_MAX = int(os.getenv("LLM_CONCURRENCY_MAX", "48"))
+LLM_CONCURRENCY_BATCH_SHARE = float(os.getenv("LLM_CONCURRENCY_BATCH_SHARE", "0.75"))
+
+# Content-addressed LLM response cache (llm_service.cached_ainvoke / database/llm_cache.py)
+# Keyed on (model, canonical messages, temperature, extra_body, schema). Call sites: writer, style,
+# section, judge. List sites in LLM_CACHE_DISABLED_SITES (comma-separated) to opt them out.
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "jd_llm_cache.sqlite")
+LLM_CACHE_TTL_S = float(os.getenv("LLM_CACHE_TTL_S", str(30 * 24 * 3600)))  # 30 days
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "256"))
+LLM_CACHE_DISABLED_SITES = {
+    s.strip() for s in os.getenv("LLM_CACHE_DISABLED_SITES", "").split(",") if s.strip()
+}
+# Sites cached only for batch-priority runs (evals, benchmarks): an interactive writer / style
+# call samples a fresh draft each time instead of replaying the same text for the same prompt.
+LLM_CACHE_BATCH_ONLY_SITES = {
+    s.strip() for s in os.getenv("LLM_CACHE_BATCH_ONLY_SITES", "writer,style").split(",") if s.strip()
+}
+
+# Shared LLM HTTP connection pool (llm_service.get_chat_model)
+# One async keep-alive pool (on the shared background loop) plus one sync pool, shared by every
+# ChatOpenAI instance.
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "32"))
+LLM_HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "16"))
+LLM_HTTP_KEEPALIVE_EXPIRY_S = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY_S", "60"))
+LLM_HTTP_TIMEOUT_S = float(os.getenv("LLM_HTTP_TIMEOUT_S", "120"))
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "true").lower() in ("1", "true", "yes")  # used if `h2` is installed
+
 # OpenRouter Provider Routing Configuration
 # Optimize for latency by prioritizing providers with lowest latency
 # Set preferred_max_latency thresholds (in seconds) to prefer providers meeting these requirements
@@ -121,6 +217,58 @@ PDF_DIR = os.getenv("PDF_DIR", "PDFs_selling_psychology")
 POSTGRES_CONNECTION_STRING = os.getenv("POSTGRES_CONNECTION_STRING")
 USE_PERSISTENT_STORE = bool(POSTGRES_CONNECTION_STRING)  # Auto-detect: use PostgreSQL if connection string is provided
 
+# Graph Runtime Configuration
+# The blackboard graph is compiled once per process (graph/runtime.py) and requests
+# borrow checkpointer connections from a small pool instead of reconnecting per run.
+GRAPH_THREADS_DB_PATH = os.getenv("GRAPH_THREADS_DB_PATH", "jd_threads.sqlite")
+GRAPH_CHECKPOINTER_POOL_SIZE = int(os.getenv("GRAPH_CHECKPOINTER_POOL_SIZE", "4"))
+
+# Long-term memory store sync (database/store_sync.IncrementalStoreSync)
+# Gold standards / gripes are applied incrementally per user; idle users are evicted.
+STORE_SYNC_MAX_USERS = int(os.getenv("STORE_SYNC_MAX_USERS", "256"))
+STORE_SYNC_IDLE_TTL_S = float(os.getenv("STORE_SYNC_IDLE_TTL_S", "3600"))
+
+# Singleflight: identical concurrent generations (same title + config + user) share one graph run.
+GENERATION_SINGLEFLIGHT = os.getenv("GENERATION_SINGLEFLIGHT", "true").lower() in ("1", "true", "yes")
+
+# Generation result cache (database/result_cache.py)
+# Exact-match cache of finished generations keyed on title + config + StyleKit + duties
+# + the user's memory version. Use "regenerate" in the UI to bypass it.
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", "jd_result_cache.sqlite")
+RESULT_CACHE_TTL_S = float(os.getenv("RESULT_CACHE_TTL_S", str(7 * 24 * 3600)))  # 7 days
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "2000"))
+RESULT_CACHE_MAX_MB = float(os.getenv("RESULT_CACHE_MAX_MB", "64"))
+
+# Durable generation job queue (database/job_queue.py, services/job_workers.py)
+# When enabled the UI submits generations to a SQLite queue served by worker processes.
+# JOB_QUEUE_WORKERS processes start with the app (0 = only external `python -m services.job_workers`).
+JOB_QUEUE_ENABLED = os.getenv("JOB_QUEUE_ENABLED", "false").lower() in ("1", "true", "yes")
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", "jd_jobs.sqlite")
+JOB_QUEUE_WORKERS = int(os.getenv("JOB_QUEUE_WORKERS", "2"))
+JOB_QUEUE_JOBS_PER_WORKER = int(os.getenv("JOB_QUEUE_JOBS_PER_WORKER", "2"))
+JOB_QUEUE_MAX_ATTEMPTS = int(os.getenv("JOB_QUEUE_MAX_ATTEMPTS", "3"))
+JOB_QUEUE_BACKOFF_S = float(os.getenv("JOB_QUEUE_BACKOFF_S", "2.0"))  # doubled per failed attempt
+JOB_QUEUE_BACKOFF_MAX_S = float(os.getenv("JOB_QUEUE_BACKOFF_MAX_S", "60"))
+JOB_QUEUE_LEASE_S = float(os.getenv("JOB_QUEUE_LEASE_S", "30"))  # a dead worker's job is re-claimed after this
+JOB_QUEUE_POLL_S = float(os.getenv("JOB_QUEUE_POLL_S", "0.5"))
+JOB_QUEUE_PARTIAL_INTERVAL_S = float(os.getenv("JOB_QUEUE_PARTIAL_INTERVAL_S", "0.5"))
+JOB_QUEUE_RETENTION_S = float(os.getenv("JOB_QUEUE_RETENTION_S", str(7 * 24 * 3600)))  # finished jobs kept 7 days
+
+# Token streaming: drive the graph via astream_events and forward writer / style tokens
+# to the UI as progressively parsed JobBody sections (set false for node-level updates only).
+GRAPH_TOKEN_STREAMING = os.getenv("GRAPH_TOKEN_STREAMING", "true").lower() in ("1", "true", "yes")
+
+# Per-node timing (services/timing.py): wall time, queue wait, tokens, cache hits and retries
+# per graph node, merged into state["timings"] and the result's timings (false = nodes unwrapped).
+TIMING_ENABLED = os.getenv("TIMING_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Prometheus text-exposition endpoint (services/metrics.py) on a side port.
+# Metrics are always recorded in-process; this only controls the HTTP endpoint.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() in ("1", "true", "yes")
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
+
 # Streamlit Password Protection (MVP testing safeguard)
 STREAMLIT_USERNAME = os.getenv("STREAMLIT_USERNAME")  # Set in .env to enable username requirement
 STREAMLIT_PASSWORD = os.getenv("STREAMLIT_PASSWORD")  # Set in .env to enable password protection
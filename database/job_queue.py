@@ -0,0 +1,350 @@
+"""
+Durable, SQLite-backed queue of generation jobs.
+
+The Streamlit UI (or any caller) submits a generation request and gets a job
+ID back; worker processes (services/job_workers.py) claim jobs, run
+``generate_with_graph`` and append progress events that the submitter polls.
+The database file is shared by all processes on the box (WAL mode).
+
+Job lifecycle::
+
+    queued ──claim──> running ──> succeeded
+      ^                  │ ──> failed     (error, attempts exhausted)
+      └── retry (backoff)┘ ──> cancelled  (request_cancel)
+
+- Higher ``priority`` is claimed first, then oldest first.
+- A claim is a lease (``lease_s``) the worker renews with ``heartbeat()``.
+  A job whose worker died is claimed again once the lease expires (that
+  counts as an attempt).
+- A failed attempt is re-queued after ``backoff_s * 2**(attempt - 1)``
+  (capped at ``max_backoff_s``) until ``max_attempts`` is reached.
+- Events are numbered per job, so followers poll with ``events(job_id, after)``.
+
+Usage:
+    from database.job_queue import get_job_queue
+
+    queue = get_job_queue()
+    job_id = queue.submit({"job_title": "Data Engineer", ...}, user_id="u1", priority=10)
+    for seq, event in queue.events(job_id, after=0):
+        ...
+    queue.get(job_id)["status"]
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+STATUSES = ("queued", "running", "succeeded", "failed", "cancelled")
+TERMINAL = ("succeeded", "failed", "cancelled")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS generation_jobs (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    job_title TEXT,
+    request TEXT NOT NULL,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    worker TEXT,
+    lease_until REAL,
+    cancel_reason TEXT,
+    result TEXT,
+    error TEXT,
+    next_seq INTEGER NOT NULL DEFAULT 1,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON generation_jobs (status, priority DESC, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_finished ON generation_jobs (finished_at);
+CREATE TABLE IF NOT EXISTS generation_job_events (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    event TEXT NOT NULL,
+    PRIMARY KEY (job_id, seq)
+);
+"""
+
+_COLUMNS = (
+    "id, user_id, job_title, request, status, priority, attempts, max_attempts, available_at, "
+    "worker, lease_until, cancel_reason, result, error, created_at, started_at, finished_at"
+)
+
+
+def _row_to_job(row: Tuple) -> Dict[str, Any]:
+    job = dict(zip([c.strip() for c in _COLUMNS.split(",")], row))
+    job["request"] = json.loads(job["request"])
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+
+class GenerationJobQueue:
+    """SQLite job queue with leases, retries and per-job event logs (thread- and process-safe)."""
+
+    def __init__(
+        self,
+        db_path: str = "jd_jobs.sqlite",
+        *,
+        max_attempts: int = 3,
+        backoff_s: float = 2.0,
+        max_backoff_s: float = 60.0,
+        lease_s: float = 30.0,
+    ):
+        self.db_path = db_path
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_s = backoff_s
+        self.max_backoff_s = max_backoff_s
+        self.lease_s = lease_s
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=10.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # Submitter side
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        request: Dict[str, Any],
+        *,
+        user_id: str = "default",
+        job_title: Optional[str] = None,
+        priority: int = 0,
+        max_attempts: Optional[int] = None,
+    ) -> str:
+        """Queue *request* (JSON-serialisable kwargs for the worker) and return its job ID."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO generation_jobs (id, user_id, job_title, request, status, priority, "
+                "max_attempts, available_at, created_at) VALUES (?, ?, ?, ?, 'queued', ?, ?, ?, ?)",
+                (
+                    job_id, user_id, job_title, json.dumps(request, ensure_ascii=False, default=str),
+                    priority, max_attempts or self.max_attempts, now, now,
+                ),
+            )
+        logger.info(f"[JobQueue] Queued job {job_id[:8]} (priority {priority}, user {user_id})")
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_COLUMNS} FROM generation_jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+
+    def events(self, job_id: str, after: int = 0) -> List[Tuple[int, Dict[str, Any]]]:
+        """Events of *job_id* with ``seq > after``, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, event FROM generation_job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after),
+            ).fetchall()
+        return [(seq, json.loads(event)) for seq, event in rows]
+
+    def request_cancel(self, job_id: str, reason: str = "cancelled") -> bool:
+        """Cancel a queued job now, or ask its worker to stop; False if it already finished."""
+        now = time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE generation_jobs SET status = 'cancelled', cancel_reason = ?, finished_at = ? "
+                "WHERE id = ? AND status = 'queued'",
+                (reason, now, job_id),
+            )
+            if cur.rowcount:
+                return True
+            cur = self._conn.execute(
+                "UPDATE generation_jobs SET cancel_reason = ? "
+                "WHERE id = ? AND status = 'running' AND cancel_reason IS NULL",
+                (reason, job_id),
+            )
+            return bool(cur.rowcount)
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """Lease the next runnable job to *worker* (highest priority, then oldest)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs whose worker died on the last allowed attempt are not retried again
+                self._conn.execute(
+                    "UPDATE generation_jobs SET status = 'failed', finished_at = ?, "
+                    "error = 'worker lost' || COALESCE(' (previous attempt: ' || error || ')', '') "
+                    "WHERE status = 'running' AND lease_until < ? AND attempts >= max_attempts",
+                    (now, now),
+                )
+                row = self._conn.execute(
+                    f"SELECT {_COLUMNS} FROM generation_jobs "
+                    "WHERE (status = 'queued' AND available_at <= ?) "
+                    "OR (status = 'running' AND lease_until < ?) "
+                    "ORDER BY priority DESC, created_at LIMIT 1",
+                    (now, now),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                job = _row_to_job(row)
+                self._conn.execute(
+                    "UPDATE generation_jobs SET status = 'running', attempts = attempts + 1, worker = ?, "
+                    "lease_until = ?, started_at = COALESCE(started_at, ?) WHERE id = ?",
+                    (worker, now + self.lease_s, now, job["id"]),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if job["status"] == "running":
+            logger.warning(f"[JobQueue] Re-claiming job {job['id'][:8]} from lost worker {job['worker']}")
+        job["attempts"] += 1
+        job["status"], job["worker"] = "running", worker
+        return job
+
+    def heartbeat(self, job_id: str, worker: str) -> Tuple[bool, Optional[str]]:
+        """Renew the lease; returns (still ours, cancel reason if cancellation was requested)."""
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE generation_jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                (time.time() + self.lease_s, job_id, worker),
+            )
+            row = self._conn.execute("SELECT cancel_reason FROM generation_jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(cur.rowcount), (row[0] if row else None)
+
+    def add_event(self, job_id: str, event: Dict[str, Any]) -> int:
+        """Append *event* to the job's log; returns its sequence number."""
+        payload = json.dumps(event, ensure_ascii=False, default=str)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                (seq,) = self._conn.execute(
+                    "SELECT next_seq FROM generation_jobs WHERE id = ?", (job_id,)
+                ).fetchone()
+                self._conn.execute(
+                    "INSERT INTO generation_job_events (job_id, seq, created_at, event) VALUES (?, ?, ?, ?)",
+                    (job_id, seq, time.time(), payload),
+                )
+                self._conn.execute("UPDATE generation_jobs SET next_seq = ? WHERE id = ?", (seq + 1, job_id))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return seq
+
+    def complete(self, job_id: str, worker: str, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE generation_jobs SET status = 'succeeded', result = ?, finished_at = ?, lease_until = NULL "
+                "WHERE id = ? AND worker = ?",
+                (json.dumps(result, ensure_ascii=False, default=str), time.time(), job_id, worker),
+            )
+
+    def mark_cancelled(self, job_id: str, worker: str, reason: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE generation_jobs SET status = 'cancelled', cancel_reason = COALESCE(cancel_reason, ?), "
+                "finished_at = ?, lease_until = NULL WHERE id = ? AND worker = ?",
+                (reason, time.time(), job_id, worker),
+            )
+
+    def fail(self, job_id: str, worker: str, error: str, *, retry: bool = True) -> Optional[float]:
+        """Record a failed attempt; returns the retry delay, or None when the job failed for good."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT attempts, max_attempts, cancel_reason FROM generation_jobs WHERE id = ? AND worker = ?",
+                (job_id, worker),
+            ).fetchone()
+            if row is None:
+                return None  # Lease lost: another worker owns the job now
+            attempts, max_attempts, cancel_reason = row
+            if retry and attempts < max_attempts and cancel_reason is None:
+                delay = min(self.max_backoff_s, self.backoff_s * 2 ** (attempts - 1))
+                self._conn.execute(
+                    "UPDATE generation_jobs SET status = 'queued', available_at = ?, error = ?, "
+                    "worker = NULL, lease_until = NULL WHERE id = ?",
+                    (now + delay, error, job_id),
+                )
+                return delay
+            self._conn.execute(
+                "UPDATE generation_jobs SET status = 'failed', error = ?, finished_at = ?, lease_until = NULL "
+                "WHERE id = ?",
+                (error, now, job_id),
+            )
+        return None
+
+    # ------------------------------------------------------------------
+    # Housekeeping
+    # ------------------------------------------------------------------
+
+    def purge(self, older_than_s: float) -> int:
+        """Delete finished jobs (and their events) older than *older_than_s*."""
+        cutoff = time.time() - older_than_s
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM generation_job_events WHERE job_id IN "
+                "(SELECT id FROM generation_jobs WHERE finished_at < ?)",
+                (cutoff,),
+            )
+            cur = self._conn.execute("DELETE FROM generation_jobs WHERE finished_at < ?", (cutoff,))
+            return cur.rowcount or 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM generation_jobs GROUP BY status").fetchall())
+            (retried,) = self._conn.execute(
+                "SELECT COUNT(*) FROM generation_jobs WHERE attempts > 1"
+            ).fetchone()
+        return {"jobs": {status: counts.get(status, 0) for status in STATUSES}, "retried": retried}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Module-level singleton
+# ---------------------------------------------------------------------------
+
+_job_queue: Optional[GenerationJobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> GenerationJobQueue:
+    """Return this process's handle on the shared job queue (created lazily from config)."""
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                from config import (
+                    JOB_QUEUE_PATH,
+                    JOB_QUEUE_MAX_ATTEMPTS,
+                    JOB_QUEUE_BACKOFF_S,
+                    JOB_QUEUE_BACKOFF_MAX_S,
+                    JOB_QUEUE_LEASE_S,
+                )
+                _job_queue = GenerationJobQueue(
+                    JOB_QUEUE_PATH,
+                    max_attempts=JOB_QUEUE_MAX_ATTEMPTS,
+                    backoff_s=JOB_QUEUE_BACKOFF_S,
+                    max_backoff_s=JOB_QUEUE_BACKOFF_MAX_S,
+                    lease_s=JOB_QUEUE_LEASE_S,
+                )
+    return _job_queue
@@ -0,0 +1,233 @@
+"""
+Content-addressed on-disk cache for individual LLM responses.
+
+Each row is keyed by a hash of everything that determines the response
+(model, canonical messages, temperature, extra_body, output schema — see
+``llm_service.llm_cache_key``) and stores the decoded response as
+zlib-compressed JSON.  Evals and regression runs that generate the same
+scenarios repeatedly then cost one round-trip per distinct prompt, and
+benchmarks can be replayed against identical payloads.
+
+Entries expire after a TTL; when the cache grows past ``max_entries`` or
+``max_bytes`` the least recently used rows are evicted.  Hit/miss counters
+are kept per call site ("writer", "style", "section", "judge").
+
+Usage:
+    from database.llm_cache import get_llm_cache
+
+    cache = get_llm_cache()
+    value = cache.get(key, site="writer")
+    if value is None:
+        value = ...
+        cache.put(key, value, site="writer", model=model)
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    site TEXT NOT NULL,
+    model TEXT,
+    payload BLOB NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_llm_responses_last_access ON llm_responses (last_access);
+"""
+
+
+class LLMResponseCache:
+    """SQLite-backed LLM response cache with TTL and LRU size eviction (thread-safe)."""
+
+    def __init__(
+        self,
+        db_path: str = "jd_llm_cache.sqlite",
+        *,
+        ttl_s: float = 30 * 24 * 3600,
+        max_entries: int = 50_000,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.db_path = db_path
+        self.ttl_s = ttl_s
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        self._site_counts: Dict[str, Dict[str, int]] = {}
+        self._evictions = 0
+
+    def _count(self, site: str, field: str) -> None:
+        counts = self._site_counts.setdefault(site, {"hits": 0, "misses": 0, "stores": 0})
+        counts[field] += 1
+
+    # ------------------------------------------------------------------
+    # Read / write
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, *, site: str = "default", default: Any = None) -> Any:
+        """Return the cached value for *key*, or *default* if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._count(site, "misses")
+                return default
+            payload, created_at = row
+            if self.ttl_s > 0 and now - created_at > self.ttl_s:
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._count(site, "misses")
+                self._evictions += 1
+                return default
+            self._conn.execute(
+                "UPDATE llm_responses SET last_access = ?, hits = hits + 1 WHERE key = ?",
+                (now, key),
+            )
+            self._count(site, "hits")
+        try:
+            return json.loads(zlib.decompress(payload).decode("utf-8"))
+        except (zlib.error, UnicodeDecodeError, json.JSONDecodeError):
+            logger.warning(f"[LLMCache] Dropping undecodable entry {key[:12]}")
+            self.delete(key)
+            return default
+
+    def put(self, key: str, value: Any, *, site: str = "default", model: Optional[str] = None) -> None:
+        """Store *value* (JSON-serialisable) under *key* and evict if over budget."""
+        try:
+            raw = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        except (TypeError, ValueError) as e:
+            logger.warning(f"[LLMCache] {site} response not cacheable: {e}")
+            return
+        payload = zlib.compress(raw.encode("utf-8"), 6)
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses "
+                "(key, site, model, payload, size_bytes, created_at, last_access, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+                (key, site, model, payload, size, now, now),
+            )
+            self._count(site, "stores")
+            self._evict_locked(now)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+
+    # ------------------------------------------------------------------
+    # Eviction
+    # ------------------------------------------------------------------
+
+    def clear(self, site: Optional[str] = None) -> None:
+        """Drop every entry (or only those written by *site*)."""
+        with self._lock:
+            if site is None:
+                self._conn.execute("DELETE FROM llm_responses")
+            else:
+                self._conn.execute("DELETE FROM llm_responses WHERE site = ?", (site,))
+
+    def evict(self) -> int:
+        """Apply TTL and size limits now; returns the number of rows removed."""
+        with self._lock:
+            return self._evict_locked(time.time())
+
+    def _evict_locked(self, now: float) -> int:
+        removed = 0
+        if self.ttl_s > 0:
+            cur = self._conn.execute(
+                "DELETE FROM llm_responses WHERE created_at < ?", (now - self.ttl_s,)
+            )
+            removed += cur.rowcount or 0
+
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM llm_responses"
+        ).fetchone()
+        if count > self.max_entries or total > self.max_bytes:
+            # Walk rows oldest-access first until both limits hold
+            drop = []
+            for key, size in self._conn.execute(
+                "SELECT key, size_bytes FROM llm_responses ORDER BY last_access ASC"
+            ):
+                if count <= self.max_entries and total <= self.max_bytes:
+                    break
+                drop.append((key,))
+                count -= 1
+                total -= size
+            self._conn.executemany("DELETE FROM llm_responses WHERE key = ?", drop)
+            removed += len(drop)
+
+        self._evictions += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM llm_responses"
+            ).fetchone()
+            hits = sum(c["hits"] for c in self._site_counts.values())
+            misses = sum(c["misses"] for c in self._site_counts.values())
+            return {
+                "entries": count,
+                "bytes": total,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+                "evictions": self._evictions,
+                "sites": {site: dict(c) for site, c in self._site_counts.items()},
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Module-level singleton
+# ---------------------------------------------------------------------------
+
+_llm_cache: Optional[LLMResponseCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Return the process-wide LLM response cache (created lazily from config)."""
+    global _llm_cache
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                from config import (
+                    LLM_CACHE_PATH,
+                    LLM_CACHE_TTL_S,
+                    LLM_CACHE_MAX_ENTRIES,
+                    LLM_CACHE_MAX_MB,
+                )
+                _llm_cache = LLMResponseCache(
+                    LLM_CACHE_PATH,
+                    ttl_s=LLM_CACHE_TTL_S,
+                    max_entries=LLM_CACHE_MAX_ENTRIES,
+                    max_bytes=int(LLM_CACHE_MAX_MB * 1024 * 1024),
+                )
+    return _llm_cache
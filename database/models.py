@@ -2,12 +2,15 @@
 SQLAlchemy models for the database.
 Django-style ORM approach for data persistence.
 """
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Index
+from sqlalchemy import create_engine, event, Column, Integer, String, Text, DateTime, Index, func
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
 from datetime import datetime, timezone
 from typing import Optional
+import time
 import streamlit as st
 
+from services.metrics import observe_db_query
+
 Base = declarative_base()
 
 
@@ -64,12 +67,32 @@ class Interaction(Base):
     )
 
 
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    operation = statement.lstrip().split(None, 1)[0].lower() if statement.strip() else "other"
+    observe_db_query(operation, time.perf_counter() - started)
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
 class DatabaseManager:
     """Django-style ORM database manager."""
     
     def __init__(self, db_path: str = "jd_database.sqlite"):
         self.db_path = db_path
         self.engine = create_engine(f"sqlite:///{db_path}", echo=False)
+        # Statement timings for the metrics endpoint (services/metrics.py)
+        event.listen(self.engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(self.engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(self.engine, "handle_error", _handle_error)
         Base.metadata.create_all(self.engine)
         self.SessionLocal = sessionmaker(bind=self.engine)
     
@@ -128,6 +151,39 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def get_gold_standards_after(
+        self,
+        user_id: str,
+        after_id: int = 0,
+        limit: int = 10
+    ) -> list[dict]:
+        """Retrieve gold standards with ``id > after_id`` (newest ``limit``), oldest first.
+
+        Used by the incremental store sync: ``after_id`` is the per-user high-water mark.
+        """
+        session = self.get_session()
+        try:
+            query = (
+                session.query(GoldStandard)
+                .filter(GoldStandard.user_id == user_id, GoldStandard.id > after_id)
+                .order_by(GoldStandard.id.desc())
+                .limit(limit)
+            )
+            results = []
+            for gs in reversed(query.all()):
+                results.append({
+                    "id": gs.id,
+                    "user_id": gs.user_id,
+                    "job_title": gs.job_title,
+                    "job_body_json": gs.job_body_json,
+                    "config_json": gs.config_json,
+                    "created_at": gs.created_at.isoformat() if gs.created_at else None,
+                    "updated_at": gs.updated_at.isoformat() if gs.updated_at else None,
+                })
+            return results
+        finally:
+            session.close()
+    
     def save_user_feedback(
         self,
         user_id: str,
@@ -181,6 +237,96 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def get_user_feedback_after(
+        self,
+        user_id: str,
+        after_id: int = 0,
+        limit: int = 20
+    ) -> list[dict]:
+        """Retrieve user feedback with ``id > after_id`` (newest ``limit``), oldest first."""
+        session = self.get_session()
+        try:
+            query = (
+                session.query(UserFeedback)
+                .filter(UserFeedback.user_id == user_id, UserFeedback.id > after_id)
+                .order_by(UserFeedback.id.desc())
+                .limit(limit)
+            )
+            results = []
+            for fb in reversed(query.all()):
+                results.append({
+                    "id": fb.id,
+                    "user_id": fb.user_id,
+                    "job_title": fb.job_title,
+                    "feedback_type": fb.feedback_type,
+                    "feedback_text": fb.feedback_text,
+                    "job_body_json": fb.job_body_json,
+                    "created_at": fb.created_at.isoformat() if fb.created_at else None,
+                })
+            return results
+        finally:
+            session.close()
+    
+    def get_memory_watermarks(
+        self,
+        user_id: str,
+        gold_upto_id: int = 0,
+        feedback_upto_id: int = 0
+    ) -> dict:
+        """Cheap aggregate snapshot for incremental store sync.
+
+        Returns the max row ids plus the number of rows at or below the given
+        ids, so callers can detect new rows (max id grew) and deletions
+        (count at or below the previous high-water mark shrank).
+        """
+        session = self.get_session()
+        try:
+            gold_max = session.query(func.max(GoldStandard.id)).filter(
+                GoldStandard.user_id == user_id
+            ).scalar()
+            gold_count = session.query(func.count(GoldStandard.id)).filter(
+                GoldStandard.user_id == user_id,
+                GoldStandard.id <= gold_upto_id
+            ).scalar()
+            feedback_max = session.query(func.max(UserFeedback.id)).filter(
+                UserFeedback.user_id == user_id
+            ).scalar()
+            feedback_count = session.query(func.count(UserFeedback.id)).filter(
+                UserFeedback.user_id == user_id,
+                UserFeedback.id <= feedback_upto_id
+            ).scalar()
+            return {
+                "gold_max_id": gold_max or 0,
+                "gold_count_upto": gold_count or 0,
+                "feedback_max_id": feedback_max or 0,
+                "feedback_count_upto": feedback_count or 0,
+            }
+        finally:
+            session.close()
+    
+    def get_memory_version(self, user_id: str) -> dict:
+        """Version stamp of a user's gold standards and feedback.
+
+        Changes whenever a row is added or deleted; used to key cached
+        generation results so new memories invalidate them.
+        """
+        session = self.get_session()
+        try:
+            gold_max, gold_count = session.query(
+                func.max(GoldStandard.id), func.count(GoldStandard.id)
+            ).filter(GoldStandard.user_id == user_id).one()
+            feedback_max, feedback_count = session.query(
+                func.max(UserFeedback.id), func.count(UserFeedback.id)
+            ).filter(UserFeedback.user_id == user_id).one()
+            return {
+                "gold_max_id": gold_max or 0,
+                "gold_count": gold_count or 0,
+                "feedback_max_id": feedback_max or 0,
+                "feedback_count": feedback_count or 0,
+            }
+        finally:
+            session.close()
+    
     def save_interaction(
         self,
         user_id: str,
@@ -247,6 +393,43 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def get_ruler_score_history(self, limit: int = 2000) -> list[dict]:
+        """
+        RULER scores of recent generations across all users (newest first).
+
+        Returns ``{"config": dict, "scores": [float, ...]}`` per generation
+        interaction that recorded rankings.  Result-cache hits are skipped so a
+        run is counted once, and so are runs ranked by the local pre-score
+        (judge skipped or failed), whose scores are not RULER scores.
+        """
+        import json
+        session = self.get_session()
+        try:
+            query = (
+                session.query(Interaction.input_data, Interaction.output_data, Interaction.metadata_json)
+                .filter(Interaction.interaction_type == "generation")
+                .order_by(Interaction.id.desc())
+                .limit(limit)
+            )
+            results = []
+            for input_data, output_data, metadata_json in query.all():
+                if not (input_data and output_data):
+                    continue
+                try:
+                    metadata = json.loads(metadata_json) if metadata_json else {}
+                    if metadata.get("cache_hit") or metadata.get("ruler_judged") is False:
+                        continue
+                    config = json.loads(input_data).get("config")
+                    rankings = json.loads(output_data).get("ruler_rankings") or []
+                except (ValueError, AttributeError):
+                    continue
+                scores = [float(r["score"]) for r in rankings if isinstance(r, dict) and "score" in r]
+                if config and scores:
+                    results.append({"config": config, "scores": scores})
+            return results
+        finally:
+            session.close()
+    
     def delete_gold_standard(self, gold_standard_id: int, user_id: str) -> bool:
         """Delete a gold standard by ID. Returns True if deleted, False if not found."""
         session = self.get_session()
@@ -297,7 +480,7 @@ class DatabaseManager:
 
 
 @st.cache_resource
-def get_db_manager(db_path: str = "jd_database.sqlite", _version: int = 3) -> DatabaseManager:
+def get_db_manager(db_path: str = "jd_database.sqlite", _version: int = 6) -> DatabaseManager:
     """Get cached database manager instance.
     
     _version parameter is used to invalidate cache when database methods change.
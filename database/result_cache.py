@@ -0,0 +1,236 @@
+"""
+Persistent exact-match cache for finished job generations.
+
+Repeat requests for the same ad (same title, config, style kit, duties and
+memory version) are served from SQLite in milliseconds instead of re-running
+the blackboard graph (3 writer calls + RULER judge + refinement).
+
+Entries expire after a TTL; when the cache grows past ``max_entries`` or
+``max_bytes`` the least recently used rows are evicted.  Keys are computed by
+the caller (see ``services.graph_service.generation_cache_key``).
+
+Usage:
+    from database.result_cache import get_result_cache
+
+    cache = get_result_cache()
+    hit = cache.get(key)
+    if hit is None:
+        result = ...
+        cache.put(key, result, user_id=user_id, job_title=job_title)
+    cache.invalidate_user(user_id)   # new gold standard / gripe
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS generation_results (
+    key TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    job_title TEXT,
+    payload TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_results_user ON generation_results (user_id);
+CREATE INDEX IF NOT EXISTS idx_results_last_access ON generation_results (last_access);
+"""
+
+
+class GenerationResultCache:
+    """SQLite-backed result cache with TTL and LRU size eviction (thread-safe)."""
+
+    def __init__(
+        self,
+        db_path: str = "jd_result_cache.sqlite",
+        *,
+        ttl_s: float = 7 * 24 * 3600,
+        max_entries: int = 2000,
+        max_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.db_path = db_path
+        self.ttl_s = ttl_s
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    # ------------------------------------------------------------------
+    # Read / write
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for *key*, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM generation_results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            payload, created_at = row
+            if self.ttl_s > 0 and now - created_at > self.ttl_s:
+                self._conn.execute("DELETE FROM generation_results WHERE key = ?", (key,))
+                self._misses += 1
+                self._evictions += 1
+                return None
+            self._conn.execute(
+                "UPDATE generation_results SET last_access = ?, hits = hits + 1 WHERE key = ?",
+                (now, key),
+            )
+            self._hits += 1
+        try:
+            return json.loads(payload)
+        except json.JSONDecodeError:
+            logger.warning(f"[ResultCache] Dropping undecodable entry {key[:12]}")
+            self.delete(key)
+            return None
+
+    def put(
+        self,
+        key: str,
+        value: Dict[str, Any],
+        *,
+        user_id: str = "default",
+        job_title: Optional[str] = None,
+    ) -> None:
+        """Store *value* under *key* and evict if the cache is over budget."""
+        try:
+            payload = json.dumps(value, ensure_ascii=False, default=str)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"[ResultCache] Result not cacheable: {e}")
+            return
+        now = time.time()
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO generation_results "
+                "(key, user_id, job_title, payload, size_bytes, created_at, last_access, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+                (key, user_id, job_title, payload, size, now, now),
+            )
+            self._evict_locked(now)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM generation_results WHERE key = ?", (key,))
+
+    # ------------------------------------------------------------------
+    # Invalidation / eviction
+    # ------------------------------------------------------------------
+
+    def invalidate_user(self, user_id: str) -> int:
+        """Drop every cached result for *user_id* (their memories changed)."""
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM generation_results WHERE user_id = ?", (user_id,))
+            removed = cur.rowcount or 0
+        if removed:
+            logger.info(f"[ResultCache] Invalidated {removed} cached result(s) for user {user_id}")
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM generation_results")
+
+    def evict(self) -> int:
+        """Apply TTL and size limits now; returns the number of rows removed."""
+        with self._lock:
+            return self._evict_locked(time.time())
+
+    def _evict_locked(self, now: float) -> int:
+        removed = 0
+        if self.ttl_s > 0:
+            cur = self._conn.execute(
+                "DELETE FROM generation_results WHERE created_at < ?", (now - self.ttl_s,)
+            )
+            removed += cur.rowcount or 0
+
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM generation_results"
+        ).fetchone()
+        if count > self.max_entries or total > self.max_bytes:
+            # Walk rows oldest-access first until both limits hold
+            drop = []
+            for key, size in self._conn.execute(
+                "SELECT key, size_bytes FROM generation_results ORDER BY last_access ASC"
+            ):
+                if count <= self.max_entries and total <= self.max_bytes:
+                    break
+                drop.append((key,))
+                count -= 1
+                total -= size
+            self._conn.executemany("DELETE FROM generation_results WHERE key = ?", drop)
+            removed += len(drop)
+
+        self._evictions += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM generation_results"
+            ).fetchone()
+            lookups = self._hits + self._misses
+            return {
+                "entries": count,
+                "bytes": total,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "evictions": self._evictions,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Module-level singleton
+# ---------------------------------------------------------------------------
+
+_result_cache: Optional[GenerationResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> GenerationResultCache:
+    """Return the process-wide result cache (created lazily from config)."""
+    global _result_cache
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                from config import (
+                    RESULT_CACHE_PATH,
+                    RESULT_CACHE_TTL_S,
+                    RESULT_CACHE_MAX_ENTRIES,
+                    RESULT_CACHE_MAX_MB,
+                )
+                _result_cache = GenerationResultCache(
+                    RESULT_CACHE_PATH,
+                    ttl_s=RESULT_CACHE_TTL_S,
+                    max_entries=RESULT_CACHE_MAX_ENTRIES,
+                    max_bytes=int(RESULT_CACHE_MAX_MB * 1024 * 1024),
+                )
+    return _result_cache
@@ -1,11 +1,50 @@
 """
 Helper functions to sync ORM database with LangGraph store.
 This ensures gold standards and user gripes are available in the store for the blackboard architecture.
+
+``sync_all_to_store`` copies a user's recent rows on every call.  Long-lived
+stores (see graph/runtime.py) use ``IncrementalStoreSync`` instead, which only
+applies rows above a per-user high-water mark and evicts idle users.
 """
+import threading
+import time
 import uuid
-from typing import Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
 from langgraph.store.base import BaseStore
 from database.models import DatabaseManager
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def _gold_memory(gs: dict) -> tuple[str, dict]:
+    """Store key + value for one gold standard row."""
+    # Use job_title as key, store the full job body
+    memory_id = gs["job_title"]  # or use a hash if titles might conflict
+    memory_value = {
+        "body": gs["job_body_json"],
+        "config": gs.get("config_json"),
+        "created_at": gs.get("created_at"),
+    }
+    return memory_id, memory_value
+
+
+def _gripe_memory(fb: dict) -> Optional[tuple[str, dict]]:
+    """Store key + value for one feedback row, or None if it is not a gripe."""
+    if fb["feedback_type"] in ["rejected", "edited"] and fb.get("feedback_text"):
+        # Create unique key for each gripe
+        memory_id = f"{fb.get('job_title', 'general')}_{fb['id']}"
+        memory_value = {
+            "feedback": fb["feedback_text"],
+            "type": fb["feedback_type"],
+            "job_title": fb.get("job_title"),
+            "created_at": fb.get("created_at"),
+        }
+        return memory_id, memory_value
+    return None
 
 
 def sync_gold_standards_to_store(
@@ -22,13 +61,7 @@ def sync_gold_standards_to_store(
     namespace = (user_id, "gold_standard")
     
     for gs in gold_standards:
-        # Use job_title as key, store the full job body
-        memory_id = gs["job_title"]  # or use a hash if titles might conflict
-        memory_value = {
-            "body": gs["job_body_json"],
-            "config": gs.get("config_json"),
-            "created_at": gs.get("created_at"),
-        }
+        memory_id, memory_value = _gold_memory(gs)
         store.put(namespace, memory_id, memory_value)
 
 
@@ -50,15 +83,9 @@ def sync_user_gripes_to_store(
     namespace = (user_id, "user_gripes")
     
     for fb in feedback:
-        if fb["feedback_type"] in ["rejected", "edited"] and fb.get("feedback_text"):
-            # Create unique key for each gripe
-            memory_id = f"{fb.get('job_title', 'general')}_{fb['id']}"
-            memory_value = {
-                "feedback": fb["feedback_text"],
-                "type": fb["feedback_type"],
-                "job_title": fb.get("job_title"),
-                "created_at": fb.get("created_at"),
-            }
+        gripe = _gripe_memory(fb)
+        if gripe:
+            memory_id, memory_value = gripe
             store.put(namespace, memory_id, memory_value)
 
 
@@ -78,3 +105,241 @@ def sync_all_to_store(
     sync_gold_standards_to_store(store, user_id, db_manager)
     sync_user_gripes_to_store(store, user_id, db_manager)
 
+
+
+@dataclass
+class _UserSyncState:
+    """Per-user high-water marks and the store keys currently held for the user."""
+
+    gold_hwm: int = 0
+    feedback_hwm: int = 0
+    gold_count_upto: int = 0
+    feedback_count_upto: int = 0
+    # key -> row id, oldest first (trimmed to the per-namespace limit)
+    gold_keys: "OrderedDict[str, int]" = field(default_factory=OrderedDict)
+    gripe_keys: "OrderedDict[str, int]" = field(default_factory=OrderedDict)
+    last_access: float = 0.0
+    # Syncs and runs using this user's memories; a pinned user is never evicted
+    pins: int = 0
+    # Serialises ORM reads / store writes for this user only
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def reset(self) -> None:
+        self.gold_hwm = self.feedback_hwm = 0
+        self.gold_count_upto = self.feedback_count_upto = 0
+
+
+class IncrementalStoreSync:
+    """
+    Keep a long-lived LangGraph store in sync with the ORM tables incrementally.
+
+    Per user it remembers the highest gold-standard / feedback row id already
+    applied.  Each ``sync_user`` call runs one aggregate query; only rows above
+    the high-water mark are fetched and written.  If rows at or below the mark
+    were deleted (history panel), the user's namespaces are rebuilt.
+
+    ORM queries and store writes run under a per-user lock, so syncs for
+    different users proceed in parallel; the shared lock only guards the user
+    table.  Wrap a run in ``active(user_id)`` so the user's memories are not
+    evicted while its nodes read them.
+
+    Memory stays bounded: each namespace keeps at most ``gold_limit`` /
+    ``gripe_limit`` entries (same limits as ``sync_all_to_store``), and users
+    idle for ``idle_ttl_s`` or beyond ``max_users`` (LRU) are evicted, unless
+    a sync or run is using them.
+    """
+
+    def __init__(
+        self,
+        store: BaseStore,
+        db_manager: Optional[DatabaseManager] = None,
+        *,
+        max_users: int = 256,
+        idle_ttl_s: float = 3600.0,
+        gold_limit: int = 10,
+        gripe_limit: int = 20,
+    ):
+        self.store = store
+        self._db_manager = db_manager
+        self.max_users = max(1, max_users)
+        self.idle_ttl_s = idle_ttl_s
+        self.gold_limit = gold_limit
+        self.gripe_limit = gripe_limit
+        self._lock = threading.Lock()
+        self._users: "OrderedDict[str, _UserSyncState]" = OrderedDict()
+        self.rows_applied = 0
+        self.full_resyncs = 0
+        self.evictions = 0
+
+    @property
+    def db_manager(self) -> DatabaseManager:
+        if self._db_manager is None:
+            from database.models import get_db_manager
+            self._db_manager = get_db_manager()
+        return self._db_manager
+
+    def _pin(self, user_id: str) -> _UserSyncState:
+        with self._lock:
+            state = self._users.get(user_id)
+            if state is None:
+                state = self._users[user_id] = _UserSyncState()
+            self._users.move_to_end(user_id)
+            state.last_access = time.monotonic()
+            state.pins += 1
+            return state
+
+    def _unpin(self, state: _UserSyncState) -> None:
+        with self._lock:
+            state.pins -= 1
+            state.last_access = time.monotonic()
+
+    @contextmanager
+    def active(self, user_id: str):
+        """Keep *user_id*'s memories in the store for the duration of a run."""
+        state = self._pin(user_id)
+        try:
+            yield
+        finally:
+            self._unpin(state)
+
+    def sync_user(self, user_id: str) -> Dict[str, int]:
+        """Apply new rows for *user_id*; returns the number of rows applied."""
+        state = self._pin(user_id)
+        try:
+            with state.lock:
+                applied, resynced = self._sync_locked(user_id, state)
+        finally:
+            self._unpin(state)
+
+        with self._lock:
+            self.rows_applied += applied["gold"] + applied["gripes"]
+            self.full_resyncs += resynced
+            self._evict_locked(time.monotonic(), keep=user_id)
+        return applied
+
+    def _sync_locked(self, user_id: str, state: _UserSyncState) -> Tuple[Dict[str, int], int]:
+        """ORM reads and store writes for one user (caller holds ``state.lock``)."""
+        resynced = 0
+        marks = self.db_manager.get_memory_watermarks(
+            user_id, state.gold_hwm, state.feedback_hwm
+        )
+        if (
+            marks["gold_count_upto"] != state.gold_count_upto
+            or marks["feedback_count_upto"] != state.feedback_count_upto
+        ):
+            # Rows below the high-water mark disappeared — rebuild this user
+            logger.debug(f"[StoreSync] Deletions detected for {user_id}, full resync")
+            self._drop_user_keys(user_id, state)
+            state.reset()
+            resynced = 1
+
+        applied = {"gold": 0, "gripes": 0}
+        old_marks = (state.gold_hwm, state.feedback_hwm)
+        if marks["gold_max_id"] > state.gold_hwm:
+            applied["gold"] = self._apply_gold(user_id, state)
+        if marks["feedback_max_id"] > state.feedback_hwm:
+            applied["gripes"] = self._apply_feedback(user_id, state)
+
+        # Re-baseline the deletion check only when a mark actually moved
+        if (state.gold_hwm, state.feedback_hwm) != old_marks:
+            marks = self.db_manager.get_memory_watermarks(
+                user_id, state.gold_hwm, state.feedback_hwm
+            )
+        state.gold_count_upto = marks["gold_count_upto"]
+        state.feedback_count_upto = marks["feedback_count_upto"]
+        return applied, resynced
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop a user's synced memories; the next sync reloads them from the ORM."""
+        with self._lock:
+            if user_id not in self._users:
+                return
+        state = self._pin(user_id)
+        try:
+            with state.lock:
+                self._drop_user_keys(user_id, state)
+                state.reset()
+        finally:
+            self._unpin(state)
+
+    def evict_idle(self) -> int:
+        """Evict users idle for longer than ``idle_ttl_s``; returns how many."""
+        with self._lock:
+            return self._evict_locked(time.monotonic())
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "users": len(self._users),
+                "active_users": sum(1 for state in self._users.values() if state.pins),
+                "rows_applied": self.rows_applied,
+                "full_resyncs": self.full_resyncs,
+                "evictions": self.evictions,
+            }
+
+    # ------------------------------------------------------------------
+
+    def _apply_gold(self, user_id: str, state: _UserSyncState) -> int:
+        namespace = (user_id, "gold_standard")
+        rows = self.db_manager.get_gold_standards_after(
+            user_id, state.gold_hwm, limit=self.gold_limit
+        )
+        for gs in rows:
+            memory_id, memory_value = _gold_memory(gs)
+            self.store.put(namespace, memory_id, memory_value)
+            state.gold_keys.pop(memory_id, None)
+            state.gold_keys[memory_id] = gs["id"]
+        # High-water mark is the newest row id, even if older ones were skipped by the limit
+        if rows:
+            state.gold_hwm = max(state.gold_hwm, rows[-1]["id"])
+        self._trim(namespace, state.gold_keys, self.gold_limit)
+        return len(rows)
+
+    def _apply_feedback(self, user_id: str, state: _UserSyncState) -> int:
+        namespace = (user_id, "user_gripes")
+        rows = self.db_manager.get_user_feedback_after(
+            user_id, state.feedback_hwm, limit=self.gripe_limit
+        )
+        applied = 0
+        for fb in rows:
+            gripe = _gripe_memory(fb)
+            if gripe:
+                memory_id, memory_value = gripe
+                self.store.put(namespace, memory_id, memory_value)
+                state.gripe_keys[memory_id] = fb["id"]
+                applied += 1
+        if rows:
+            state.feedback_hwm = max(state.feedback_hwm, rows[-1]["id"])
+        self._trim(namespace, state.gripe_keys, self.gripe_limit)
+        return applied
+
+    def _trim(self, namespace: tuple, keys: "OrderedDict[str, int]", limit: int) -> None:
+        while len(keys) > limit:
+            key, _ = keys.popitem(last=False)
+            self.store.delete(namespace, key)
+
+    def _drop_user_keys(self, user_id: str, state: _UserSyncState) -> None:
+        for key in state.gold_keys:
+            self.store.delete((user_id, "gold_standard"), key)
+        for key in state.gripe_keys:
+            self.store.delete((user_id, "user_gripes"), key)
+        state.gold_keys.clear()
+        state.gripe_keys.clear()
+
+    def _evict_locked(self, now: float, keep: Optional[str] = None) -> int:
+        evicted = 0
+        for user_id in list(self._users):
+            state = self._users[user_id]
+            if user_id == keep or state.pins:
+                continue
+            over_capacity = len(self._users) > self.max_users
+            idle = self.idle_ttl_s > 0 and now - state.last_access > self.idle_ttl_s
+            if not (over_capacity or idle):
+                # OrderedDict is LRU-ordered: everything after this is fresher
+                break
+            # Unpinned, so no sync holds state.lock; pins are taken under self._lock
+            self._drop_user_keys(user_id, state)
+            del self._users[user_id]
+            evicted += 1
+        self.evictions += evicted
+        return evicted
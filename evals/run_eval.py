@@ -22,7 +22,6 @@ import argparse
 import asyncio
 import csv
 import json
-import re
 import sys
 import time
 from datetime import datetime, timezone
@@ -36,6 +35,7 @@ from openai.types.chat import ChatCompletionMessage
 # Project imports  (run from project root: python -m evals.run_eval)
 from models.job_models import JobBody, JobGenerationConfig, StyleProfile
 from generators.job_generator import render_job_body_async
+from ruler.local_checks import sentence_start_variety as _sentence_start_variety
 from ruler.ruler_utils import score_group_with_fallback
 from services.swiss_german import check_pronoun_consistency, check_swiss_vocab
 from services.style_router import route_style
@@ -57,29 +57,6 @@ def _check_pronoun(all_text: str, formality: str) -> bool:
     return ok
 
 
-def _sentence_start_variety(bullet_lists: List[List[str]]) -> float:
-    """
-    Measure variety of first words across all bullet-point lists.
-
-    Returns the ratio  unique_first_words / total_bullets  in [0, 1].
-    A score of 1.0 means every bullet starts with a different word.
-    """
-    first_words: List[str] = []
-    for bullets in bullet_lists:
-        for b in bullets:
-            b = b.strip()
-            if not b:
-                continue
-            # Take the first word (lowercased, stripped of punctuation)
-            word = re.split(r"[\s:,;/]", b, maxsplit=1)[0].lower().strip()
-            if word:
-                first_words.append(word)
-    if not first_words:
-        return 0.0
-    unique = len(set(first_words))
-    return unique / len(first_words)
-
-
 # ---------------------------------------------------------------------------
 # Motivkompass color descriptions (for RULER prompt injection)
 # ---------------------------------------------------------------------------
@@ -374,11 +351,23 @@ async def run_eval(
     dataset_path: str,
     output_csv: str,
     batch_size: int = 5,
-    concurrency: int = 5,
+    concurrency: Optional[int] = None,
 ) -> List[EvalResult]:
     """
     Run the full evaluation: generate JDs, score with RULER, write CSV.
+
+    All LLM calls run at batch priority, so the process-wide concurrency
+    governor (services/concurrency.py) decides the real request rate and
+    keeps headroom for interactive generations.  ``concurrency`` only caps
+    how many scenarios are in flight (default: LLM_CONCURRENCY_MAX).
     """
+    from config import LLM_CONCURRENCY_MAX
+    from services.concurrency import Priority, llm_priority
+
+    llm_priority.set(Priority.BATCH)
+    if concurrency is None:
+        concurrency = LLM_CONCURRENCY_MAX
+
     # Load scenarios
     raw = json.loads(Path(dataset_path).read_text(encoding="utf-8"))
     scenarios = [EvalScenario(**s) for s in raw]
@@ -534,11 +523,15 @@ def main() -> None:
         help="RULER scoring batch size (default: 5)",
     )
     parser.add_argument(
-        "--concurrency", type=int, default=5,
-        help="Max parallel JD generation calls (default: 5)",
+        "--concurrency", type=int, default=None,
+        help="Max scenarios in flight (default: LLM_CONCURRENCY_MAX; "
+        "the adaptive governor sets the actual LLM request rate)",
     )
     args = parser.parse_args()
 
+    from services.startup import ensure_metrics_server
+    ensure_metrics_server()
+
     asyncio.run(
         run_eval(
             dataset_path=args.dataset,
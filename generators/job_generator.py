@@ -160,10 +160,12 @@ def _build_duties_instruction(
     duty_bullets: Optional[List[str]],
     duty_source: Optional[str],
     lang: str,
+    short: bool = False,
 ) -> str:
     """
     One-line instruction for the output-schema section of the prompt that
-    tells the LLM how to fill the ``duties`` field.
+    tells the LLM how to fill the ``duties`` field (fewer generated bullets
+    when *short*).
     """
     if duty_bullets and duty_source in ("user", "category"):
         n = len(duty_bullets)
@@ -178,8 +180,8 @@ def _build_duties_instruction(
         )
     # LLM-generate fallback
     if lang == "en":
-        return "duties: 5 to 8 bullets describing day-to-day responsibilities."
-    return "duties: 5 bis 8 Stichpunkte zu den täglichen Aufgaben."
+        return f"duties: {'4 to 5' if short else '5 to 8'} bullets describing day-to-day responsibilities."
+    return f"duties: {'4 bis 5' if short else '5 bis 8'} Stichpunkte zu den täglichen Aufgaben."
 
 
 def _post_process_duties(
@@ -236,6 +238,7 @@ def render_job_body(
     style_kit: Optional[StyleKit] = None,
     duty_bullets: Optional[List[str]] = None,
     duty_source: Optional[str] = None,
+    cache: bool = True,
 ) -> JobBody:
     """
     Pure JD generator.
@@ -255,6 +258,7 @@ def render_job_body(
         duty_bullets: Pre-resolved duty bullet points from the 3-tier cascade
                      (user input → category match → empty for LLM fallback).
         duty_source: Source of duty_bullets: "user", "category", or "llm".
+        cache: If False, skip the LLM response cache for this call.
     
     Context Engineering for MAS:
     - Gold examples are added as few-shot examples when available
@@ -494,7 +498,18 @@ def render_job_body(
             "summary: 1 kurzer Abschlusssatz, der zur Bewerbung einlädt.\n"
         )
 
-    payload: JobBody = writer_model.invoke(prompt)
+    from config import MODEL_BASE
+    from llm_service import cached_invoke, llm_cache_key
+    from services.concurrency import governed_sync
+    payload: JobBody = cached_invoke(
+        "writer",
+        llm_cache_key(MODEL_BASE, prompt, temperature=temp, schema=JobBody),
+        lambda: governed_sync(MODEL_BASE, lambda: writer_model.invoke(prompt), site="writer"),
+        model=MODEL_BASE,
+        schema=JobBody,
+        cacheable=lambda jb: bool(jb.job_description),
+        cache=cache,
+    )
 
     # ── Schweizer Schriftdeutsch post-processing (ß→ss + CH vocabulary) ──
     if lang == "de":
@@ -567,6 +582,7 @@ def generate_job_body_candidate(
     style_kit: Optional[StyleKit] = None,
     duty_bullets: Optional[List[str]] = None,
     duty_source: Optional[str] = None,
+    cache: bool = True,
 ) -> JobBody:
     """Use the same logic as the graph, with a slightly adjusted temperature."""
     base_temp = cfg.temperature
@@ -574,6 +590,7 @@ def generate_job_body_candidate(
     return render_job_body(
         job_title, cfg, temperature=temp, gold_examples=gold_examples,
         style_kit=style_kit, duty_bullets=duty_bullets, duty_source=duty_source,
+        cache=cache,
     )
 
 
@@ -585,35 +602,27 @@ async def render_job_body_async(
     style_kit: Optional[StyleKit] = None,
     duty_bullets: Optional[List[str]] = None,
     duty_source: Optional[str] = None,
+    cache: bool = True,
 ) -> JobBody:
     """
     Async version of render_job_body that uses ainvoke for true parallel execution.
     This allows multiple candidates to be generated concurrently without blocking.
-    Creates a fresh LLM instance for each call to avoid connection pool contention.
+    Uses the shared, pooled LLM client for this event loop (see llm_service.get_chat_model).
     """
-    from langchain_openai import ChatOpenAI
-    from config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL, MODEL_BASE
+    from config import MODEL_BASE
+    from llm_service import get_model_llm
     
     cfg = cfg.with_industry_defaults()
     lang = cfg.language
     temp = temperature if temperature is not None else cfg.temperature
 
-    # Create a fresh LLM instance for this call to avoid connection pool contention
-    # This ensures true parallelism when multiple calls happen simultaneously
-    # Optimize for latency with provider routing + disable thinking for Qwen models
-    from llm_service import _get_extra_body_for_model
-    extra_body = _get_extra_body_for_model(MODEL_BASE)
-    
-    base_llm = ChatOpenAI(
-        model=MODEL_BASE,
-        temperature=0,
-        api_key=OPENROUTER_API_KEY,
-        base_url=OPENROUTER_BASE_URL,
-        extra_body=extra_body,
-    )
-    writer_model = base_llm.with_structured_output(JobBody).bind(
-        temperature=temp
-    )
+    # Shared client from the registry (pooled keep-alive connections, no per-call
+    # TLS handshake); provider routing + disabled thinking for Qwen via extra_body
+    base_llm = get_model_llm(MODEL_BASE)
+    writer_model = base_llm.with_structured_output(JobBody).bind(temperature=temp)
+    # Under a tight latency budget ask for shorter sections (services/deadline.py)
+    from services.deadline import writer_budget_tight
+    short = writer_budget_tight()
 
     # tone line (German: includes explicit Sie/du pronoun rule)
     if lang == "en":
@@ -808,10 +817,10 @@ async def render_job_body_async(
             f"Job title: {job_title}\n\n"
             "Produce a JobBody instance in English.\n"
             "IMPORTANT: Do NOT include bullet markers (-, •, *, –) at the start of list items. Provide plain text only.\n"
-            "job_description: 2 to 4 sentences for role and context.\n"
-            "requirements: 6 to 10 bullets matching seniority and skills.\n"
+            f"job_description: {'2' if short else '2 to 4'} sentences for role and context.\n"
+            f"requirements: {'5 to 6' if short else '6 to 10'} bullets matching seniority and skills.\n"
             "benefits: ONLY use the benefit keywords provided above. Expand each keyword into a full, grammatically correct sentence (like 'Remote work in Switzerland' from 'remote work switzerland'). Create exactly one bullet per keyword. Do NOT add any other benefits.\n"
-            f"{_build_duties_instruction(duty_bullets, duty_source, 'en')}\n"
+            f"{_build_duties_instruction(duty_bullets, duty_source, 'en', short)}\n"
             "summary: 1 short closing line inviting candidates to apply.\n"
         )
     else:
@@ -830,15 +839,29 @@ async def render_job_body_async(
             f"Stellentitel: {job_title}\n\n"
             "Erstelle eine JobBody Struktur auf Schweizer Schriftdeutsch.\n"
             "WICHTIG: Verwende KEINE Aufzählungszeichen (-, •, *, –) am Anfang der Listeneinträge. Gib nur den reinen Text an.\n"
-            "job_description: 2 bis 4 Sätze zu Rolle und Kontext.\n"
-            "requirements: 6 bis 10 Stichpunkte, passend zur Seniorität und zu den Skills.\n"
+            f"job_description: {'2' if short else '2 bis 4'} Sätze zu Rolle und Kontext.\n"
+            f"requirements: {'5 bis 6' if short else '6 bis 10'} Stichpunkte, passend zur Seniorität und zu den Skills.\n"
             "benefits: Verwende AUSSCHLIESSLICH die oben angegebenen Benefit Stichworte. Erweitere jedes Stichwort zu einem vollständigen, grammatikalisch korrekten Satz (z.B. 'Remote Work in der Schweiz' aus 'Remote Work Schweiz'). Erstelle genau einen Bullet Point pro Stichwort. Füge KEINE weiteren Benefits hinzu.\n"
-            f"{_build_duties_instruction(duty_bullets, duty_source, 'de')}\n"
+            f"{_build_duties_instruction(duty_bullets, duty_source, 'de', short)}\n"
             "summary: 1 kurzer Abschlusssatz, der zur Bewerbung einlädt.\n"
         )
 
-    # Use ainvoke for true async execution
-    payload: JobBody = await writer_model.ainvoke(prompt)
+    # Use ainvoke for true async execution; hedged against slow providers,
+    # served from the LLM response cache when the exact request was seen before
+    from llm_service import cached_ainvoke, llm_cache_key
+    from services.llm_hedging import hedged_ainvoke
+    payload: JobBody = await cached_ainvoke(
+        "writer",
+        llm_cache_key(MODEL_BASE, prompt, temperature=temp, schema=JobBody),
+        lambda: hedged_ainvoke(
+            ("writer", MODEL_BASE), writer_model, prompt,
+            is_good=lambda jb: bool(jb and jb.job_description),
+        ),
+        model=MODEL_BASE,
+        schema=JobBody,
+        cacheable=lambda jb: bool(jb.job_description),
+        cache=cache,
+    )
 
     # ── Schweizer Schriftdeutsch post-processing (ß→ss + CH vocabulary) ──
     if lang == "de":
@@ -911,6 +934,7 @@ async def generate_job_body_candidate_async(
     style_kit: Optional[StyleKit] = None,
     duty_bullets: Optional[List[str]] = None,
     duty_source: Optional[str] = None,
+    cache: bool = True,
 ) -> JobBody:
     """Async version that uses ainvoke for true parallel execution."""
     base_temp = cfg.temperature
@@ -918,5 +942,6 @@ async def generate_job_body_candidate_async(
     return await render_job_body_async(
         job_title, cfg, temperature=temp, gold_examples=gold_examples,
         style_kit=style_kit, duty_bullets=duty_bullets, duty_source=duty_source,
+        cache=cache,
     )
 
@@ -1,5 +1,6 @@
 # Graph package
 from .job_graph import build_job_graph, JobState, merge_blackboard
+from .runtime import GraphRuntime, get_graph_runtime
 
-__all__ = ["build_job_graph", "JobState", "merge_blackboard"]
+__all__ = ["build_job_graph", "JobState", "merge_blackboard", "GraphRuntime", "get_graph_runtime"]
 
@@ -1,7 +1,7 @@
 """
 LangGraph workflow for job description generation using blackboard architecture.
 """
-from typing import Annotated, List, Optional, TypedDict, Literal, Dict, Any
+from typing import Annotated, List, Optional, TypedDict, Literal, Dict, Any, Tuple
 from langchain_core.messages import BaseMessage
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
@@ -11,17 +11,17 @@ from langgraph.store.base import BaseStore
 from models.job_models import JobBody, JobGenerationConfig, StyleKit
 import asyncio
 from generators.job_generator import generate_job_body_candidate_async
-from ruler.ruler_utils import jd_candidate_to_trajectory, score_group_with_fallback
+from ruler.ruler_utils import judge_candidates
 from services.style_router import route_style, explain_style_routing
+from services.deadline import expected_s, fits, remaining_s
 from services.style_retriever import retrieve_style_kit
 from services.swiss_german import (
     enforce_swiss_german,
     enforce_swiss_german_on_list,
     get_ch_prompt_block,
 )
+from services.timing import timed_node
 from logging_config import get_logger
-import art
-from art.rewards import ruler_score_group
 
 logger = get_logger(__name__)
 
@@ -36,6 +36,16 @@ def merge_blackboard(
     return right
 
 
+def merge_timings(
+    left: Optional[Dict[str, Any]],
+    right: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Merge per-node timings; an empty dict (initial state) starts a fresh run."""
+    if not right:
+        return {}
+    return {**(left or {}), **right}
+
+
 class JobState(TypedDict, total=False):
     """State for the job generation graph."""
     messages: Annotated[List[BaseMessage], add_messages]
@@ -46,6 +56,7 @@ class JobState(TypedDict, total=False):
     
     # Blackboard: candidates list
     candidates: Annotated[List[JobBody], merge_blackboard]
+    num_candidates: int  # Candidates to generate (RULER_NUM_CANDIDATES unless set per request)
     
     # Style routing (Motivkompass)
     style_kit: Optional[StyleKit]
@@ -63,6 +74,12 @@ class JobState(TypedDict, total=False):
     ruler_run: Dict[str, Any]
     ruler_runs: List[Dict[str, Any]]
     ruler_scores: Dict[int, float]  # Map candidate index to RULER score (for test-time compute)
+    ruler_judged: bool  # False when ruler_scores are local pre-scores (judge skipped or failed)
+    generation_pipeline: Dict[str, Any]  # Pipelined generation stats (replaced / dropped candidates)
+    prescores: List[Dict[str, Any]]  # Local pre-scores aligned with candidates (ruler/local_checks.py)
+    timings: Annotated[Dict[str, Any], merge_timings]  # Per-node wall time / LLM spans (services/timing.py)
+    load_shed: Dict[str, Any]  # Degradation tier chosen at admission (services/load_shedding.py)
+    deadline: Optional[float]  # Absolute latency deadline, time.time() (services/deadline.py)
     
     # Refinement tracking
     refinement_count: int  # Track number of refinement passes
@@ -84,6 +101,10 @@ async def node_scrape_company(state: JobState) -> JobState:
     if not company_urls:
         return {"scraped_text": None}
     
+    # Skip scraping when it cannot finish within the latency budget
+    if not fits(state.get("deadline"), "scrape_company"):
+        return {"scraped_text": None}
+    
     try:
         from services.company_scraper import get_scraper_manager
         from services.scraping_service import extract_company_name_from_url
@@ -94,16 +115,18 @@ async def node_scrape_company(state: JobState) -> JobState:
         company_name = extract_company_name_from_url(company_urls[0])
         
         # Try to get existing content from vector store first
-        existing_content = scraper_manager.get_company_content(company_name, limit=3)
+        # (sync embedding / HTTP calls run off the shared event loop)
+        existing_content = await asyncio.to_thread(scraper_manager.get_company_content, company_name, limit=3)
         
         if existing_content:
             # Use existing content from vector store
             return {"scraped_text": existing_content}
         
         # If no existing content, scrape now (one-time, not saved to config)
-        scraped_text = scraper_manager.scrape_company_from_urls(
+        scraped_text = await asyncio.to_thread(
+            scraper_manager.scrape_company_from_urls,
             urls=company_urls,
-            company_name=company_name
+            company_name=company_name,
         )
         
         if scraped_text:
@@ -145,7 +168,13 @@ async def node_style_router(state: JobState) -> Dict:
     except Exception:
         pass  # Vector store not available — defaults will be used
 
-    kit = retrieve_style_kit(profile, lang=lang, vector_store=vector_store, formality=cfg.formality)
+    #    (the query embedding is a sync HTTP call; keep it off the shared event loop)
+    #    A kit resolved up front (services/graph_service.py) is used as-is
+    kit = state.get("style_kit")
+    if kit is None:
+        kit = await asyncio.to_thread(
+            retrieve_style_kit, profile, lang=lang, vector_store=vector_store, formality=cfg.formality
+        )
 
     # 3. Persist profile JSON for downstream / UI consumption
     style_profile_json = profile.model_dump_json(indent=2, ensure_ascii=False)
@@ -184,12 +213,12 @@ async def node_generator_expert(
     
     # Search for gold standards - try both job title match and broader search
     # This helps find similar jobs from the same company/user
-    past_gold_by_title = store.search(namespace, query=state["job_title"], limit=3)
+    past_gold_by_title = await store.asearch(namespace, query=state["job_title"], limit=3)
     
     # Also get general gold standards (for company style consistency)
     # This helps maintain company identity across different job types
     # Use a broader search query to get general examples
-    all_gold_standards = store.search(namespace, query="", limit=5) if hasattr(store, 'search') else []
+    all_gold_standards = await store.asearch(namespace, query="", limit=5) if hasattr(store, 'asearch') else []
     
     # Extract gold standard bodies with smart matching
     # Priority: 1) Exact/similar job title, 2) Same company/config, 3) General style
@@ -239,57 +268,170 @@ async def node_generator_expert(
     style_kit = state.get("style_kit")
 
     # ── 3-tier duty cascade ──────────────────────────────────────────
-    # Tier 1: user-provided duties (from config)
-    duty_bullets: List[str] = []
-    duty_source: str = "llm"  # default: let LLM generate
-
-    if cfg.duty_keywords:
-        duty_bullets = cfg.duty_keywords
-        duty_source = "user"
-        logger.info("Duties: tier-1 (user-provided) — %d bullets", len(duty_bullets))
-    else:
-        # Tier 2: category match from vector DB
+    # user-provided → category match from vector DB → LLM generation.
+    # Duties resolved up front (services/graph_service.py) are used as-is.
+    duty_bullets: List[str] = list(state.get("duty_bullets") or [])
+    duty_source: str = state.get("duty_source") or ""
+
+    if not duty_source:
         try:
-            from services.duty_retriever import retrieve_duty_templates
+            from services.duty_retriever import build_duty_cascade
             from services.startup import get_vector_store_manager
-            vs = get_vector_store_manager()
-            matched = retrieve_duty_templates(
-                job_title=state["job_title"],
-                seniority_label=cfg.seniority_label,
-                vector_store=vs,
+            duty_bullets, duty_source = await asyncio.to_thread(
+                build_duty_cascade,
+                cfg.duty_keywords or [],
+                state["job_title"],
+                cfg.seniority_label,
+                lang=cfg.language,
+                vector_store=get_vector_store_manager(),
             )
-            if matched:
-                duty_bullets = matched
-                duty_source = "category"
-                logger.info("Duties: tier-2 (category match) — %d bullets", len(duty_bullets))
         except Exception as e:
             logger.warning("Duty retrieval failed, falling back to LLM: %s", e)
-
-    if not duty_bullets:
-        logger.info("Duties: tier-3 (LLM generation)")
+            duty_bullets, duty_source = [], "llm"
+    logger.info("Duties: %s — %d bullets", duty_source, len(duty_bullets))
 
     # Generate initial candidates using gold standards as examples
-    num_candidates = 3
-    tasks = []
-    for i in range(num_candidates):
+    from config import RULER_NUM_CANDIDATES
+    num_candidates = max(1, state.get("num_candidates") or RULER_NUM_CANDIDATES)
+
+    def make_candidate(slot: int, attempt: int = 0):
         # Pass gold examples to guide generation (maintain consistency across candidates)
-        tasks.append(
-            generate_job_body_candidate_async(
-                state["job_title"],
-                cfg,
-                temp_jitter=(i * 0.1),
-                gold_examples=gold_examples if gold_examples else None,
-                style_kit=style_kit,
-                duty_bullets=duty_bullets if duty_bullets else None,
-                duty_source=duty_source,
-            )
+        return generate_job_body_candidate_async(
+            state["job_title"],
+            cfg,
+            temp_jitter=(slot * 0.1) + (attempt * 0.05),
+            gold_examples=gold_examples if gold_examples else None,
+            style_kit=style_kit,
+            duty_bullets=duty_bullets if duty_bullets else None,
+            duty_source=duty_source,
         )
-    seeds = await asyncio.gather(*tasks)
+
+    from config import RULER_PIPELINED, DEADLINE_RESERVE_S
+    if RULER_PIPELINED:
+        # With a deadline, stop waiting for stragglers in time for the judge
+        budget_s = remaining_s(state.get("deadline"))
+        if budget_s is not None:
+            budget_s -= expected_s("ruler_scorer") + DEADLINE_RESERVE_S
+        seeds, pipeline = await _generate_candidates_pipelined(make_candidate, cfg, num_candidates, budget_s)
+    else:
+        seeds = await asyncio.gather(*[make_candidate(i) for i in range(num_candidates)])
+        pipeline = {"mode": "gather", "num_requested": num_candidates, "num_ready": len(seeds)}
     
     return {
         "candidates": seeds,
         "duty_bullets": duty_bullets,
         "duty_source": duty_source,
+        "generation_pipeline": pipeline,
+    }
+
+
+async def _generate_candidates_pipelined(
+    make_candidate,
+    cfg: JobGenerationConfig,
+    num_candidates: int,
+    budget_s: Optional[float] = None,
+) -> Tuple[List[JobBody], Dict[str, Any]]:
+    """
+    Consume writer calls as they complete instead of waiting for the slowest.
+
+    Each candidate gets cheap local checks on arrival; a structurally broken
+    one is regenerated (up to RULER_MAX_REPLACEMENTS per slot).  Once
+    RULER_PIPELINE_QUORUM candidates pass, stragglers get
+    RULER_STRAGGLER_TIMEOUT_S more and are then cancelled, so the judge group
+    is dispatched without waiting on a slow provider.  RULER ranks relative to
+    the group, so the judge still scores the surviving candidates together.
+
+    *budget_s* (latency budget left for generation) is a hard stop: once it
+    passes, the candidates ready so far are used (quorum or not) and no
+    replacements are started.
+    """
+    from config import RULER_PIPELINE_QUORUM, RULER_STRAGGLER_TIMEOUT_S, RULER_MAX_REPLACEMENTS
+    from ruler.local_checks import local_candidate_issues, is_viable
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    quorum = min(max(1, RULER_PIPELINE_QUORUM), num_candidates)
+
+    pending: Dict[asyncio.Task, int] = {
+        asyncio.ensure_future(make_candidate(slot)): slot for slot in range(num_candidates)
+    }
+    attempts = [0] * num_candidates
+    ready: List[Tuple[int, JobBody]] = []
+    rejected: List[Tuple[int, JobBody]] = []  # Failed local checks; last-resort fallback
+    replaced = 0
+    deadline = None
+    quorum_s = None
+    hard_stop = None if budget_s is None else started + max(0.0, budget_s)
+    budget_cut = False
+
+    try:
+        while pending:
+            # The hard stop only applies once there is something to hand to the judge
+            limits = [t for t in (deadline, hard_stop if ready else None) if t is not None]
+            timeout = max(0.0, min(limits) - loop.time()) if limits else None
+            done, _ = await asyncio.wait(
+                pending.keys(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                budget_cut = hard_stop is not None and loop.time() >= hard_stop
+                break  # Straggler (or latency) budget exhausted
+
+            for task in done:
+                slot = pending.pop(task)
+                try:
+                    jb = task.result()
+                    issues = local_candidate_issues(jb, cfg)
+                except Exception as e:
+                    jb, issues = None, [f"empty: writer call failed ({e})"]
+
+                if jb is not None and is_viable(issues):
+                    if issues:
+                        logger.debug(f"[Pipeline] Candidate {slot} advisory issues: {issues}")
+                    ready.append((slot, jb))
+                    continue
+
+                logger.info(f"[Pipeline] Candidate {slot} failed local checks: {issues}")
+                if jb is not None:
+                    rejected.append((slot, jb))
+                out_of_time = hard_stop is not None and loop.time() >= hard_stop
+                if deadline is None and not out_of_time and attempts[slot] < RULER_MAX_REPLACEMENTS:
+                    attempts[slot] += 1
+                    replaced += 1
+                    pending[asyncio.ensure_future(make_candidate(slot, attempts[slot]))] = slot
+
+            if deadline is None and len(ready) >= quorum:
+                quorum_s = loop.time() - started
+                deadline = loop.time() + RULER_STRAGGLER_TIMEOUT_S
+    finally:
+        # Cancel stragglers (or everything, if we are being cancelled ourselves)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    dropped = sorted(pending.values())
+    if dropped:
+        logger.info(
+            f"[Pipeline] Dropped {len(dropped)} straggler(s) after {RULER_STRAGGLER_TIMEOUT_S:.1f}s "
+            f"grace (quorum of {quorum} reached at {quorum_s:.2f}s)"
+        )
+
+    if not ready and rejected:
+        ready = rejected[:1]  # Better a weak candidate than none
+    if not ready:
+        raise RuntimeError("All candidate generations failed")
+
+    ready.sort(key=lambda item: item[0])
+    return [jb for _, jb in ready], {
+        "mode": "pipelined",
+        "num_requested": num_candidates,
+        "num_ready": len(ready),
+        "replaced": replaced,
+        "dropped_stragglers": len(dropped),
+        "budget_cut": budget_cut,
+        "quorum": quorum,
+        "quorum_ms": round(quorum_s * 1000, 1) if quorum_s is not None else None,
+        "total_ms": round((loop.time() - started) * 1000, 1),
     }
 
 
@@ -323,7 +465,7 @@ async def node_style_expert(
     
     # 1. Check for HITL feedback (primary source)
     namespace = (user_id, "user_gripes")
-    gripes = store.search(namespace, limit=5)
+    gripes = await store.asearch(namespace, limit=5)
     
     # Extract HITL feedback from gripes - prioritize job-specific feedback
     avoid_list = []
@@ -404,22 +546,11 @@ async def node_style_expert(
             if idx not in refine_indices:
                 return candidate
 
-            # Create a fresh LLM instance for this refinement call to avoid connection pool contention
-            from langchain_openai import ChatOpenAI
-            from config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL, MODEL_BASE
-            from llm_service import _get_extra_body_for_model
-            
-            # Optimize for latency with provider routing + disable thinking for Qwen models
-            extra_body = _get_extra_body_for_model(MODEL_BASE)
-            
-            fresh_llm = ChatOpenAI(
-                model=MODEL_BASE,
-                temperature=0,
-                api_key=OPENROUTER_API_KEY,
-                base_url=OPENROUTER_BASE_URL,
-                extra_body=extra_body,
-            )
-            style_llm = fresh_llm.with_structured_output(JobBody).bind(temperature=0.3)
+            # Shared pooled client (provider routing + disabled thinking for Qwen models)
+            from config import MODEL_BASE
+            from llm_service import get_model_llm
+
+            style_llm = get_model_llm(MODEL_BASE).with_structured_output(JobBody).bind(temperature=0.3)
 
             candidate_json = candidate.model_dump_json(indent=2, ensure_ascii=False)
             ruler_info = ""
@@ -460,8 +591,20 @@ async def node_style_expert(
                 )
 
             try:
-                # Use ainvoke for true async execution
-                refined = await style_llm.ainvoke(refine_prompt)
+                # Use ainvoke for true async execution; hedged against slow providers
+                from llm_service import cached_ainvoke, llm_cache_key
+                from services.llm_hedging import hedged_ainvoke
+                refined = await cached_ainvoke(
+                    "style",
+                    llm_cache_key(MODEL_BASE, refine_prompt, temperature=0.3, schema=JobBody),
+                    lambda: hedged_ainvoke(
+                        ("style", MODEL_BASE), style_llm, refine_prompt,
+                        is_good=lambda jb: bool(jb and jb.job_description),
+                    ),
+                    model=MODEL_BASE,
+                    schema=JobBody,
+                    cacheable=lambda jb: bool(jb.job_description),
+                )
                 # Enforce Schweizer Schriftdeutsch on refined output
                 if lang == "de":
                     refined.job_description = enforce_swiss_german(refined.job_description)
@@ -483,51 +626,88 @@ async def node_style_expert(
         logger.warning(f"Style refinement system unavailable: {e}", exc_info=True)
         refined_candidates = candidates
     
+    # refine_one returns the original object when it skips or fails; if nothing
+    # changed, the existing RULER scores still hold and re-scoring is skipped
+    changed = any(r is not c for r, c in zip(refined_candidates, candidates))
+    if not changed:
+        logger.info("[Style Expert] No candidate changed; keeping existing RULER scores")
+    
     return {
         "candidates": refined_candidates,
-        "is_refined": True,
+        "is_refined": changed,
         "refinement_count": refinement_count + 1,
         "needs_refinement": has_hitl_feedback or needs_ruler_refinement
     }
 
 
+def _load_shed(state: JobState) -> Dict[str, Any]:
+    """Load-shedding tier of this run ({} = full service, e.g. runs started before the field existed)."""
+    return state.get("load_shed") or {}
+
+
+def _deadline_left_ms(state: JobState) -> Optional[float]:
+    """Latency budget left at this point (None without a deadline, negative when overrun)."""
+    left = remaining_s(state.get("deadline"))
+    return None if left is None else round(left * 1000, 1)
+
+
 async def node_ruler_scorer(state: JobState) -> Dict:
     """
     Expert: RULER Scorer (Test-time Compute).
-    Scores all candidates using RULER and stores scores for Style Expert to use.
+    Pre-scores candidates locally, prunes the blackboard to the top
+    RULER_TOP_K_DEFAULT viable ones, then scores those with RULER and stores
+    the scores for Style Expert to use.
     Does NOT select winner yet - that's done by curator after refinement.
     """
     candidates = state.get("candidates", [])
     if not candidates:
         return {"ruler_scores": {}}
     
-    # RULER scoring (test-time compute)
-    trajectories = [
-        jd_candidate_to_trajectory(state["job_title"], state["config"], jb)
-        for jb in candidates
-    ]
-    group = art.TrajectoryGroup(trajectories)
-    
-    # Score candidates using configured RULER judge model
-    from config import MODEL_RULER_JUDGE
-    judged_group = await score_group_with_fallback(
-        group, MODEL_RULER_JUDGE, debug=False
+    # Deterministic pre-score: drop hard failures, keep the top-K for the judge
+    from config import RULER_TOP_K_DEFAULT
+    from ruler.local_checks import prescore_candidates, select_top_k
+
+    prescores = prescore_candidates(candidates, state["config"], state.get("duty_bullets"))
+    keep = select_top_k(prescores, RULER_TOP_K_DEFAULT)
+    update: Dict[str, Any] = {}
+    if len(keep) < len(candidates):
+        logger.info(
+            f"[Pre-score] Judging {len(keep)}/{len(candidates)} candidates "
+            f"(scores: {[p['score'] for p in prescores]})"
+        )
+        candidates = [candidates[i] for i in keep]
+        prescores = [prescores[i] for i in keep]
+        update["candidates"] = candidates
+    update["prescores"] = prescores
+    
+    if not (_load_shed(state).get("judge", True) and fits(state.get("deadline"), "ruler_scorer")):
+        # Load-shedding tier "prescore" or a spent latency budget: the local pre-score ranks
+        return {
+            **update,
+            "ruler_scores": {idx: p["score"] for idx, p in enumerate(prescores)},
+            "ruler_judged": False,
+        }
+    
+    # RULER scoring (test-time compute); large groups run as a tournament seeded by pre-score
+    scores = await judge_candidates(
+        state["job_title"], state["config"], candidates,
+        seeds=[p["score"] for p in prescores],
     )
     
     # Store RULER scores for each candidate (for refinement decisions)
     ruler_scores = {}
     
-    if not judged_group:
-        # Graceful fallback: set default scores
+    if scores is None:
+        # Graceful fallback: set default scores (curator breaks the tie by pre-score)
         for idx in range(len(candidates)):
             ruler_scores[idx] = 0.0
-        return {"ruler_scores": ruler_scores}
+        return {**update, "ruler_scores": ruler_scores, "ruler_judged": False}
     
     # Store scores by candidate index
-    for idx, (traj, jb) in enumerate(zip(judged_group.trajectories, candidates)):
-        ruler_scores[idx] = float(traj.reward)
+    for idx, score in enumerate(scores):
+        ruler_scores[idx] = score
     
-    return {"ruler_scores": ruler_scores}
+    return {**update, "ruler_scores": ruler_scores, "ruler_judged": True}
 
 
 
@@ -538,7 +718,11 @@ async def node_ruler_scorer_after_style(state: JobState) -> Dict:
 
 
 def should_rescore_after_style(state: JobState) -> str:
-    """Only re-score if Style Expert actually refined candidates."""
+    """Only re-score if Style Expert actually refined candidates (and load shedding allows it)."""
+    if not _load_shed(state).get("rescore", True):
+        return "curator"
+    if not fits(state.get("deadline"), "ruler_scorer_after_style"):
+        return "curator"
     return "ruler_scorer_after_style" if state.get("is_refined") else "curator"
 
 
@@ -559,21 +743,30 @@ async def node_ruler_curator(state: JobState) -> Dict:
     # 2. ruler_scorer_after_style (re-scoring after refinement)
     existing_scores = state.get("ruler_scores", {})
     
+    # Local pre-scores (from ruler_scorer) break RULER ties and order the fallback
+    prescores = state.get("prescores") or []
+    if len(prescores) != len(candidates):
+        prescores = []
+    
+    def prescore(idx: int) -> float:
+        return prescores[idx]["score"] if prescores else 0.0
+    
     # If we have scores and same number of candidates, use them (avoid unnecessary re-scoring)
     # This handles both initial scores and post-refinement scores
     if existing_scores and len(existing_scores) == len(candidates):
         # Use existing scores
         scored_candidates = sorted(
-            [(existing_scores.get(idx, 0.0), jb) for idx, jb in enumerate(candidates)],
-            key=lambda x: x[0],
+            [(existing_scores.get(idx, 0.0), prescore(idx), jb) for idx, jb in enumerate(candidates)],
+            key=lambda x: (x[0], x[1]),
             reverse=True
         )
-        best_jb = scored_candidates[0][1]
+        best_jb = scored_candidates[0][2]
         best_score = scored_candidates[0][0]
+        judged = state.get("ruler_judged", True)
         
         # Build rankings from existing scores
         rankings = []
-        for rank, (score, jb) in enumerate(scored_candidates, start=1):
+        for rank, (score, _, jb) in enumerate(scored_candidates, start=1):
             rankings.append({
                 "rank": rank,
                 "score": float(score),
@@ -589,45 +782,45 @@ async def node_ruler_curator(state: JobState) -> Dict:
             f"Re-scoring in curator: existing_scores={len(existing_scores) if existing_scores else 0}, "
             f"candidates={len(candidates)}"
         )
-        trajectories = [
-            jd_candidate_to_trajectory(state["job_title"], state["config"], jb)
-            for jb in candidates
-        ]
-        group = art.TrajectoryGroup(trajectories)
-        
         # Re-score using configured RULER judge model
-        from config import MODEL_RULER_JUDGE
-        judged_group = await score_group_with_fallback(
-            group, MODEL_RULER_JUDGE, debug=False
+        scores = await judge_candidates(
+            state["job_title"], state["config"], candidates,
+            seeds=[p["score"] for p in prescores] if prescores else None,
         )
         
-        if not judged_group:
-            # Graceful fallback: use first candidate
-            best_jb = candidates[0]
+        if scores is None:
+            # Graceful fallback: best local pre-score (first candidate without pre-scores)
+            best_idx = max(range(len(candidates)), key=lambda i: (prescore(i), -i))
+            best_jb = candidates[best_idx]
             return {
                 "job_body_json": best_jb.model_dump_json(indent=2, ensure_ascii=False),
                 "ruler_run": {
                     "best_score": 0.0,
                     "fallback": True,
+                    "judged": False,
                     "rankings": [],
-                    "num_candidates": len(candidates)
+                    "num_candidates": len(candidates),
+                    "prescores": [p["score"] for p in prescores],
+                    "load_shed": state.get("load_shed"),
+                    "deadline_left_ms": _deadline_left_ms(state),
                 }
             }
         
         scored = sorted(
-            zip(judged_group.trajectories, candidates),
-            key=lambda x: x[0].reward,
+            [(score, prescore(idx), jb) for idx, (score, jb) in enumerate(zip(scores, candidates))],
+            key=lambda x: (x[0], x[1]),
             reverse=True
         )
-        best_jb = scored[0][1]
-        best_score = float(scored[0][0].reward)
+        best_jb = scored[0][2]
+        best_score = float(scored[0][0])
+        judged = True
         
         # Store all rankings for display
         rankings = []
-        for rank, (traj, jb) in enumerate(scored, start=1):
+        for rank, (score, _, jb) in enumerate(scored, start=1):
             rankings.append({
                 "rank": rank,
-                "score": float(traj.reward),
+                "score": float(score),
                 "job_description_preview": (jb.job_description or "")[:100] + "..." if jb.job_description else ""
             })
     
@@ -635,8 +828,14 @@ async def node_ruler_curator(state: JobState) -> Dict:
         "job_body_json": best_jb.model_dump_json(indent=2, ensure_ascii=False),
         "ruler_run": {
             "best_score": float(best_score),
+            # False: scores are local pre-scores, not RULER judgements
+            "judged": judged,
             "rankings": rankings,
-            "num_candidates": len(candidates)
+            "num_candidates": len(candidates),
+            "prescores": [p["score"] for p in prescores],
+            "pipeline": state.get("generation_pipeline"),
+            "load_shed": state.get("load_shed"),
+            "deadline_left_ms": _deadline_left_ms(state),
         }
     }
 
@@ -695,6 +894,13 @@ def should_refine_again(state: JobState) -> str:
     """
     refinement_count = state.get("refinement_count", 0)
     
+    # Under load shedding (tier "lean" and below) there is no refinement pass
+    if not _load_shed(state).get("refine", True):
+        return "curator"
+    # ...and none when the latency budget cannot cover it
+    if not fits(state.get("deadline"), "style_expert"):
+        return "curator"
+    
     # Check RULER scores (test-time compute) - available immediately
     ruler_scores = state.get("ruler_scores", {})
     needs_ruler_refinement = False
@@ -724,86 +930,69 @@ def should_refine_again(state: JobState) -> str:
     return "curator"
 
 
-async def build_job_graph(
-    *,
-    sqlite_path: str = "jd_threads.sqlite",
-    use_persistent_store: bool = False,
-    postgres_connection_string: Optional[str] = None
-):
+def import_async_sqlite_saver():
     """
-    Build the LangGraph workflow for job description generation.
-    
-    Uses LangGraph's store system for user interactions across threads.
-    - SQLite + InMemoryStore: For local development (default)
-    - PostgreSQL + PostgresStore: For production (when postgres_connection_string is provided)
-    
-    Args:
-        sqlite_path: Path to SQLite database for checkpointer (used if postgres_connection_string is None)
-        use_persistent_store: If True, use PostgresStore; if False, use InMemoryStore
-        postgres_connection_string: PostgreSQL connection string (if provided, uses PostgreSQL instead of SQLite)
-        
-    Returns:
-        Compiled graph, connection (if SQLite), and store
+    Resolve the AsyncSqliteSaver class across the known package layouts.
+
+    Returns None when no SQLite checkpointer package is installed; callers
+    then fall back to MemorySaver (checkpoints are lost on restart).
+    For persistent checkpoints install: pip install langgraph-checkpoint-sqlite
     """
-    # Import AsyncSqliteSaver - try multiple import paths
-    AsyncSqliteSaver = None
-    conn = None
     try:
         # Try the standard import path first
         from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
-        import aiosqlite
-        # Try to create connection
-        try:
-            conn = await aiosqlite.connect(sqlite_path)
-            if not hasattr(conn, "is_alive"):
-                conn.is_alive = lambda: True
-        except Exception as e:
-            logger.warning(f"Could not connect to SQLite database: {e}", exc_info=True)
-            conn = None
+        return AsyncSqliteSaver
     except ImportError:
-        try:
-            # Try alternative import path
-            from langgraph_checkpoint_sqlite.aio import AsyncSqliteSaver
-            import aiosqlite
-            try:
-                conn = await aiosqlite.connect(sqlite_path)
-                if not hasattr(conn, "is_alive"):
-                    conn.is_alive = lambda: True
-            except Exception as e:
-                logger.warning(f"Could not connect to SQLite database: {e}", exc_info=True)
-                conn = None
-        except ImportError:
-            try:
-                # Try direct package import
-                from langgraph_checkpoint_sqlite import AsyncSqliteSaver
-                import aiosqlite
-                try:
-                    conn = await aiosqlite.connect(sqlite_path)
-                    if not hasattr(conn, "is_alive"):
-                        conn.is_alive = lambda: True
-                except Exception as e:
-                    logger.warning(f"Could not connect to SQLite database: {e}", exc_info=True)
-                    conn = None
-            except ImportError:
-                # Fallback to InMemorySaver if SQLite checkpoint is not available
-                # Note: InMemorySaver works fine for development, but checkpoints are lost on restart
-                # For production with persistent checkpoints, install: pip install langgraph-checkpoint-sqlite
-                AsyncSqliteSaver = None
-                conn = None
-    
-    from langgraph.store.memory import InMemoryStore
-    
+        pass
+    try:
+        # Try alternative import path
+        from langgraph_checkpoint_sqlite.aio import AsyncSqliteSaver
+        return AsyncSqliteSaver
+    except ImportError:
+        pass
+    try:
+        # Try direct package import
+        from langgraph_checkpoint_sqlite import AsyncSqliteSaver
+        return AsyncSqliteSaver
+    except ImportError:
+        return None
+
+
+async def open_sqlite_connection(sqlite_path: str):
+    """Open an aiosqlite connection for the checkpointer (None on failure)."""
+    try:
+        import aiosqlite
+        conn = await aiosqlite.connect(sqlite_path)
+        if not hasattr(conn, "is_alive"):
+            conn.is_alive = lambda: True
+        return conn
+    except Exception as e:
+        logger.warning(f"Could not connect to SQLite database: {e}", exc_info=True)
+        return None
+
+
+def build_workflow() -> StateGraph:
+    """
+    Declare the blackboard StateGraph (nodes + edges), uncompiled.
+
+    Split out of build_job_graph() so long-lived runtimes can declare and
+    compile the workflow once per process (see graph/runtime.py).
+    """
     workflow = StateGraph(JobState)
     
-    # Add nodes
-    workflow.add_node("style_router", node_style_router)  # Motivkompass profile selection
-    workflow.add_node("scrape_company", node_scrape_company)
-    workflow.add_node("generator", node_generator_expert)
-    workflow.add_node("ruler_scorer", node_ruler_scorer)  # RULER scoring (test-time compute)
-    workflow.add_node("style_expert", node_style_expert)
-    workflow.add_node("ruler_scorer_after_style", node_ruler_scorer_after_style)
-    workflow.add_node("curator", node_ruler_curator)  # Final selection
-    workflow.add_node("persist", node_persist_feedback_to_store)
+    # Add nodes (each wrapped by the span recorder; unwrapped when TIMING_ENABLED=false)
+    nodes = {
+        "style_router": node_style_router,  # Motivkompass profile selection
+        "scrape_company": node_scrape_company,
+        "generator": node_generator_expert,
+        "ruler_scorer": node_ruler_scorer,  # RULER scoring (test-time compute)
+        "style_expert": node_style_expert,
+        "ruler_scorer_after_style": node_ruler_scorer_after_style,
+        "curator": node_ruler_curator,  # Final selection
+        "persist": node_persist_feedback_to_store,
+    }
+    for name, fn in nodes.items():
+        workflow.add_node(name, timed_node(name, fn))
     
     # Add edges
     # Style Router MUST run before generation (see AGENTS.md §3)
@@ -845,6 +1034,43 @@ async def build_job_graph(
     workflow.add_edge("curator", "persist")
     workflow.add_edge("persist", END)
     
+    return workflow
+
+
+async def build_job_graph(
+    *,
+    sqlite_path: str = "jd_threads.sqlite",
+    use_persistent_store: bool = False,
+    postgres_connection_string: Optional[str] = None
+):
+    """
+    Build the LangGraph workflow for job description generation.
+    
+    Uses LangGraph's store system for user interactions across threads.
+    - SQLite + InMemoryStore: For local development (default)
+    - PostgreSQL + PostgresStore: For production (when postgres_connection_string is provided)
+    
+    Note: this builds a fresh graph, connection and store on every call.
+    Request paths should borrow from the process-wide runtime in
+    graph/runtime.py instead; this function is kept for scripts and notebooks.
+    
+    Args:
+        sqlite_path: Path to SQLite database for checkpointer (used if postgres_connection_string is None)
+        use_persistent_store: If True, use PostgresStore; if False, use InMemoryStore
+        postgres_connection_string: PostgreSQL connection string (if provided, uses PostgreSQL instead of SQLite)
+        
+    Returns:
+        Compiled graph, connection (if SQLite), and store
+    """
+    AsyncSqliteSaver = import_async_sqlite_saver()
+    conn = None
+    if AsyncSqliteSaver is not None:
+        conn = await open_sqlite_connection(sqlite_path)
+    
+    from langgraph.store.memory import InMemoryStore
+    
+    workflow = build_workflow()
+    
     # Setup checkpointer and store based on environment
     # If PostgreSQL connection string is provided, use PostgreSQL; otherwise use SQLite
     if postgres_connection_string:
@@ -0,0 +1,343 @@
+"""
+Process-wide runtime for the blackboard graph.
+
+The StateGraph is declared and compiled once per process.  SQLite checkpointer
+connections are kept in a small pool; each generation borrows one for the
+duration of its run and hands it back afterwards, so requests no longer pay
+for graph compilation, ``aiosqlite.connect`` and store creation.
+
+Usage:
+    from graph.runtime import get_graph_runtime
+
+    runtime = get_graph_runtime()
+    async with runtime.borrow() as graph:
+        async for update in graph.astream(state, config=run_config):
+            ...
+
+Startup / shutdown hooks (idempotent):
+    await startup_graph_runtime()    # compile + pre-open the pool
+    await shutdown_graph_runtime()   # close pooled connections
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _CheckpointerSlot:
+    """One pooled checkpointer connection plus the graph bound to it."""
+
+    conn: Any
+    checkpointer: Any
+    graph: Any
+    loop: Optional[asyncio.AbstractEventLoop]
+
+
+class GraphRuntime:
+    """
+    Long-lived compiled graph with a pool of checkpointer connections.
+
+    Pool permits are a ``threading.BoundedSemaphore`` rather than an asyncio
+    primitive because Streamlit callers may still drive generations from
+    different event loops; waiting is done by short async sleeps so a
+    cancelled waiter never leaks a permit.
+    """
+
+    def __init__(
+        self,
+        *,
+        sqlite_path: str = "jd_threads.sqlite",
+        pool_size: int = 4,
+        postgres_connection_string: Optional[str] = None,
+    ):
+        self.sqlite_path = sqlite_path
+        self.pool_size = max(1, pool_size)
+        self.postgres_connection_string = postgres_connection_string
+
+        self._lock = threading.Lock()
+        self._permits = threading.BoundedSemaphore(self.pool_size)
+        self._idle: List[_CheckpointerSlot] = []
+        self._open_slots = 0
+
+        self._compiled = None
+        self._store = None
+        self._memory_sync = None
+        self._saver_cls = None
+        # Postgres / MemorySaver fallback: one checkpointer shared by all borrowers
+        self._shared_checkpointer = None
+
+        # Counters for stats() / benchmarks
+        self._borrows = 0
+        self._total_wait_s = 0.0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def started(self) -> bool:
+        return self._compiled is not None
+
+    @property
+    def store(self):
+        """The long-term memory store shared by every run (compiles on first use)."""
+        self._ensure_compiled()
+        return self._store
+
+    @property
+    def memory_sync(self):
+        """Incremental ORM → store sync bound to the shared store (created lazily)."""
+        if self._memory_sync is None:
+            store = self.store
+            with self._lock:
+                if self._memory_sync is None:
+                    from config import STORE_SYNC_MAX_USERS, STORE_SYNC_IDLE_TTL_S
+                    from database.store_sync import IncrementalStoreSync
+
+                    self._memory_sync = IncrementalStoreSync(
+                        store,
+                        max_users=STORE_SYNC_MAX_USERS,
+                        idle_ttl_s=STORE_SYNC_IDLE_TTL_S,
+                    )
+        return self._memory_sync
+
+    def _ensure_compiled(self) -> None:
+        """Declare and compile the workflow exactly once (thread-safe)."""
+        if self._compiled is not None:
+            return
+        with self._lock:
+            if self._compiled is not None:
+                return
+
+            from langgraph.store.memory import InMemoryStore
+            from graph.job_graph import build_workflow, import_async_sqlite_saver
+
+            t0 = time.perf_counter()
+            store = None
+            if self.postgres_connection_string:
+                try:
+                    from langgraph.store.postgres import PostgresStore
+                    from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+
+                    store = PostgresStore(connection_string=self.postgres_connection_string)
+                    self._shared_checkpointer = AsyncPostgresSaver(
+                        connection_string=self.postgres_connection_string
+                    )
+                    logger.info("[GraphRuntime] Using PostgreSQL for checkpointer and store")
+                except ImportError as e:
+                    logger.warning(f"[GraphRuntime] PostgreSQL support not available: {e}. Falling back to SQLite.")
+
+            if self._shared_checkpointer is None:
+                self._saver_cls = import_async_sqlite_saver()
+                if self._saver_cls is None:
+                    from langgraph.checkpoint.memory import MemorySaver
+                    self._shared_checkpointer = MemorySaver()
+                    logger.info("[GraphRuntime] SQLite checkpointer unavailable, using MemorySaver")
+
+            self._store = store or InMemoryStore()
+            # Compile without a checkpointer; each pool slot gets a cheap copy
+            # bound to its own connection (no recompilation).
+            self._compiled = build_workflow().compile(store=self._store)
+            logger.info(
+                f"[GraphRuntime] Graph compiled in {(time.perf_counter() - t0) * 1000:.1f} ms "
+                f"(pool_size={self.pool_size})"
+            )
+
+    def _bind(self, checkpointer):
+        """Return the compiled graph bound to *checkpointer* (shallow copy)."""
+        return self._compiled.copy(update={"checkpointer": checkpointer})
+
+    async def start(self) -> "GraphRuntime":
+        """Compile the graph and pre-open the checkpointer pool (idempotent)."""
+        self._ensure_compiled()
+        warm: List[_CheckpointerSlot] = []
+        try:
+            while True:
+                with self._lock:
+                    if self._open_slots >= self.pool_size or self._shared_checkpointer is not None:
+                        break
+                    self._open_slots += 1
+                try:
+                    warm.append(await self._open_slot())
+                except Exception:
+                    with self._lock:
+                        self._open_slots -= 1
+                    raise
+        finally:
+            with self._lock:
+                self._idle.extend(warm)
+        return self
+
+    async def close(self) -> None:
+        """Close all idle pooled connections.  Borrowed slots close on return."""
+        with self._lock:
+            slots, self._idle = self._idle, []
+            self._open_slots -= len(slots)
+        for slot in slots:
+            await self._close_slot(slot)
+        logger.info(f"[GraphRuntime] Closed {len(slots)} pooled checkpointer connection(s)")
+
+    # ------------------------------------------------------------------
+    # Slots
+    # ------------------------------------------------------------------
+
+    async def _open_slot(self) -> _CheckpointerSlot:
+        from graph.job_graph import open_sqlite_connection
+
+        conn = await open_sqlite_connection(self.sqlite_path)
+        if conn is None:
+            from langgraph.checkpoint.memory import MemorySaver
+            checkpointer = MemorySaver()
+        else:
+            checkpointer = self._saver_cls(conn)
+        return _CheckpointerSlot(
+            conn=conn,
+            checkpointer=checkpointer,
+            graph=self._bind(checkpointer),
+            loop=asyncio.get_running_loop(),
+        )
+
+    async def _close_slot(self, slot: _CheckpointerSlot) -> None:
+        if slot.conn is not None:
+            try:
+                await slot.conn.close()
+            except Exception as e:
+                logger.debug(f"[GraphRuntime] Error closing pooled connection: {e}")
+
+    def _rebind_to_running_loop(self, slot: _CheckpointerSlot) -> None:
+        """
+        AsyncSqliteSaver captures the event loop and an asyncio.Lock at
+        construction.  When a slot is borrowed from a different loop, wrap the
+        same connection in a fresh saver (cheap) instead of reconnecting.
+        """
+        loop = asyncio.get_running_loop()
+        if slot.loop is loop or slot.conn is None:
+            return
+        slot.checkpointer = self._saver_cls(slot.conn)
+        slot.graph = self._bind(slot.checkpointer)
+        slot.loop = loop
+
+    async def _acquire_permit(self) -> float:
+        """Wait for a pool permit; returns the time spent waiting (seconds)."""
+        t0 = time.perf_counter()
+        delay = 0.002
+        while not self._permits.acquire(blocking=False):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+        return time.perf_counter() - t0
+
+    @asynccontextmanager
+    async def borrow(self) -> AsyncIterator[Any]:
+        """
+        Borrow the compiled graph bound to a pooled checkpointer connection.
+
+        Yields the graph; the connection goes back to the pool on exit.  A slot
+        whose connection raised a sqlite error is discarded and reopened lazily.
+        """
+        self._ensure_compiled()
+
+        if self._shared_checkpointer is not None:
+            with self._lock:
+                self._borrows += 1
+            yield self._bind(self._shared_checkpointer)
+            return
+
+        wait_s = await self._acquire_permit()
+        slot: Optional[_CheckpointerSlot] = None
+        broken = False
+        try:
+            with self._lock:
+                self._borrows += 1
+                self._total_wait_s += wait_s
+                if self._idle:
+                    slot = self._idle.pop()
+                else:
+                    self._open_slots += 1
+            if slot is None:
+                try:
+                    slot = await self._open_slot()
+                except Exception:
+                    with self._lock:
+                        self._open_slots -= 1
+                    raise
+            else:
+                self._rebind_to_running_loop(slot)
+
+            try:
+                yield slot.graph
+            except sqlite3.Error:
+                broken = True
+                raise
+        finally:
+            if slot is not None:
+                if broken:
+                    with self._lock:
+                        self._open_slots -= 1
+                    await self._close_slot(slot)
+                else:
+                    with self._lock:
+                        self._idle.append(slot)
+            self._permits.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool counters (for logs, benchmarks and the metrics registry)."""
+        with self._lock:
+            return {
+                "pool_size": self.pool_size,
+                "open_slots": self._open_slots,
+                "idle_slots": len(self._idle),
+                "borrows": self._borrows,
+                "avg_wait_ms": round(self._total_wait_s / self._borrows * 1000, 3) if self._borrows else 0.0,
+            }
+
+
+# ---------------------------------------------------------------------------
+# Module-level singleton + startup/shutdown hooks
+# ---------------------------------------------------------------------------
+
+_graph_runtime: Optional[GraphRuntime] = None
+_graph_runtime_lock = threading.Lock()
+
+
+def get_graph_runtime() -> GraphRuntime:
+    """Return the process-wide GraphRuntime (created lazily, started on first borrow)."""
+    global _graph_runtime
+    if _graph_runtime is None:
+        with _graph_runtime_lock:
+            if _graph_runtime is None:
+                from config import (
+                    GRAPH_THREADS_DB_PATH,
+                    GRAPH_CHECKPOINTER_POOL_SIZE,
+                    POSTGRES_CONNECTION_STRING,
+                )
+                _graph_runtime = GraphRuntime(
+                    sqlite_path=GRAPH_THREADS_DB_PATH,
+                    pool_size=GRAPH_CHECKPOINTER_POOL_SIZE,
+                    postgres_connection_string=POSTGRES_CONNECTION_STRING,
+                )
+    return _graph_runtime
+
+
+async def startup_graph_runtime() -> GraphRuntime:
+    """Compile the graph and warm the checkpointer pool.  Safe to call repeatedly."""
+    return await get_graph_runtime().start()
+
+
+async def shutdown_graph_runtime() -> None:
+    """Close pooled connections and drop the singleton."""
+    global _graph_runtime
+    with _graph_runtime_lock:
+        runtime, _graph_runtime = _graph_runtime, None
+    if runtime is not None:
+        await runtime.close()
@@ -37,6 +37,20 @@ def get_job_config_from_session() -> JobGenerationConfig:
     )
 
 
+def get_num_candidates_from_session() -> int | None:
+    """
+    Candidate count requested in the sidebar, or None for the adaptive policy.
+
+    Only set when RULER ranking is on and "Auto" is unticked, so an untouched
+    sidebar never overrides services/candidate_policy.py.
+    """
+    if not st.session_state.get("use_ruler", False):
+        return None
+    if st.session_state.get("ruler_auto_candidates", True):
+        return None
+    return st.session_state.get("ruler_num_candidates")
+
+
 def update_session_from_job_body(job_body_dict: dict):
     """
     Update session state with values from a generated job body.
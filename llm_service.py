@@ -1,6 +1,12 @@
-from functools import lru_cache
+import asyncio
+import contextvars
+import importlib.util
+import threading
+from typing import Any, Dict, Optional
+
+import httpx
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import BaseMessage, HumanMessage
 from config import (
     OPENROUTER_API_KEY,
     OPENROUTER_BASE_URL,
@@ -8,7 +14,17 @@ from config import (
     MODEL_STYLE,
     OPENROUTER_PREFERRED_MAX_LATENCY_P90,
     OPENROUTER_PREFERRED_MIN_THROUGHPUT_P90,
+    LLM_HTTP_MAX_CONNECTIONS,
+    LLM_HTTP_MAX_KEEPALIVE,
+    LLM_HTTP_KEEPALIVE_EXPIRY_S,
+    LLM_HTTP_TIMEOUT_S,
+    LLM_HTTP2,
 )
+from logging_config import get_logger
+from services.timing import note_cache_hit
+from utils import canonical_json, stable_hash
+
+logger = get_logger(__name__)
 
 
 def _get_openrouter_provider_config() -> dict:
@@ -72,10 +88,434 @@ def _get_extra_body_for_model(model_name: str) -> dict | None:
         }
 
 
-@lru_cache(maxsize=1)
+# ---------------------------------------------------------------------------
+# Shared HTTP connection pools + ChatOpenAI registry
+# ---------------------------------------------------------------------------
+# Every LLM call used to construct its own ChatOpenAI (and therefore its own
+# HTTP client, TCP connect and TLS handshake).  Clients now come from a
+# registry keyed by (model, extra_body, timeout) over shared keep-alive pools.
+# httpx async pools are bound to the event loop that created them, so there is
+# one async pool per running loop (dropped with the loop) plus one sync pool.
+
+
+class _PoolStats:
+    """In-flight request counters for pool-saturation metrics."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.saturated_requests = 0  # started while every connection was busy
+
+    def enter(self) -> None:
+        with self.lock:
+            self.requests += 1
+            if self.in_flight >= LLM_HTTP_MAX_CONNECTIONS:
+                self.saturated_requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def exit(self) -> None:
+        with self.lock:
+            self.in_flight -= 1
+
+
+_pool_stats = _PoolStats()
+
+
+class _CountedAsyncStream(httpx.AsyncByteStream):
+    """Response body wrapper that releases the in-flight slot when closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream):
+        self._stream = stream
+        self._closed = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._closed:
+                self._closed = True
+                _pool_stats.exit()
+
+
+class _CountedSyncStream(httpx.SyncByteStream):
+    def __init__(self, stream: httpx.SyncByteStream):
+        self._stream = stream
+        self._closed = False
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            if not self._closed:
+                self._closed = True
+                _pool_stats.exit()
+
+
+class _CountingAsyncTransport(httpx.AsyncHTTPTransport):
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        _pool_stats.enter()
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            _pool_stats.exit()
+            raise
+        response.stream = _CountedAsyncStream(response.stream)
+        return response
+
+
+class _CountingSyncTransport(httpx.HTTPTransport):
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        _pool_stats.enter()
+        try:
+            response = super().handle_request(request)
+        except BaseException:
+            _pool_stats.exit()
+            raise
+        response.stream = _CountedSyncStream(response.stream)
+        return response
+
+
+def _http2_enabled() -> bool:
+    return LLM_HTTP2 and importlib.util.find_spec("h2") is not None
+
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=LLM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY_S,
+    )
+
+
+_registry_lock = threading.Lock()
+_sync_client: Optional[httpx.Client] = None
+# One async pool, bound to the loop that first asked for it: the background
+# loop (services/event_loop.py) in the app and workers, the asyncio.run()
+# loop in CLI evals and benchmarks.  aclose_llm_clients() releases it.
+_async_loop: Optional[asyncio.AbstractEventLoop] = None
+_async_client: Optional[httpx.AsyncClient] = None
+# Registry key -> ChatOpenAI, for callers outside / on the pooled event loop
+_sync_chat_models: Dict[tuple, ChatOpenAI] = {}
+_async_chat_models: Dict[tuple, ChatOpenAI] = {}
+
+
+def _get_sync_http_client() -> httpx.Client:
+    global _sync_client
+    if _sync_client is None:
+        with _registry_lock:
+            if _sync_client is None:
+                _sync_client = httpx.Client(
+                    transport=_CountingSyncTransport(limits=_pool_limits(), http2=_http2_enabled()),
+                    timeout=LLM_HTTP_TIMEOUT_S,
+                )
+    return _sync_client
+
+
+def _owns_async_pool_locked(loop: asyncio.AbstractEventLoop) -> bool:
+    """True if *loop* owns the async pool, claiming it when unowned (caller holds the lock)."""
+    global _async_loop, _async_client
+    if _async_loop is loop:
+        return True
+    if _async_loop is None or _async_loop.is_closed():
+        # A closed owner cannot aclose() its pool any more; its sockets went with it
+        _async_loop, _async_client = loop, None
+        _async_chat_models.clear()
+        return True
+    return False
+
+
+def _get_async_http_client(loop: asyncio.AbstractEventLoop) -> Optional[httpx.AsyncClient]:
+    """The shared async pool, or None if *loop* no longer owns it."""
+    global _async_client
+    with _registry_lock:
+        if _async_loop is not loop:
+            return None
+        if _async_client is None:
+            _async_client = httpx.AsyncClient(
+                transport=_CountingAsyncTransport(limits=_pool_limits(), http2=_http2_enabled()),
+                timeout=LLM_HTTP_TIMEOUT_S,
+            )
+        return _async_client
+
+
+def get_chat_model(
+    model: str,
+    *,
+    extra_body: Optional[dict] = None,
+    timeout: Optional[float] = None,
+) -> ChatOpenAI:
+    """
+    Return a shared ChatOpenAI for (model, extra_body, timeout) on the pooled HTTP clients.
+
+    Instances are created at temperature 0; callers ``.bind(temperature=...)``
+    or ``.with_structured_output(...)`` as before (both are cheap wrappers).
+    On the loop that owns the async pool the instance uses it; outside a
+    loop only the sync pool is shared.  Any other loop gets an unshared
+    instance with its own async client.
+    """
+    key = (model, canonical_json(extra_body) if extra_body else None, timeout)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    with _registry_lock:
+        pooled = loop is None or _owns_async_pool_locked(loop)
+        bucket = _sync_chat_models if loop is None else _async_chat_models
+        if pooled and key in bucket:
+            return bucket[key]
+
+    kwargs: Dict[str, Any] = {
+        "model": model,
+        "temperature": 0,
+        "api_key": OPENROUTER_API_KEY,
+        "base_url": OPENROUTER_BASE_URL,
+        "extra_body": extra_body,
+        "http_client": _get_sync_http_client(),
+    }
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+    if loop is not None and pooled:
+        async_client = _get_async_http_client(loop)
+        if async_client is None:
+            pooled = False
+        else:
+            kwargs["http_async_client"] = async_client
+    llm = ChatOpenAI(**kwargs)
+    if not pooled:
+        return llm
+
+    with _registry_lock:
+        if loop is not None and _async_loop is not loop:
+            return llm  # pool released meanwhile; do not cache an instance on a closed client
+        return bucket.setdefault(key, llm)
+
+
+def get_model_llm(model: str, timeout: Optional[float] = None) -> ChatOpenAI:
+    """Shared ChatOpenAI for *model* with the latency-optimized extra_body applied."""
+    return get_chat_model(model, extra_body=_get_extra_body_for_model(model), timeout=timeout)
+
+
+def llm_pool_stats() -> Dict[str, Any]:
+    """Pool-saturation metrics for the shared LLM HTTP clients."""
+    with _pool_stats.lock:
+        stats = {
+            "max_connections": LLM_HTTP_MAX_CONNECTIONS,
+            "in_flight": _pool_stats.in_flight,
+            "peak_in_flight": _pool_stats.peak_in_flight,
+            "requests": _pool_stats.requests,
+            "saturated_requests": _pool_stats.saturated_requests,
+        }
+    stats["saturation"] = round(stats["in_flight"] / LLM_HTTP_MAX_CONNECTIONS, 3) if LLM_HTTP_MAX_CONNECTIONS else 0.0
+    with _registry_lock:
+        stats["async_pool"] = _async_client is not None
+        stats["chat_models"] = len(_sync_chat_models) + len(_async_chat_models)
+    stats["http2"] = _http2_enabled()
+    return stats
+
+
+async def aclose_llm_clients() -> None:
+    """Close the async pool if this loop owns it (call before the loop shuts down)."""
+    global _async_loop, _async_client
+    loop = asyncio.get_running_loop()
+    with _registry_lock:
+        if _async_loop is not loop:
+            return
+        client = _async_client
+        _async_loop, _async_client = None, None
+        _async_chat_models.clear()
+    if client is not None:
+        await client.aclose()
+
+
+# ---------------------------------------------------------------------------
+# Content-addressed LLM response cache
+# ---------------------------------------------------------------------------
+#
+# Call sites compute a key with llm_cache_key() and route the request through
+# cached_ainvoke()/cached_invoke().  Rows live in database/llm_cache.py.
+
+# "use" (read + write), "refresh" (skip reads, still write) or "off".
+# The UI's "regenerate" sets "refresh" for the duration of one generation.
+llm_cache_mode: contextvars.ContextVar[str] = contextvars.ContextVar("llm_cache_mode", default="use")
+
+
+def _canonical_messages(messages: Any) -> Any:
+    if isinstance(messages, str):
+        return [{"role": "user", "content": messages}]
+    if isinstance(messages, (list, tuple)):
+        return [
+            {"role": m.type, "content": m.content} if isinstance(m, BaseMessage) else m
+            for m in messages
+        ]
+    return messages
+
+
+def _schema_fingerprint(schema: Any) -> Any:
+    if schema is None or isinstance(schema, str):
+        return schema
+    if hasattr(schema, "model_json_schema"):
+        return {"name": schema.__name__, "json_schema": schema.model_json_schema()}
+    return getattr(schema, "__name__", repr(schema))
+
+
+def llm_cache_key(
+    model: str,
+    messages: Any,
+    *,
+    temperature: Optional[float] = None,
+    extra_body: Optional[dict] = None,
+    schema: Any = None,
+) -> str:
+    """
+    Content hash of everything that determines an LLM response.
+
+    *messages* may be a prompt string, a list of LangChain messages or any
+    JSON-able structure.  *extra_body* defaults to the one ``get_model_llm``
+    applies for *model*; *schema* is a pydantic class (structured output) or a
+    free-form tag.
+    """
+    if extra_body is None:
+        extra_body = _get_extra_body_for_model(model)
+    return stable_hash({
+        "model": model,
+        "messages": _canonical_messages(messages),
+        "temperature": None if temperature is None else round(float(temperature), 4),
+        "extra_body": extra_body,
+        "schema": _schema_fingerprint(schema),
+    })
+
+
+def _active_cache_mode(site: str, cache: bool) -> Optional[str]:
+    from config import LLM_CACHE_ENABLED, LLM_CACHE_DISABLED_SITES, LLM_CACHE_BATCH_ONLY_SITES
+
+    if not cache or not LLM_CACHE_ENABLED or site in LLM_CACHE_DISABLED_SITES:
+        return None
+    if site in LLM_CACHE_BATCH_ONLY_SITES:
+        from services.concurrency import Priority, llm_priority
+        if llm_priority.get() < Priority.BATCH:
+            return None
+    mode = llm_cache_mode.get()
+    return None if mode == "off" else mode
+
+
+def _cache_codec(schema: Any, dump, load):
+    if hasattr(schema, "model_validate"):
+        dump = dump or (lambda v: v.model_dump(mode="json"))
+        load = load or schema.model_validate
+    return dump or (lambda v: v), load or (lambda v: v)
+
+
+def _cache_lookup(site: str, key: str, mode: str, load) -> Any:
+    if mode != "use":
+        return None
+    from database.llm_cache import get_llm_cache
+
+    hit = get_llm_cache().get(key, site=site)
+    if hit is None:
+        return None
+    try:
+        return load(hit)
+    except Exception as e:
+        logger.warning(f"[LLMCache] {site} entry {key[:12]} no longer decodes: {e}")
+        return None
+
+
+def _cache_store(site: str, key: str, value: Any, model: Optional[str], dump, cacheable) -> None:
+    if value is None or (cacheable is not None and not cacheable(value)):
+        return
+    from database.llm_cache import get_llm_cache
+
+    try:
+        get_llm_cache().put(key, dump(value), site=site, model=model)
+    except Exception as e:
+        logger.warning(f"[LLMCache] Could not store {site} response: {e}")
+
+
+async def cached_ainvoke(
+    site: str,
+    key: str,
+    make_call,
+    *,
+    model: Optional[str] = None,
+    schema: Any = None,
+    dump=None,
+    load=None,
+    cacheable=None,
+    cache: bool = True,
+):
+    """
+    Return the cached response for *key*, or ``await make_call()`` and store it.
+
+    *site* names the call site ("writer", "style", "section", "judge") for
+    hit/miss counters, ``LLM_CACHE_DISABLED_SITES`` and
+    ``LLM_CACHE_BATCH_ONLY_SITES``; ``cache=False`` opts a single call out.  Pydantic *schema* results are (de)serialised
+    automatically, other values must be JSON-able or come with *dump*/*load*.
+    Results rejected by *cacheable* are returned but not stored.
+    """
+    mode = _active_cache_mode(site, cache)
+    if mode is None:
+        return await make_call()
+    dump, load = _cache_codec(schema, dump, load)
+    # SQLite I/O runs off the event loop, which is shared by all generations
+    hit = await asyncio.to_thread(_cache_lookup, site, key, mode, load)
+    if hit is not None:
+        note_cache_hit()
+        return hit
+    value = await make_call()
+    await asyncio.to_thread(_cache_store, site, key, value, model, dump, cacheable)
+    return value
+
+
+def cached_invoke(
+    site: str,
+    key: str,
+    call,
+    *,
+    model: Optional[str] = None,
+    schema: Any = None,
+    dump=None,
+    load=None,
+    cacheable=None,
+    cache: bool = True,
+):
+    """Blocking variant of :func:`cached_ainvoke`."""
+    mode = _active_cache_mode(site, cache)
+    if mode is None:
+        return call()
+    dump, load = _cache_codec(schema, dump, load)
+    hit = _cache_lookup(site, key, mode, load)
+    if hit is not None:
+        note_cache_hit()
+        return hit
+    value = call()
+    _cache_store(site, key, value, model, dump, cacheable)
+    return value
+
+
+def llm_cache_stats() -> Dict[str, Any]:
+    """Entry count, size and per-site hit/miss counters of the LLM response cache."""
+    from config import LLM_CACHE_ENABLED
+    from database.llm_cache import get_llm_cache
+
+    if not LLM_CACHE_ENABLED:
+        return {"enabled": False}
+    return {"enabled": True, **get_llm_cache().stats()}
+
+
 def get_base_llm() -> ChatOpenAI:
     """
-    Initialize and cache the base LLM instance (writer).
+    Return the shared base LLM instance (writer) from the client registry.
     
     Uses OpenRouter API via ChatOpenAI with base_url set to OPENROUTER_BASE_URL.
     Model names should NOT include the "openrouter/" prefix when using this approach.
@@ -87,15 +527,7 @@ def get_base_llm() -> ChatOpenAI:
     Provider routing uses sort: "latency" to prioritize lowest latency providers,
     with optional preferred_max_latency and preferred_min_throughput thresholds.
     """
-    extra_body = _get_extra_body_for_model(MODEL_BASE)
-    
-    return ChatOpenAI(
-        model=MODEL_BASE,
-        temperature=0,
-        api_key=OPENROUTER_API_KEY,
-        base_url=OPENROUTER_BASE_URL,
-        extra_body=extra_body,
-    )
+    return get_model_llm(MODEL_BASE)
 
 
 # Note: get_judge_llm() is not used for RULER scoring.
@@ -106,10 +538,9 @@ def get_base_llm() -> ChatOpenAI:
 # All of which use MODEL_RULER_JUDGE from config.py as a string, not a LangChain instance.
 
 
-@lru_cache(maxsize=1)
 def get_style_llm() -> ChatOpenAI:
     """
-    Initialize and cache the style LLM instance (for refinement).
+    Return the shared style LLM instance (for refinement) from the client registry.
     
     Uses OpenRouter API via ChatOpenAI with base_url set to OPENROUTER_BASE_URL.
     Model names should NOT include the "openrouter/" prefix when using this approach.
@@ -117,18 +548,10 @@ def get_style_llm() -> ChatOpenAI:
     Optimizes for latency using provider routing with sort: "latency" to prioritize
     lowest latency providers, with optional performance thresholds.
     """
-    extra_body = _get_extra_body_for_model(MODEL_STYLE)
-    
-    return ChatOpenAI(
-        model=MODEL_STYLE,
-        temperature=0,
-        api_key=OPENROUTER_API_KEY,
-        base_url=OPENROUTER_BASE_URL,
-        extra_body=extra_body,
-    )
+    return get_model_llm(MODEL_STYLE)
 
 
-def call_llm(instruction: str, current_value: str, context: dict) -> str:
+def call_llm(instruction: str, current_value: str, context: dict, *, cache: bool = True) -> str:
     """
     Call the base model on OpenRouter (OpenAI-compatible endpoint) via ChatOpenAI.
     
@@ -152,6 +575,15 @@ def call_llm(instruction: str, current_value: str, context: dict) -> str:
         "Return only the rewritten text, without explanations."
     )
 
-    response = llm.invoke([HumanMessage(content=prompt)])
-    return response.content.strip()
+    from services.concurrency import governed_sync
+
+    messages = [HumanMessage(content=prompt)]
+    text = cached_invoke(
+        "section",
+        llm_cache_key(MODEL_BASE, messages, temperature=0),
+        lambda: governed_sync(MODEL_BASE, lambda: llm.invoke(messages), site="section").content,
+        model=MODEL_BASE,
+        cache=cache,
+    )
+    return text.strip()
 
@@ -0,0 +1,191 @@
+"""
+Cheap local checks for JobBody candidates (no LLM calls).
+
+Run on each candidate as soon as its writer call returns, so structurally
+broken drafts can be replaced or dropped before the RULER judge sees them.
+``prescore_candidates`` / ``select_top_k`` rank the surviving candidates so
+only the best RULER_TOP_K_DEFAULT go to the judge.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+from models.job_models import JobBody, JobGenerationConfig
+
+# Issues with these prefixes make a candidate unusable; others are advisory.
+FATAL_PREFIXES = ("empty:", "too_short:")
+
+_MIN_DESCRIPTION_CHARS = 80
+_MIN_BULLETS = 2
+
+
+def local_candidate_issues(job_body: JobBody, cfg: JobGenerationConfig) -> List[str]:
+    """
+    Return a list of issues found in *job_body* (empty list = looks fine).
+
+    Fatal issues (see ``FATAL_PREFIXES``): missing description, missing
+    requirements/duties.  Advisory issues: wrong Sie/du form in German text.
+    """
+    issues: List[str] = []
+
+    description = (job_body.job_description or "").strip()
+    if not description:
+        issues.append("empty: job_description")
+    elif len(description) < _MIN_DESCRIPTION_CHARS:
+        issues.append(f"too_short: job_description ({len(description)} chars)")
+
+    for field in ("requirements", "duties"):
+        items = [i for i in getattr(job_body, field) or [] if i and i.strip()]
+        if not items:
+            issues.append(f"empty: {field}")
+        elif len(items) < _MIN_BULLETS:
+            issues.append(f"too_short: {field} ({len(items)} bullets)")
+
+    if cfg.language == "de":
+        from services.swiss_german import check_pronoun_consistency
+
+        text = "\n".join([description, *job_body.requirements, *job_body.duties, *job_body.benefits])
+        consistent, violations = check_pronoun_consistency(text, cfg.formality)
+        if not consistent:
+            issues.append(f"pronouns: {violations} wrong-form marker(s)")
+
+    return issues
+
+
+def is_viable(issues: List[str]) -> bool:
+    """True if none of *issues* is fatal."""
+    return not any(issue.startswith(FATAL_PREFIXES) for issue in issues)
+
+
+# ---------------------------------------------------------------------------
+# Deterministic pre-score (ranks candidates before the RULER judge)
+# ---------------------------------------------------------------------------
+
+_IDEAL_DESCRIPTION_CHARS = (300, 2500)
+_IDEAL_BULLETS = (3, 8)
+_WORD_RE = re.compile(r"[^\W\d_]{4,}", re.UNICODE)
+
+
+def sentence_start_variety(bullet_lists: List[List[str]]) -> float:
+    """
+    Measure variety of first words across all bullet-point lists.
+
+    Returns the ratio  unique_first_words / total_bullets  in [0, 1].
+    A score of 1.0 means every bullet starts with a different word.
+    """
+    first_words: List[str] = []
+    for bullets in bullet_lists:
+        for b in bullets:
+            b = b.strip()
+            if not b:
+                continue
+            # Take the first word (lowercased, stripped of punctuation)
+            word = re.split(r"[\s:,;/]", b, maxsplit=1)[0].lower().strip()
+            if word:
+                first_words.append(word)
+    if not first_words:
+        return 0.0
+    unique = len(set(first_words))
+    return unique / len(first_words)
+
+
+def duty_coverage(job_body: JobBody, duty_bullets: Optional[Sequence[str]]) -> Optional[float]:
+    """
+    Share of the input duty bullets whose content words (4+ letters) mostly
+    reappear in the candidate's duties.  None when there were no input duties.
+    """
+    if not duty_bullets:
+        return None
+    text_words = {w.lower() for w in _WORD_RE.findall(" ".join(job_body.duties or []))}
+    covered = 0
+    counted = 0
+    for bullet in duty_bullets:
+        words = {w.lower() for w in _WORD_RE.findall(bullet or "")}
+        if not words:
+            continue
+        counted += 1
+        if len(words & text_words) / len(words) >= 0.5:
+            covered += 1
+    return covered / counted if counted else None
+
+
+def _in_range(value: int, bounds: tuple) -> float:
+    """1.0 inside *bounds*, falling off linearly to 0 at half / double the range."""
+    low, high = bounds
+    if value < low:
+        return max(0.0, value / low)
+    if value > high:
+        return max(0.0, 1.0 - (value - high) / high)
+    return 1.0
+
+
+def local_prescore(
+    job_body: JobBody,
+    cfg: JobGenerationConfig,
+    duty_bullets: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Deterministic quality score in [0, 1] plus the issues behind it.
+
+    Averages structure (description length, bullet counts, summary),
+    sentence-start variety and duty coverage; German candidates additionally
+    lose points for ß, DE-DE vocabulary and wrong Sie/du markers.  Candidates
+    with fatal issues score 0 and are marked not viable.
+    """
+    issues = local_candidate_issues(job_body, cfg)
+    if not is_viable(issues):
+        return {"score": 0.0, "viable": False, "issues": issues}
+
+    bullet_lists = [job_body.duties or [], job_body.requirements or [], job_body.benefits or []]
+    parts = {
+        "length": _in_range(len((job_body.job_description or "").strip()), _IDEAL_DESCRIPTION_CHARS),
+        "bullets": sum(_in_range(len(b), _IDEAL_BULLETS) for b in bullet_lists) / len(bullet_lists),
+        "summary": 1.0 if (job_body.summary or "").strip() else 0.0,
+        "variety": sentence_start_variety(bullet_lists),
+    }
+    coverage = duty_coverage(job_body, duty_bullets)
+    if coverage is not None:
+        parts["duty_coverage"] = coverage
+    score = sum(parts.values()) / len(parts)
+
+    if cfg.language == "de":
+        from services.swiss_german import check_swiss_vocab
+
+        text = "\n".join([job_body.job_description or "", job_body.summary or "", *sum(bullet_lists, [])])
+        if "ß" in text:
+            issues.append("eszett: ß found")
+            score -= 0.2
+        _, vocab_hits, vocab_details = check_swiss_vocab(text)
+        if vocab_hits:
+            issues.append(f"swiss_vocab: {', '.join(vocab_details[:3])}")
+            score -= min(0.2, 0.05 * vocab_hits)
+        if any(issue.startswith("pronouns:") for issue in issues):
+            score -= 0.2
+
+    return {
+        "score": round(max(0.0, min(1.0, score)), 4),
+        "viable": True,
+        "issues": issues,
+        "parts": {k: round(v, 3) for k, v in parts.items()},
+    }
+
+
+def prescore_candidates(
+    candidates: Sequence[JobBody],
+    cfg: JobGenerationConfig,
+    duty_bullets: Optional[Sequence[str]] = None,
+) -> List[Dict[str, Any]]:
+    """``local_prescore`` for every candidate (list aligned with *candidates*)."""
+    return [local_prescore(jb, cfg, duty_bullets) for jb in candidates]
+
+
+def select_top_k(prescores: Sequence[Dict[str, Any]], k: int) -> List[int]:
+    """
+    Indices of the candidates to send to the judge, best pre-score first.
+
+    Non-viable candidates are dropped (unless nothing else is left, then the
+    best of them is kept); ``k <= 0`` keeps every viable candidate.
+    """
+    order = sorted(range(len(prescores)), key=lambda i: (-prescores[i]["score"], i))
+    keep = [i for i in order if prescores[i]["viable"]] or order[:1]
+    return keep[:k] if k > 0 else keep
@@ -1,5 +1,8 @@
-from typing import List, Tuple, Optional
+from collections import OrderedDict
+import json
+from typing import Any, Dict, List, Tuple, Optional
 import asyncio
+import threading
 import art
 from art.rewards import ruler_score_group
 from openai.types.chat.chat_completion import Choice
@@ -8,6 +11,7 @@ from openai.types.chat import ChatCompletionMessage
 from models.job_models import JobBody, JobGenerationConfig
 from generators.job_generator import generate_job_body_candidate_async
 from logging_config import get_logger
+from utils import stable_hash
 
 logger = get_logger(__name__)
 
@@ -24,12 +28,94 @@ def _strip_openrouter_prefix(model: str) -> str:
     return model
 
 
+class JudgeMemo:
+    """
+    In-process LRU of RULER judgements keyed by candidate-group fingerprint.
+
+    Holds per-trajectory reward / metrics / logs so a repeat of the identical
+    group within the process (curator re-score, re-score after a style pass
+    that changed nothing) skips the judge round-trip even when the LLM
+    response cache is off or refreshing.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max(0, max_entries)
+        self._entries: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[list]:
+        with self._lock:
+            rows = self._entries.get(key)
+            if rows is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return rows
+
+    def put(self, key: str, rows: list) -> None:
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = rows
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+_judge_memo: Optional[JudgeMemo] = None
+_judge_memo_lock = threading.Lock()
+
+
+def get_judge_memo() -> JudgeMemo:
+    """Return the process-wide judge memo (size from RULER_JUDGE_MEMO_SIZE)."""
+    global _judge_memo
+    if _judge_memo is None:
+        with _judge_memo_lock:
+            if _judge_memo is None:
+                from config import RULER_JUDGE_MEMO_SIZE
+                _judge_memo = JudgeMemo(RULER_JUDGE_MEMO_SIZE)
+    return _judge_memo
+
+
+def judge_group_fingerprint(
+    judge_model: str,
+    job_title: str,
+    cfg: JobGenerationConfig,
+    candidates: List[JobBody],
+) -> str:
+    """Fingerprint of one judge call: judge model, trajectory format, job title / config, ordered candidate hashes."""
+    from config import RULER_COMPACT_TRAJECTORIES
+
+    return stable_hash({
+        "judge": judge_model,
+        "compact": RULER_COMPACT_TRAJECTORIES,
+        "job_title": job_title.strip(),
+        "config": cfg,
+        "candidates": [stable_hash(jb) for jb in candidates],
+    })
+
+
 async def score_group_with_fallback(
     group: art.TrajectoryGroup,
     primary_model: str | None = None,
     fallback_models: list[str] | None = None,
     *,
     debug: bool = False,
+    cache: bool = True,
+    fingerprint: Optional[str] = None,
 ) -> Optional[art.TrajectoryGroup]:
     """Score trajectories using RULER with OpenRouter native model fallbacks.
 
@@ -41,6 +127,12 @@ async def score_group_with_fallback(
 
     Returns ``None`` when scoring fails entirely so that callers can apply
     their own graceful-degradation logic (e.g. assign default scores).
+
+    Judgements are served from the in-process judge memo (keyed by
+    *fingerprint*, see ``judge_group_fingerprint``; derived from the
+    trajectories when omitted) or the LLM response cache when the same judge
+    model has already scored the identical group; pass ``cache=False`` to
+    force a fresh judgement.
     """
     from config import MODEL_RULER_JUDGE, MODEL_RULER_JUDGE_FALLBACKS
 
@@ -60,14 +152,75 @@ async def score_group_with_fallback(
             }
         }
 
+    from llm_service import cached_ainvoke, llm_cache_key
+    from services.concurrency import governed
+    from services.metrics import observe_ruler_judgement
+    from services.timing import llm_span
+
+    # Cached as per-trajectory reward/metrics/logs and re-applied to copies of
+    # the input group, so a hit returns the same shape as ruler_score_group.
+    def dump(judged: art.TrajectoryGroup) -> list:
+        return [
+            {"reward": t.reward, "metrics": dict(t.metrics), "logs": list(t.logs)}
+            for t in judged.trajectories
+        ]
+
+    def load(rows: list) -> art.TrajectoryGroup:
+        if len(rows) != len(group.trajectories):
+            raise ValueError("cached judgement has a different group size")
+        trajectories = []
+        for traj, row in zip(group.trajectories, rows):
+            judged_traj = traj.model_copy(deep=True)
+            judged_traj.reward = row["reward"]
+            judged_traj.metrics = dict(row["metrics"])
+            judged_traj.logs = list(row["logs"])
+            trajectories.append(judged_traj)
+        return art.TrajectoryGroup(trajectories)
+
+    key = llm_cache_key(
+        primary_model,
+        [t.messages_and_choices for t in group.trajectories],
+        extra_body=extra_params or {},
+        schema="ruler_score_group",
+    )
+
+    memo = get_judge_memo()
+    memo_key = stable_hash([fingerprint or key, primary_model, fallback_models])
+    if cache:
+        rows = memo.get(memo_key)
+        if rows is not None and len(rows) == len(group.trajectories):
+            observe_ruler_judgement("memo")
+            return load(rows)
+
+    async def judge() -> art.TrajectoryGroup:
+        # LiteLLM bypasses LangChain callbacks, so the judge call is timed explicitly
+        with llm_span("judge", primary_model):
+            return await governed(
+                primary_model,
+                lambda: ruler_score_group(
+                    group,
+                    primary_model,
+                    extra_litellm_params=extra_params,
+                    debug=debug,
+                ),
+                site="judge",
+            )
+
     try:
-        return await ruler_score_group(
-            group,
-            primary_model,
-            extra_litellm_params=extra_params,
-            debug=debug,
+        judged = await cached_ainvoke(
+            "judge",
+            key,
+            judge,
+            model=primary_model,
+            dump=dump,
+            load=load,
+            cache=cache,
         )
+        memo.put(memo_key, dump(judged))
+        observe_ruler_judgement("ok")
+        return judged
     except Exception as exc:
+        observe_ruler_judgement("fallback")
         logger.error(
             "RULER scoring failed for model '%s' (fallbacks: %s). "
             "Returning None so callers can degrade gracefully. Error: %s",
@@ -79,18 +232,48 @@ async def score_group_with_fallback(
         return None
 
 
+# Config fields the judge actually uses; the rest (duty/benefit keywords, skill metadata)
+# only steer generation and already show up in the body being judged.
+_JUDGE_CONFIG_FIELDS = (
+    "language",
+    "formality",
+    "company_type",
+    "industry",
+    "seniority_label",
+    "min_years_experience",
+    "max_years_experience",
+)
+
+
+def judge_context(cfg: JobGenerationConfig) -> Dict[str, Any]:
+    """Judge-relevant subset of *cfg* (unset fields dropped, skills reduced to names)."""
+    ctx = {field: getattr(cfg, field) for field in _JUDGE_CONFIG_FIELDS if getattr(cfg, field) is not None}
+    if cfg.skills:
+        ctx["skills"] = [s.name for s in cfg.skills]
+    return ctx
+
+
 def jd_candidate_to_trajectory(
     job_title: str,
     cfg: JobGenerationConfig,
     job_body: JobBody,
+    compact: Optional[bool] = None,
 ) -> art.Trajectory:
     """
     Wrap a JobBody candidate as a trajectory for RULER.
     Messages:
       system: what the judge should care about
-      user: config and job body
+      user: config (and, in the legacy format, the job body)
       assistant: the job body content that is being judged
+
+    *compact* (default ``RULER_COMPACT_TRAJECTORIES``) emits minified JSON,
+    only the judge-relevant config fields and the body once, as the
+    assistant turn.  The system and user messages are then identical across
+    candidates, so RULER's common-prefix factoring sends them once per group.
     """
+    if compact is None:
+        from config import RULER_COMPACT_TRAJECTORIES
+        compact = RULER_COMPACT_TRAJECTORIES
 
     system_msg = {
         "role": "system",
@@ -102,19 +285,32 @@ def jd_candidate_to_trajectory(
         ),
     }
 
-    user_msg = {
-        "role": "user",
-        "content": (
-            "Evaluate the quality of the following job description.\n\n"
-            f"Job title: {job_title}\n\n"
-            f"Config JSON:\n{cfg.model_dump_json(indent=2, ensure_ascii=False)}\n\n"
-            f"JobBody JSON:\n{job_body.model_dump_json(indent=2, ensure_ascii=False)}\n"
-        ),
-    }
+    if compact:
+        config_json = json.dumps(judge_context(cfg), ensure_ascii=False, separators=(",", ":"))
+        user_msg = {
+            "role": "user",
+            "content": (
+                "Evaluate the quality of the job description in the assistant reply.\n"
+                f"Job title: {job_title}\n"
+                f"Config: {config_json}"
+            ),
+        }
+        body_json = job_body.model_dump_json(exclude_none=True, ensure_ascii=False)
+    else:
+        user_msg = {
+            "role": "user",
+            "content": (
+                "Evaluate the quality of the following job description.\n\n"
+                f"Job title: {job_title}\n\n"
+                f"Config JSON:\n{cfg.model_dump_json(indent=2, ensure_ascii=False)}\n\n"
+                f"JobBody JSON:\n{job_body.model_dump_json(indent=2, ensure_ascii=False)}\n"
+            ),
+        }
+        body_json = job_body.model_dump_json(indent=2, ensure_ascii=False)
 
     assistant_msg = ChatCompletionMessage(
         role="assistant",
-        content=job_body.model_dump_json(indent=2, ensure_ascii=False),
+        content=body_json,
     )
 
     choice = Choice(
@@ -130,6 +326,129 @@ def jd_candidate_to_trajectory(
     return traj
 
 
+async def _judge_subgroup(
+    job_title: str,
+    cfg: JobGenerationConfig,
+    candidates: List[JobBody],
+    judge_model: str,
+    fallback_models: list[str] | None,
+    cache: bool,
+) -> Optional[List[float]]:
+    """Score *candidates* as one RULER group; ``None`` when the judge fails."""
+    group = art.TrajectoryGroup([jd_candidate_to_trajectory(job_title, cfg, jb) for jb in candidates])
+    judged = await score_group_with_fallback(
+        group, judge_model, fallback_models, cache=cache,
+        fingerprint=judge_group_fingerprint(judge_model, job_title, cfg, candidates),
+    )
+    if judged is None:
+        return None
+    return [float(t.reward) for t in judged.trajectories]
+
+
+def tournament_brackets(num_candidates: int, group_size: int, seeds: Optional[List[float]] = None) -> List[List[int]]:
+    """
+    Split candidate indices into balanced brackets of at most *group_size*.
+
+    With *seeds* (e.g. local pre-scores) candidates are dealt snake-wise in
+    seed order, so the strongest ones start in different brackets.
+    """
+    num_brackets = -(-num_candidates // max(1, group_size))
+    order = list(range(num_candidates))
+    if seeds is not None:
+        order.sort(key=lambda i: (-seeds[i], i))
+    brackets: List[List[int]] = [[] for _ in range(num_brackets)]
+    for pos, idx in enumerate(order):
+        lap, slot = divmod(pos, num_brackets)
+        brackets[slot if lap % 2 == 0 else num_brackets - 1 - slot].append(idx)
+    return [sorted(b) for b in brackets]
+
+
+async def judge_candidates(
+    job_title: str,
+    cfg: JobGenerationConfig,
+    candidates: List[JobBody],
+    judge_model: str | None = None,
+    fallback_models: list[str] | None = None,
+    *,
+    seeds: Optional[List[float]] = None,
+    group_size: Optional[int] = None,
+    cache: bool = True,
+) -> Optional[List[float]]:
+    """
+    RULER scores for *candidates* (same order), or ``None`` when judging fails.
+
+    Up to *group_size* (default ``RULER_TOURNAMENT_GROUP_SIZE``, ``0`` = never)
+    candidates are judged as one group.  Larger groups run a two-round
+    tournament so each judge prompt stays small:
+
+    1. brackets of at most *group_size* are scored in parallel;
+    2. the bracket leaders meet pairwise, all pairs in parallel; a leader's
+       final score is its mean reward over its matches.
+
+    Other candidates keep their bracket score, rescaled by their leader's
+    final / bracket score, so the within-bracket order is kept and nobody
+    outranks their own leader.  Candidates of a failed bracket score 0.0
+    (its best seed still enters the final).
+    """
+    from config import MODEL_RULER_JUDGE, RULER_TOURNAMENT_GROUP_SIZE
+
+    judge_model = judge_model or MODEL_RULER_JUDGE
+    group_size = RULER_TOURNAMENT_GROUP_SIZE if group_size is None else group_size
+    if not candidates:
+        return []
+    if group_size <= 0 or len(candidates) <= group_size:
+        return await _judge_subgroup(job_title, cfg, candidates, judge_model, fallback_models, cache)
+
+    if seeds is not None and len(seeds) != len(candidates):
+        seeds = None
+    brackets = tournament_brackets(len(candidates), group_size, seeds)
+    bracket_scores = await asyncio.gather(*[
+        _judge_subgroup(job_title, cfg, [candidates[i] for i in b], judge_model, fallback_models, cache)
+        for b in brackets
+    ])
+    if all(s is None for s in bracket_scores):
+        return None
+
+    scores: List[float] = [0.0] * len(candidates)
+    leaders: List[int] = []
+    for bracket, result in zip(brackets, bracket_scores):
+        if result is None:
+            leaders.append(min(bracket, key=lambda i: (-(seeds[i] if seeds else 0.0), i)))
+            continue
+        for idx, score in zip(bracket, result):
+            scores[idx] = score
+        leaders.append(bracket[max(range(len(bracket)), key=lambda j: (result[j], -j))])
+
+    # Final round: every pair of leaders, judged in parallel
+    pairs = [(a, b) for pos, a in enumerate(leaders) for b in leaders[pos + 1:]]
+    pair_scores = await asyncio.gather(*[
+        _judge_subgroup(job_title, cfg, [candidates[a], candidates[b]], judge_model, fallback_models, cache)
+        for a, b in pairs
+    ])
+    match_rewards: Dict[int, List[float]] = {idx: [] for idx in leaders}
+    for (a, b), result in zip(pairs, pair_scores):
+        if result is not None:
+            match_rewards[a].append(result[0])
+            match_rewards[b].append(result[1])
+
+    final = list(scores)
+    for bracket, leader in zip(brackets, leaders):
+        rewards = match_rewards[leader]
+        if not rewards:
+            continue
+        final[leader] = sum(rewards) / len(rewards)
+        scale = final[leader] / scores[leader] if scores[leader] > 0 else 0.0
+        for idx in bracket:
+            if idx != leader:
+                final[idx] = min(scores[idx] * scale, final[leader])
+
+    logger.info(
+        f"[RULER tournament] {len(candidates)} candidates, {len(brackets)} brackets, "
+        f"{len(pairs)} final pairs; leaders={leaders}"
+    )
+    return final
+
+
 async def generate_best_job_body_with_ruler(
     job_title: str,
     cfg: JobGenerationConfig,
@@ -174,25 +493,16 @@ async def generate_best_job_body_with_ruler(
     ]
     candidates = await asyncio.gather(*tasks)
 
-    # wrap as trajectories
-    trajectories = [
-        jd_candidate_to_trajectory(job_title, cfg, jb)
-        for jb in candidates
-    ]
-    group = art.TrajectoryGroup(trajectories)
-
-    # score with RULER
+    # score with RULER (tournament above RULER_TOURNAMENT_GROUP_SIZE candidates)
     # ruler_score_group expects a string model identifier.
     # We default to OpenRouter here; ensure OPENROUTER_API_KEY is set in the environment (loaded in config.py).
-    judged_group = await score_group_with_fallback(group, judge_model, debug=False)
-    if not judged_group:
+    scores = await judge_candidates(job_title, cfg, candidates, judge_model)
+    if scores is None:
         # graceful fallback
         return candidates[0], [(0.0, jb) for jb in candidates]
 
     # collect scores and sort
-    scored: List[Tuple[float, JobBody]] = []
-    for traj, jb in zip(judged_group.trajectories, candidates):
-        scored.append((traj.reward, jb))
+    scored: List[Tuple[float, JobBody]] = list(zip(scores, candidates))
 
     scored_sorted = sorted(scored, key=lambda t: t[0], reverse=True)
     best_score, best_job_body = scored_sorted[0]
@@ -0,0 +1,95 @@
+"""
+Cancellation of in-flight generations.
+
+A ``CancelToken`` belongs to one generation.  ``graph_service`` attaches it
+to the task consuming the stream; ``cancel()`` (from any thread, e.g. the
+Streamlit Stop button or a superseding Generate click) cancels that task.
+The ``CancelledError`` travels down through ``graph.astream`` into the
+running nodes: pending writer calls, hedges, the RULER judge and governor
+slots are all cancelled and released.  The caller then sees
+``GenerationCancelled`` instead of a bare ``CancelledError`` and the run is
+counted as ``cancelled`` (metrics, Langfuse trace), not as an error.
+
+Usage:
+    from services.cancellation import CancelToken, GenerationCancelled
+
+    token = CancelToken()
+    try:
+        result = await generate_with_graph(title, cfg, cancel_token=token)
+    except GenerationCancelled as e:
+        ...  # e.reason: "stopped", "superseded", ...
+
+    token.cancel("stopped")  # from another thread
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Optional
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class GenerationCancelled(Exception):
+    """The generation was cancelled through its token (not a failure)."""
+
+    def __init__(self, reason: str = "cancelled"):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class CancelToken:
+    """Thread-safe cancellation handle for one generation."""
+
+    def __init__(self):
+        self._reason: Optional[str] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._reason is not None
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._reason
+
+    def attach(self) -> None:
+        """Bind the token to the current task; an earlier ``cancel()`` takes effect now."""
+        task = asyncio.current_task()
+        with self._lock:
+            self._loop, self._task = asyncio.get_running_loop(), task
+            reason = self._reason
+        if reason is not None and task is not None:
+            task.cancel(reason)
+
+    def detach(self) -> None:
+        with self._lock:
+            self._loop = self._task = None
+
+    def cancel(self, reason: str = "cancelled") -> bool:
+        """Cancel the generation (first reason wins); False if it was already cancelled."""
+        with self._lock:
+            if self._reason is not None:
+                return False
+            self._reason = reason
+            loop, task = self._loop, self._task
+        logger.info(f"Generation cancelled ({reason})")
+        if task is not None and loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(task.cancel, reason)
+        return True
+
+    def consume(self) -> GenerationCancelled:
+        """Turn the ``CancelledError`` this token caused into ``GenerationCancelled``.
+
+        Clears the task's cancellation request so that it can carry on
+        (e.g. to report the cancellation) instead of being torn down.
+        """
+        task = asyncio.current_task()
+        if task is not None and task.cancelling():
+            task.uncancel()
+        return GenerationCancelled(self._reason or "cancelled")
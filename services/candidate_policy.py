@@ -0,0 +1,221 @@
+"""
+Adaptive candidate count per config bucket.
+
+Three candidates per run is wasted work where the candidates barely differ.
+``CandidatePolicy.choose`` picks N per request from the RULER scores already
+stored in the ``interactions`` table, bucketed by (language, industry,
+seniority, company_type).
+
+For a bucket, the within-run score deviations (score minus the run mean)
+form an empirical distribution D.  The expected best of n candidates is
+E[max of n draws from D]; N is the smallest n whose next candidate would
+add less than ``min_gain`` to it.  Buckets with fewer than ``min_runs``
+recorded runs use the default.  With probability ``explore`` a random N in
+[min, max] is used instead, so buckets keep collecting spread data.  An
+explicit ``num_candidates`` on the request always wins.
+
+``stats()`` reports decisions per reason and the writer and judge calls
+saved (or spent) against the default.
+
+Usage:
+    from services.candidate_policy import get_candidate_policy
+
+    n = get_candidate_policy().choose(cfg)
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+Bucket = Tuple[str, str, str, str]
+
+
+def config_bucket(cfg: Any) -> Bucket:
+    """(language, industry, seniority, company_type) of a config object or dumped dict."""
+    get = cfg.get if isinstance(cfg, dict) else lambda key: getattr(cfg, key, None)
+    return (
+        get("language") or "en",
+        get("industry") or "generic",
+        get("seniority_label") or "any",
+        get("company_type") or "other",
+    )
+
+
+def expected_max(deviations: List[float], n: int) -> float:
+    """E[max of n draws with replacement] from the empirical distribution *deviations*."""
+    ordered = sorted(deviations)
+    m = len(ordered)
+    if not m or n <= 0:
+        return 0.0
+    return sum(d * ((k / m) ** n - ((k - 1) / m) ** n) for k, d in enumerate(ordered, start=1))
+
+
+def judge_calls(n: int, group_size: int) -> int:
+    """Judge calls for one scoring pass over *n* candidates (see ruler_utils.judge_candidates)."""
+    if group_size <= 0 or n <= group_size:
+        return 1
+    brackets = -(-n // group_size)
+    return brackets + brackets * (brackets - 1) // 2
+
+
+class CandidatePolicy:
+    """Chooses the candidate count per request from historical score spread (thread-safe)."""
+
+    def __init__(
+        self,
+        *,
+        default: int = 3,
+        min_candidates: int = 2,
+        max_candidates: int = 6,
+        min_gain: float = 0.02,
+        explore: float = 0.1,
+        min_runs: int = 10,
+        refresh_s: float = 300.0,
+        history: int = 2000,
+        group_size: int = 0,
+        loader=None,
+        rng: Optional[random.Random] = None,
+    ):
+        self.default = max(1, default)
+        self.min_candidates = max(1, min_candidates)
+        self.max_candidates = max(self.min_candidates, max_candidates)
+        self.min_gain = min_gain
+        self.explore = max(0.0, min(1.0, explore))
+        self.min_runs = max(1, min_runs)
+        self.refresh_s = refresh_s
+        self.history = history
+        self.group_size = group_size
+        self._loader = loader or self._load_from_db
+        self._rng = rng or random.Random()
+        self._buckets: Dict[Bucket, List[float]] = {}
+        self._runs: Counter = Counter()
+        self._loaded_at: Optional[float] = None
+        self._decisions: Counter = Counter()
+        self._chosen: Counter = Counter()
+        self._writer_calls_saved = 0
+        self._judge_calls_saved = 0
+        self._lock = threading.Lock()
+
+    # -- History -------------------------------------------------------------
+
+    def _load_from_db(self) -> List[Dict[str, Any]]:
+        from database.models import get_db_manager
+        return get_db_manager().get_ruler_score_history(self.history)
+
+    def refresh(self, force: bool = False) -> None:
+        """Rebuild the per-bucket deviation pools (at most every ``refresh_s``)."""
+        with self._lock:
+            if not force and self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_s:
+                return
+            self._loaded_at = time.monotonic()  # failed loads are not retried until the next window
+        try:
+            rows = self._loader()
+        except Exception as e:
+            logger.warning(f"Candidate policy history unavailable, using defaults: {e}")
+            return
+
+        buckets: Dict[Bucket, List[float]] = {}
+        runs: Counter = Counter()
+        for row in rows:
+            scores = row["scores"]
+            # One candidate, or a judge fallback (all 0.0), carries no spread information
+            if len(scores) < 2 or not any(scores):
+                continue
+            mean = sum(scores) / len(scores)
+            bucket = config_bucket(row["config"])
+            buckets.setdefault(bucket, []).extend(s - mean for s in scores)
+            runs[bucket] += 1
+        with self._lock:
+            self._buckets, self._runs = buckets, runs
+
+    # -- Decision ------------------------------------------------------------
+
+    def _adaptive_n(self, deviations: List[float]) -> int:
+        n = self.min_candidates
+        while n < self.max_candidates and expected_max(deviations, n + 1) - expected_max(deviations, n) >= self.min_gain:
+            n += 1
+        return n
+
+    def choose(self, cfg: Any, requested: Optional[int] = None) -> int:
+        """Candidate count for one request; *requested* (explicit override) wins."""
+        if requested:
+            n, reason = max(1, requested), "override"
+        else:
+            self.refresh()
+            bucket = config_bucket(cfg)
+            with self._lock:
+                deviations = self._buckets.get(bucket)
+                runs = self._runs.get(bucket, 0)
+                roll = self._rng.random()
+                if runs < self.min_runs:
+                    n, reason = self.default, "no_data"
+                elif roll < self.explore:
+                    n, reason = self._rng.randint(self.min_candidates, self.max_candidates), "explore"
+                else:
+                    n, reason = None, "adaptive"
+            if n is None:
+                n = self._adaptive_n(deviations)
+            logger.debug(f"Candidate policy: bucket={bucket} runs={runs} -> n={n} ({reason})")
+        with self._lock:
+            self._decisions[reason] += 1
+            self._chosen[n] += 1
+            if reason != "override":
+                self._writer_calls_saved += self.default - n
+                self._judge_calls_saved += judge_calls(self.default, self.group_size) - judge_calls(n, self.group_size)
+        return n
+
+    def stats(self) -> Dict[str, Any]:
+        """Decisions per reason, chosen N histogram and writer / judge calls saved vs. the default."""
+        with self._lock:
+            decisions = sum(self._decisions.values())
+            return {
+                "default": self.default,
+                "decisions": dict(self._decisions),
+                "chosen": {n: self._chosen[n] for n in sorted(self._chosen)},
+                "writer_calls_saved": self._writer_calls_saved,
+                "judge_calls_saved": self._judge_calls_saved,
+                "avg_candidates": round(sum(n * c for n, c in self._chosen.items()) / decisions, 2) if decisions else 0.0,
+                "buckets": len(self._buckets),
+                "buckets_ready": sum(1 for r in self._runs.values() if r >= self.min_runs),
+            }
+
+
+_policy: Optional[CandidatePolicy] = None
+_policy_lock = threading.Lock()
+
+
+def get_candidate_policy() -> CandidatePolicy:
+    """Return the process-wide candidate policy configured from config.py."""
+    global _policy
+    if _policy is None:
+        with _policy_lock:
+            if _policy is None:
+                from config import (
+                    RULER_NUM_CANDIDATES,
+                    RULER_ADAPTIVE_MIN_CANDIDATES,
+                    RULER_ADAPTIVE_MAX_CANDIDATES,
+                    RULER_ADAPTIVE_MIN_GAIN,
+                    RULER_ADAPTIVE_EXPLORE,
+                    RULER_ADAPTIVE_MIN_RUNS,
+                    RULER_ADAPTIVE_REFRESH_S,
+                    RULER_TOURNAMENT_GROUP_SIZE,
+                )
+                _policy = CandidatePolicy(
+                    default=RULER_NUM_CANDIDATES,
+                    min_candidates=RULER_ADAPTIVE_MIN_CANDIDATES,
+                    max_candidates=RULER_ADAPTIVE_MAX_CANDIDATES,
+                    min_gain=RULER_ADAPTIVE_MIN_GAIN,
+                    explore=RULER_ADAPTIVE_EXPLORE,
+                    min_runs=RULER_ADAPTIVE_MIN_RUNS,
+                    refresh_s=RULER_ADAPTIVE_REFRESH_S,
+                    group_size=RULER_TOURNAMENT_GROUP_SIZE,
+                )
+    return _policy
@@ -0,0 +1,377 @@
+"""
+Process-wide adaptive concurrency governor for OpenRouter calls.
+
+Every LLM, judge and embedding call takes a slot from a per-model limiter
+before it goes out.  Limits adapt AIMD-style:
+
+  * additive increase  — +1 slot per "window" of successful calls while
+    latency is normal and no 429 / timeout was seen within the cooldown
+  * multiplicative decrease — halve on 429 / timeout, shrink gently when
+    latency climbs well above its recent baseline
+
+Latency is tracked per (model, call site): a long writer call and a short
+judge call on the same model have different normal latencies, so each site
+is compared only with itself.  The baseline is a decaying minimum (it
+creeps up by ``baseline_drift`` per sample), so one lucky fast call does not
+pin it forever.
+
+Waiters are served by priority (interactive generations before eval/batch
+traffic), and batch traffic may only use part of each limit so live users
+always find headroom.
+
+Priority is taken from a context variable, so a whole eval run can be
+marked as batch once:
+
+    from services.concurrency import Priority, llm_priority
+
+    token = llm_priority.set(Priority.BATCH)
+    try:
+        await run_eval(...)
+    finally:
+        llm_priority.reset(token)
+
+Call sites:
+
+    async with get_governor().slot(model, site="writer"):
+        result = await llm.ainvoke(prompt)
+
+    with get_governor().slot_sync(model, site="section"):
+        result = llm.invoke(prompt)
+
+Waiting is done by short sleeps on a threading lock rather than asyncio
+primitives because callers may drive generations from different event loops.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Tuple
+
+from logging_config import get_logger
+from services.metrics import observe_llm_call
+from services.timing import note_queue_wait
+
+logger = get_logger(__name__)
+
+
+class Priority(IntEnum):
+    """Lower value = served first."""
+
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+llm_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "llm_priority", default=Priority.INTERACTIVE
+)
+
+
+def classify_error(exc: BaseException) -> str:
+    """Map an exception to "rate_limited", "timeout" or "error"."""
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+    name = type(exc).__name__
+    if status == 429 or "RateLimit" in name:
+        return "rate_limited"
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError)) or "Timeout" in name:
+        return "timeout"
+    return "error"
+
+
+class _ModelLimiter:
+    """AIMD limit + priority wait queue for one model (guarded by the governor lock)."""
+
+    def __init__(self, initial: float, min_limit: int, max_limit: int):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.in_flight = 0
+        self.queue: List[Tuple[int, int]] = []  # (priority, seq) heap
+        self.latency: Dict[str, List[float]] = {}  # site -> [baseline, ewma]
+        self.last_decrease = 0.0
+        self.counts = {"ok": 0, "rate_limited": 0, "timeout": 0, "error": 0}
+        self.peak_in_flight = 0
+        self.total_wait_s = 0.0
+        self.acquired = 0
+
+    def capacity(self, priority: int, batch_share: float) -> int:
+        cap = max(self.min_limit, int(self.limit))
+        if priority >= Priority.BATCH:
+            cap = max(1, int(cap * batch_share))
+        return cap
+
+
+class ConcurrencyGovernor:
+    """Per-model AIMD concurrency limits with priority queuing (thread-safe)."""
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        batch_share: float = 0.75,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.5,
+        baseline_drift: float = 0.01,
+        decrease_cooldown_s: float = 2.0,
+    ):
+        self.initial_limit = initial_limit
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.batch_share = min(1.0, max(0.0, batch_share))
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.baseline_drift = baseline_drift
+        self.decrease_cooldown_s = decrease_cooldown_s
+
+        self._lock = threading.Lock()
+        self._limiters: Dict[str, _ModelLimiter] = {}
+        self._seq = itertools.count()
+
+    def _limiter(self, model: str) -> _ModelLimiter:
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            limiter = self._limiters[model] = _ModelLimiter(
+                min(self.initial_limit, self.max_limit), self.min_limit, self.max_limit
+            )
+        return limiter
+
+    # ------------------------------------------------------------------
+    # Acquire / release
+    # ------------------------------------------------------------------
+
+    def _enqueue(self, model: str, priority: int) -> Tuple[int, int]:
+        ticket = (int(priority), next(self._seq))
+        with self._lock:
+            heapq.heappush(self._limiter(model).queue, ticket)
+        return ticket
+
+    def _try_take(self, model: str, ticket: Tuple[int, int]) -> bool:
+        """Take a slot if *ticket* is at the head of the queue and capacity allows."""
+        with self._lock:
+            limiter = self._limiter(model)
+            if not limiter.queue or limiter.queue[0] != ticket:
+                return False
+            if limiter.in_flight >= limiter.capacity(ticket[0], self.batch_share):
+                return False
+            heapq.heappop(limiter.queue)
+            limiter.in_flight += 1
+            limiter.peak_in_flight = max(limiter.peak_in_flight, limiter.in_flight)
+            return True
+
+    def _abandon(self, model: str, ticket: Tuple[int, int]) -> None:
+        with self._lock:
+            limiter = self._limiter(model)
+            try:
+                limiter.queue.remove(ticket)
+                heapq.heapify(limiter.queue)
+            except ValueError:
+                pass
+
+    def _release(self, model: str, site: str, outcome: str, latency_s: float, wait_s: float) -> None:
+        with self._lock:
+            limiter = self._limiter(model)
+            limiter.in_flight -= 1
+            limiter.acquired += 1
+            limiter.total_wait_s += wait_s
+            limiter.counts[outcome] = limiter.counts.get(outcome, 0) + 1
+            self._adjust_locked(model, limiter, site, outcome, latency_s)
+
+    def _adjust_locked(
+        self, model: str, limiter: _ModelLimiter, site: str, outcome: str, latency_s: float
+    ) -> None:
+        now = time.monotonic()
+        if outcome in ("rate_limited", "timeout"):
+            if now - limiter.last_decrease >= self.decrease_cooldown_s:
+                old = limiter.limit
+                limiter.limit = max(limiter.min_limit, limiter.limit * self.decrease_factor)
+                limiter.last_decrease = now
+                logger.info(
+                    f"[Governor] {model}: {outcome} → limit {old:.1f} → {limiter.limit:.1f}"
+                )
+            return
+        if outcome != "ok":
+            return
+
+        stats = limiter.latency.get(site)
+        if stats is None:
+            stats = limiter.latency[site] = [latency_s, latency_s]
+        else:
+            stats[0] = min(latency_s, stats[0] * (1.0 + self.baseline_drift))
+            stats[1] = 0.8 * stats[1] + 0.2 * latency_s
+        baseline, ewma = stats
+        if ewma > self.latency_tolerance * baseline:
+            if now - limiter.last_decrease >= self.decrease_cooldown_s:
+                limiter.limit = max(limiter.min_limit, limiter.limit * 0.9)
+                limiter.last_decrease = now
+        elif now - limiter.last_decrease >= self.decrease_cooldown_s:
+            limiter.limit = min(limiter.max_limit, limiter.limit + 1.0 / limiter.limit)
+
+    @asynccontextmanager
+    async def slot(self, model: str, priority: Optional[int] = None, *, site: str = "default"):
+        """Async context manager holding one concurrency slot for *model* (latency tracked per *site*)."""
+        priority = llm_priority.get() if priority is None else priority
+        ticket = self._enqueue(model, priority)
+        t0 = time.perf_counter()
+        delay = 0.002
+        try:
+            while not self._try_take(model, ticket):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.05)
+        except BaseException:
+            self._abandon(model, ticket)
+            raise
+
+        wait_s = time.perf_counter() - t0
+        note_queue_wait(wait_s)
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            yield
+        except BaseException as e:
+            outcome = classify_error(e) if isinstance(e, Exception) else "error"
+            raise
+        finally:
+            self._release(model, site, outcome, time.perf_counter() - started, wait_s)
+
+    @contextmanager
+    def slot_sync(self, model: str, priority: Optional[int] = None, *, site: str = "default"):
+        """Blocking variant of :meth:`slot` for synchronous call sites."""
+        priority = llm_priority.get() if priority is None else priority
+        ticket = self._enqueue(model, priority)
+        t0 = time.perf_counter()
+        delay = 0.002
+        try:
+            while not self._try_take(model, ticket):
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+        except BaseException:
+            self._abandon(model, ticket)
+            raise
+
+        wait_s = time.perf_counter() - t0
+        note_queue_wait(wait_s)
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            yield
+        except BaseException as e:
+            outcome = classify_error(e) if isinstance(e, Exception) else "error"
+            raise
+        finally:
+            self._release(model, site, outcome, time.perf_counter() - started, wait_s)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-model limit, in-flight, queue depth, outcomes and average wait."""
+        with self._lock:
+            return {
+                model: {
+                    "limit": round(limiter.limit, 2),
+                    "in_flight": limiter.in_flight,
+                    "peak_in_flight": limiter.peak_in_flight,
+                    "queued": len(limiter.queue),
+                    "queued_interactive": sum(1 for p, _ in limiter.queue if p == Priority.INTERACTIVE),
+                    "outcomes": dict(limiter.counts),
+                    "ewma_latency_s": {site: round(ewma, 3) for site, (_, ewma) in limiter.latency.items()},
+                    "avg_wait_ms": round(limiter.total_wait_s / limiter.acquired * 1000, 2) if limiter.acquired else 0.0,
+                }
+                for model, limiter in self._limiters.items()
+            }
+
+
+# ---------------------------------------------------------------------------
+# Module-level singleton
+# ---------------------------------------------------------------------------
+
+_governor: Optional[ConcurrencyGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_governor() -> ConcurrencyGovernor:
+    """Return the process-wide governor configured from config.py."""
+    global _governor
+    if _governor is None:
+        with _governor_lock:
+            if _governor is None:
+                from config import (
+                    LLM_CONCURRENCY_INITIAL,
+                    LLM_CONCURRENCY_MIN,
+                    LLM_CONCURRENCY_MAX,
+                    LLM_CONCURRENCY_BATCH_SHARE,
+                )
+                _governor = ConcurrencyGovernor(
+                    initial_limit=LLM_CONCURRENCY_INITIAL,
+                    min_limit=LLM_CONCURRENCY_MIN,
+                    max_limit=LLM_CONCURRENCY_MAX,
+                    batch_share=LLM_CONCURRENCY_BATCH_SHARE,
+                )
+    return _governor
+
+
+def _outcome(exc: BaseException) -> str:
+    return classify_error(exc) if isinstance(exc, Exception) else "cancelled"
+
+
+async def _observed(model: str, make_call):
+    """``await make_call()`` and count its outcome / latency per model in the metrics registry."""
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        return await make_call()
+    except BaseException as e:
+        outcome = _outcome(e)
+        raise
+    finally:
+        observe_llm_call(model, outcome, time.perf_counter() - started)
+
+
+def _observed_sync(model: str, call):
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        return call()
+    except BaseException as e:
+        outcome = _outcome(e)
+        raise
+    finally:
+        observe_llm_call(model, outcome, time.perf_counter() - started)
+
+
+async def governed(model: str, make_call, *, priority: Optional[int] = None, site: str = "default"):
+    """
+    ``await make_call()`` inside a governor slot for *model* (or directly if disabled).
+
+    Queue wait and call are bounded by the run's deadline (services/deadline.py);
+    a call cut off there counts as cancelled, not as a provider timeout.
+    """
+    from config import LLM_CONCURRENCY_ENABLED
+    from services.deadline import within_deadline
+
+    async def call():
+        if not LLM_CONCURRENCY_ENABLED:
+            return await _observed(model, make_call)
+        async with get_governor().slot(model, priority, site=site):
+            return await _observed(model, make_call)
+
+    return await within_deadline(call)
+
+
+def governed_sync(model: str, call, *, priority: Optional[int] = None, site: str = "default"):
+    """``call()`` inside a governor slot for *model* (blocking variant of :func:`governed`)."""
+    from config import LLM_CONCURRENCY_ENABLED
+
+    if not LLM_CONCURRENCY_ENABLED:
+        return _observed_sync(model, call)
+    with get_governor().slot_sync(model, priority, site=site):
+        return _observed_sync(model, call)
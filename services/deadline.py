@@ -0,0 +1,120 @@
+"""
+Latency budgets (deadlines) for graph runs.
+
+A request may carry a budget ("answer within 12 s").  ``graph_service``
+turns it into an absolute deadline (epoch seconds) that travels two ways:
+
+- ``state["deadline"]`` for the graph nodes and routing functions, which
+  skip optional work (scraping, judge, refinement, re-score) when the
+  remaining budget cannot cover its expected duration;
+- the ``generation_deadline`` context var for LLM call sites: ``governed``
+  runs every call through :func:`within_deadline`, so outstanding writer,
+  style and judge calls are cancelled once the budget is spent, and the
+  writer asks for shorter sections when time is short
+  (:func:`writer_budget_tight`).
+
+Expected node durations come from the timing registry's p50
+(services/timing.py) and fall back to ``_FALLBACK_S`` before any run of
+that node was recorded.
+
+Usage:
+    from services.deadline import fits, remaining_s
+
+    if not fits(state.get("deadline"), "style_expert"):
+        return "curator"
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import time
+from typing import Optional
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Absolute deadline (time.time()) of the graph run in this context, None = unbounded
+generation_deadline: contextvars.ContextVar = contextvars.ContextVar("generation_deadline", default=None)
+
+# Expected wall time per node until the timing registry has samples
+_FALLBACK_S = {
+    "scrape_company": 5.0,
+    "generator": 10.0,
+    "ruler_scorer": 6.0,
+    "style_expert": 8.0,
+    "ruler_scorer_after_style": 6.0,
+}
+
+
+class DeadlineExceeded(TimeoutError):
+    """The run's latency budget was spent before the call finished."""
+
+
+def remaining_s(deadline: Optional[float] = None) -> Optional[float]:
+    """Seconds left until *deadline* (default: this context's deadline); None when unbounded."""
+    if deadline is None:
+        deadline = generation_deadline.get()
+    return None if deadline is None else deadline - time.time()
+
+
+def expected_s(node: str) -> float:
+    """Typical wall time of *node*: timing-registry p50, else a static fallback."""
+    from services.timing import get_timing_registry
+
+    stats = get_timing_registry().stats()["nodes"].get(node)
+    if stats and stats["count"]:
+        return stats["p50_ms"] / 1000
+    return _FALLBACK_S.get(node, 0.0)
+
+
+def fits(deadline: Optional[float], *nodes: str) -> bool:
+    """True when there is no deadline, or the budget covers *nodes* plus the reserve."""
+    left = remaining_s(deadline)
+    if left is None:
+        return True
+    from config import DEADLINE_RESERVE_S
+
+    needed = sum(expected_s(node) for node in nodes) + DEADLINE_RESERVE_S
+    if left < needed:
+        logger.info(f"[Deadline] {left:.1f}s left, {'+'.join(nodes)} needs ~{needed:.1f}s: skipping")
+        return False
+    return True
+
+
+def writer_budget_tight() -> bool:
+    """
+    True when the writer should ask for a shorter JobBody to finish in time.
+
+    Output is not capped with ``max_tokens``: a structured-output call cut off
+    mid-JSON fails to parse, which costs the whole call.
+    """
+    left = remaining_s()
+    if left is None:
+        return False
+    from config import DEADLINE_RESERVE_S, DEADLINE_SHORT_WRITER_RATIO
+
+    # Leave time for judging and curating after the writer returns
+    writing_s = left - expected_s("ruler_scorer") - DEADLINE_RESERVE_S
+    return writing_s < DEADLINE_SHORT_WRITER_RATIO * expected_s("generator")
+
+
+async def within_deadline(make_call):
+    """``await make_call()``, cancelled with :class:`DeadlineExceeded` when the context's deadline passes."""
+    left = remaining_s()
+    if left is None:
+        return await make_call()
+    if left <= 0:
+        raise DeadlineExceeded("latency budget spent before the call started")
+    task = asyncio.ensure_future(make_call())
+    try:
+        done, _ = await asyncio.wait({task}, timeout=left)
+    except BaseException:
+        task.cancel()
+        raise
+    if not done:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        raise DeadlineExceeded(f"latency budget spent after {left:.1f}s")
+    return task.result()
@@ -0,0 +1,194 @@
+"""
+Process-wide background event loop.
+
+Sync callers (the Streamlit script thread, job_service, the scraping and
+eval helpers) used to spin up a fresh thread and event loop per call.
+Everything bound to a loop died with it: the async httpx pool and the
+ChatOpenAI instances on it (llm_service), checkpointer connections
+(graph/runtime.py) and any warm TLS/HTTP2 sessions, so every generation
+paid to rebuild them.
+
+``BackgroundLoop`` runs one asyncio loop in a daemon thread for the
+lifetime of the process, so those objects survive Streamlit reruns and
+sessions.  It is thread-safe:
+
+- ``submit(coro)`` schedules a coroutine and returns a
+  ``concurrent.futures.Future``;
+- ``run(coro)`` submits and blocks for the result;
+- ``stream(agen)`` drains an async generator on the loop and returns a
+  sync iterator over its items (optionally yielding ``HEARTBEAT`` when
+  nothing arrived for ``heartbeat_s``).  Closing the iterator early
+  cancels the generator's task.
+
+Coroutines on the loop must not block it (use ``asyncio.to_thread``).
+
+Usage:
+    from services.event_loop import get_background_loop
+
+    result = get_background_loop().run(generate_with_graph(title, cfg))
+    for event in get_background_loop().stream(generate_with_graph_stream(title, cfg)):
+        ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import queue
+import threading
+from typing import Any, AsyncIterator, Coroutine, Dict, Optional
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Yielded by stream() when no item arrived within heartbeat_s
+HEARTBEAT = object()
+_FINISHED = object()
+
+
+class LoopStream:
+    """Sync iterator over an async generator drained on the background loop."""
+
+    def __init__(self, items: "queue.Queue", future: concurrent.futures.Future, heartbeat_s: Optional[float]):
+        self._items = items
+        self._future = future
+        self._heartbeat_s = heartbeat_s
+        self._done = False
+
+    def __iter__(self) -> "LoopStream":
+        return self
+
+    def __next__(self) -> Any:
+        if self._done:
+            raise StopIteration
+        try:
+            item = self._items.get(timeout=self._heartbeat_s)
+        except queue.Empty:
+            return HEARTBEAT
+        if item is _FINISHED:
+            self._done = True
+            self._future.result()  # re-raise the generator's exception, if any
+            raise StopIteration
+        return item
+
+    def close(self) -> None:
+        """Stop consuming: cancels the draining task if it is still running."""
+        self._done = True
+        self._future.cancel()
+
+
+class BackgroundLoop:
+    """One asyncio loop in a daemon thread, shared by all sync callers (thread-safe)."""
+
+    def __init__(self, name: str = "jd-event-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._submitted = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        self.start()
+        return self._loop
+
+    def start(self) -> "BackgroundLoop":
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            ready = threading.Event()
+
+            def run() -> None:
+                self._loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(self._loop)
+                ready.set()
+                self._loop.run_forever()
+
+            self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+        logger.info(f"Background event loop started ({self.name})")
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Cancel outstanding tasks, shut down async generators and stop the loop."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._thread = None
+        if loop is None or thread is None or not thread.is_alive():
+            return
+
+        async def shutdown() -> None:
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await loop.shutdown_asyncgens()
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Background loop shutdown incomplete: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedule *coro* on the loop; the returned future's ``cancel()`` cancels the task."""
+        loop = self.loop
+        with self._lock:
+            self._submitted += 1
+            self._active += 1
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, _future: concurrent.futures.Future) -> None:
+        with self._lock:
+            self._active -= 1
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Run *coro* on the loop and block this thread for its result."""
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("BackgroundLoop.run() called from the loop thread; await the coroutine instead")
+        return self.submit(coro).result(timeout)
+
+    def stream(self, agen: AsyncIterator, heartbeat_s: Optional[float] = None) -> LoopStream:
+        """Drain *agen* on the loop; iterate its items from this thread."""
+        items: "queue.Queue" = queue.Queue()
+
+        async def drain() -> None:
+            try:
+                async for item in agen:
+                    items.put(item)
+            finally:
+                items.put(_FINISHED)
+
+        return LoopStream(items, self.submit(drain()), heartbeat_s)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "submitted": self._submitted,
+                "active": self._active,
+            }
+
+
+_background_loop: Optional[BackgroundLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundLoop:
+    """Return the process-wide background loop (started on first use)."""
+    global _background_loop
+    if _background_loop is None:
+        with _background_loop_lock:
+            if _background_loop is None:
+                _background_loop = BackgroundLoop().start()
+    return _background_loop
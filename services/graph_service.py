@@ -3,14 +3,27 @@ Service layer for using the LangGraph blackboard workflow.
 """
 import asyncio
 import json
-from typing import Dict, Optional, Iterable
+import threading
+import time
+from typing import Any, Dict, List, Optional, Iterable
 from models.job_models import JobGenerationConfig, JobBody
-from graph.job_graph import build_job_graph, JobState
-from utils import job_body_to_dict
-from database.models import get_db_manager
+from graph.job_graph import JobState, merge_timings
+from graph.runtime import get_graph_runtime
+from utils import job_body_to_dict, stable_hash
 from logging_config import get_logger
 from tracing.langfuse_tracing import get_langfuse_callbacks
-from config import LANGFUSE_ENABLED, USE_PERSISTENT_STORE, POSTGRES_CONNECTION_STRING
+from services.metrics import observe_generation
+from services.load_shedding import get_load_shedder
+from services.cancellation import CancelToken
+from config import (
+    LANGFUSE_ENABLED,
+    GENERATION_SINGLEFLIGHT,
+    RESULT_CACHE_ENABLED,
+    GRAPH_TOKEN_STREAMING,
+    RULER_NUM_CANDIDATES,
+    RULER_ADAPTIVE_CANDIDATES,
+    DEADLINE_DEFAULT_S,
+)
 
 logger = get_logger(__name__)
 
@@ -38,41 +51,122 @@ def _build_preview_text(result: Dict) -> str:
 
 
 def _run_async(coro):
-    """Helper to run async functions."""
-    try:
-        return asyncio.run(coro)
-    except RuntimeError as e:
-        # Handle existing event loop
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                import concurrent.futures
-                import threading
-                
-                result = None
-                exception = None
-                
-                def run_in_thread():
-                    nonlocal result, exception
-                    try:
-                        new_loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(new_loop)
-                        result = new_loop.run_until_complete(coro)
-                        new_loop.close()
-                    except Exception as e:
-                        exception = e
-                
-                thread = threading.Thread(target=run_in_thread)
-                thread.start()
-                thread.join()
-                
-                if exception:
-                    raise exception
-                return result
-            else:
-                return loop.run_until_complete(coro)
-        except Exception:
-            raise e
+    """Run *coro* on the shared background loop (services/event_loop.py) and wait for it."""
+    from services.event_loop import get_background_loop
+    return get_background_loop().run(coro)
+
+
+# Nodes whose LLM tokens are forwarded to the UI as draft sections
+_TOKEN_STREAM_NODES = ("generator", "style_expert")
+
+
+def _run_timings(node_timings: Optional[Dict[str, Any]], started_at: float) -> Dict[str, Any]:
+    """Per-node timings plus end-to-end wall time and LLM totals for the result dict."""
+    nodes = node_timings or {}
+    return {
+        "total_ms": round((time.perf_counter() - started_at) * 1000, 1),
+        "llm_calls": sum(n.get("llm_calls", 0) for n in nodes.values()),
+        "prompt_tokens": sum(n.get("prompt_tokens", 0) for n in nodes.values()),
+        "completion_tokens": sum(n.get("completion_tokens", 0) for n in nodes.values()),
+        "queue_ms": round(sum(n.get("queue_ms", 0.0) for n in nodes.values()), 1),
+        "nodes": nodes,
+    }
+
+
+def _result_from_state(state: Dict[str, Any], thread_id: str) -> Dict[str, Any]:
+    """Result dict (job body + RULER / load-shed / deadline fields) from the curator's state."""
+    job_body = JobBody(**json.loads(state["job_body_json"]))
+    result = job_body_to_dict(job_body)
+    ruler_run = state.get("ruler_run", {})
+    result["ruler_score"] = ruler_run.get("best_score")
+    result["ruler_rankings"] = ruler_run.get("rankings", [])
+    result["ruler_num_candidates"] = ruler_run.get("num_candidates", 0)
+    result["ruler_judged"] = ruler_run.get("judged", True)
+    result["load_shed"] = ruler_run.get("load_shed")
+    result["deadline_left_ms"] = ruler_run.get("deadline_left_ms")
+    result["thread_id"] = thread_id
+    return result
+
+
+async def _astream_updates(graph, initial_state: JobState, run_config):
+    """Node updates only (no token events)."""
+    async for update in graph.astream(initial_state, config=run_config, stream_mode="updates"):
+        for node, payload in update.items():
+            yield {"type": "update", "node": node, "payload": payload}
+
+
+async def _astream_with_tokens(graph, initial_state: JobState, run_config, started_at: float):
+    """
+    Drive the graph via ``astream_events`` and interleave node updates with token events.
+
+    For each writer / style node task, the first LLM run that produces tokens is
+    followed (the other parallel candidates are ignored) and its partial JSON is
+    parsed into JobBody sections.  Yields:
+
+        {"type": "first_token", "node": ..., "ttft_ms": ...}   once per request
+        {"type": "partial", "node": ..., "sections": {...}, "text": ...}
+        {"type": "update", "node": ..., "payload": {...}}      node finished
+    """
+    from services.token_stream import PartialJobBodyStream, chunk_text_delta
+
+    followed: Dict[str, PartialJobBodyStream] = {}
+    finished_tasks = set()
+    first_token_sent = False
+
+    async for event in graph.astream_events(initial_state, config=run_config, version="v2"):
+        kind = event.get("event")
+        meta = event.get("metadata") or {}
+        node = meta.get("langgraph_node")
+        task = meta.get("langgraph_checkpoint_ns") or (node, meta.get("langgraph_step"))
+
+        if kind == "on_chat_model_stream" and node in _TOKEN_STREAM_NODES:
+            text = chunk_text_delta((event.get("data") or {}).get("chunk"))
+            if not text:
+                continue
+            stream = followed.get(node)
+            if stream is None or stream.task != task:
+                # First tokens of a new node task: follow this LLM run
+                stream = PartialJobBodyStream(event.get("run_id"), task)
+                followed[node] = stream
+            elif stream.run_id != event.get("run_id"):
+                continue  # A parallel candidate we are not following
+            if not first_token_sent:
+                first_token_sent = True
+                yield {
+                    "type": "first_token",
+                    "node": node,
+                    "ttft_ms": round((time.perf_counter() - started_at) * 1000, 1),
+                }
+            sections = stream.feed(text)
+            if sections:
+                yield {
+                    "type": "partial",
+                    "node": node,
+                    "sections": sections,
+                    "text": _build_preview_text(sections),
+                }
+
+        elif kind == "on_chat_model_end" and node in _TOKEN_STREAM_NODES:
+            stream = followed.get(node)
+            if stream is not None and stream.run_id == event.get("run_id"):
+                sections = stream.feed("", force=True)
+                if sections:
+                    yield {
+                        "type": "partial",
+                        "node": node,
+                        "sections": sections,
+                        "text": _build_preview_text(sections),
+                    }
+
+        elif kind == "on_chain_end" and node and event.get("name") == node:
+            # Node runnables report under the node name (inner callable + outer
+            # sequence); emit each node task once.
+            if task in finished_tasks:
+                continue
+            output = (event.get("data") or {}).get("output")
+            if isinstance(output, dict):
+                finished_tasks.add(task)
+                yield {"type": "update", "node": node, "payload": output}
 
 
 async def _generate_with_graph_impl(
@@ -80,28 +174,64 @@ async def _generate_with_graph_impl(
     config: JobGenerationConfig,
     user_id: str = "default",
     thread_id: Optional[str] = None,
-    company_urls: Optional[list] = None
+    company_urls: Optional[list] = None,
+    num_candidates: Optional[int] = None,
+    deadline: Optional[float] = None,
+    inputs: Optional[Dict[str, Any]] = None,
 ):
     """
     Internal implementation that yields results as they become available.
+
+    Picks the candidate count (adaptive policy) and the load-shedding tier
+    for this run, then executes the graph.  *inputs* (resolved StyleKit and
+    duties, see ``resolve_generation_inputs``) skip the nodes' own lookups.
     """
+    if RULER_ADAPTIVE_CANDIDATES:
+        # Explicit num_candidates wins; otherwise N comes from the bucket's score history
+        from services.candidate_policy import get_candidate_policy
+        num_candidates = await asyncio.to_thread(get_candidate_policy().choose, config, num_candidates)
+
+    # Under queue pressure, step down: fewer candidates, no re-score / refinement / judge
+    shedder = get_load_shedder()
+    load_shed = await shedder.aadmit()
+    if load_shed["max_candidates"]:
+        num_candidates = min(num_candidates or RULER_NUM_CANDIDATES, load_shed["max_candidates"])
+    try:
+        # Keep the user's memories in the store while the run's nodes read them
+        with get_graph_runtime().memory_sync.active(user_id):
+            async for event in _run_graph(
+                job_title, config, user_id, thread_id, company_urls, num_candidates, load_shed, deadline, inputs
+            ):
+                yield event
+    finally:
+        shedder.release()
+
+
+async def _run_graph(
+    job_title: str,
+    config: JobGenerationConfig,
+    user_id: str,
+    thread_id: Optional[str],
+    company_urls: Optional[list],
+    num_candidates: Optional[int],
+    load_shed: Dict[str, Any],
+    deadline: Optional[float],
+    inputs: Optional[Dict[str, Any]] = None,
+):
+    """Execute the blackboard graph once and yield progress, token and result events."""
     from langchain_core.runnables import RunnableConfig
-    from database.store_sync import sync_all_to_store
     
-    # Build graph with environment-based database configuration
+    # Borrow the process-wide compiled graph and a pooled checkpointer connection
     # Uses PostgreSQL if POSTGRES_CONNECTION_STRING is set, otherwise SQLite (local dev)
-    graph, conn, store = await build_job_graph(
-        use_persistent_store=USE_PERSISTENT_STORE,
-        postgres_connection_string=POSTGRES_CONNECTION_STRING
-    )
+    runtime = get_graph_runtime()
+    started_at = time.perf_counter()
     logger.info(f"Starting job generation for: {job_title} (user: {user_id})")
     
-    try:
-        # Sync ORM database to LangGraph store before generation
-        # This ensures gold standards and gripes are available
-        db_manager = get_db_manager()
-        sync_all_to_store(store, user_id, db_manager)
-        logger.debug(f"Synced store for user: {user_id}")
+    async with runtime.borrow() as graph:
+        # Incrementally sync ORM database to the long-lived LangGraph store
+        # Only rows above the user's high-water mark are applied
+        applied = await asyncio.to_thread(runtime.memory_sync.sync_user, user_id)
+        logger.debug(f"Synced store for user: {user_id} (applied: {applied})")
         # Create initial state
         initial_state: JobState = {
             "messages": [],
@@ -110,12 +240,21 @@ async def _generate_with_graph_impl(
             "company_urls": company_urls or [],
             "scraped_text": None,
             "candidates": [],
+            "num_candidates": num_candidates or RULER_NUM_CANDIDATES,
+            "load_shed": load_shed,
+            "deadline": deadline,
+            # Pre-resolved inputs; None lets style_router / generator look them up
+            # (always set, so a continued thread does not reuse the last run's)
+            "style_kit": (inputs or {}).get("style_kit"),
+            "duty_bullets": (inputs or {}).get("duty_bullets"),
+            "duty_source": (inputs or {}).get("duty_source"),
             "job_body_json": None,
             "style_profile_json": None,
             "consistency_report_json": None,
             "ruler_run": {},
             "ruler_runs": [],
             "ruler_scores": {},  # Will be populated by RULER curator
+            "timings": {},  # Fresh per-node timings for this run (services/timing.py)
             "refinement_count": 0,
             "needs_refinement": False,  # Will be set based on HITL feedback or RULER scores
             "feedback_label": "no_feedback",
@@ -146,65 +285,421 @@ async def _generate_with_graph_impl(
         # Run graph with streaming
         logger.info(f"Executing graph workflow (thread: {thread_id})")
         final_state = None
-        async for update in graph.astream(initial_state, config=run_config, stream_mode="updates"):
-            for node, payload in update.items():
-                logger.debug(f"Graph node executed: {node}")
-                # Emit progress updates so UI can show activity
-                yield {"type": "progress", "node": node}
-                # Stream final result as soon as curator completes
-                if node == "curator":
-                    logger.info("Curator node completed, final candidate selected")
-                    final_state = payload
-                    # Yield the result immediately for streaming
-                    job_body_json = payload.get("job_body_json")
-                    if job_body_json:
-                        try:
-                            job_body_dict = json.loads(job_body_json)
-                            job_body = JobBody(**job_body_dict)
-                            result = job_body_to_dict(job_body)
-                            ruler_run = payload.get("ruler_run", {})
-                            result["ruler_score"] = ruler_run.get("best_score")
-                            result["ruler_rankings"] = ruler_run.get("rankings", [])
-                            result["ruler_num_candidates"] = ruler_run.get("num_candidates", 0)
-                            result["thread_id"] = thread_id
-                            logger.info(f"Job generation completed successfully (RULER score: {result.get('ruler_score')})")
-                            preview_text = _build_preview_text(result)
-                            for chunk in _chunk_text(preview_text):
-                                yield {"type": "result_chunk", "text": chunk}
-                            yield {"type": "result", "data": result}
-                        except Exception as e:
-                            logger.error(f"Error parsing job body JSON: {e}", exc_info=True)
-                            # If parsing fails, continue to final state retrieval
-                            pass
-        
-        # Get final state if streaming didn't yield
-        if not final_state:
-            latest = await graph.aget_state(run_config)
-            final_state = latest.values if latest else {}
+        result: Optional[Dict[str, Any]] = None
+        node_timings: Dict[str, Any] = {}
+        if GRAPH_TOKEN_STREAMING:
+            stream = _astream_with_tokens(graph, initial_state, run_config, started_at)
+        else:
+            stream = _astream_updates(graph, initial_state, run_config)
+        async for item in stream:
+            if item["type"] != "update":
+                # Token-level events (first_token / partial) go straight to the caller
+                yield item
+                continue
+            node, payload = item["node"], item["payload"]
+            logger.debug(f"Graph node executed: {node}")
+            # Same merge as the state's timings reducer, so persist is included too
+            if (payload or {}).get("timings"):
+                node_timings = merge_timings(node_timings, payload["timings"])
+            # Emit progress updates so UI can show activity
+            yield {"type": "progress", "node": node}
+            # The curator selects the final candidate; only persist (a store write) follows
+            if node == "curator":
+                logger.info("Curator node completed, final candidate selected")
+                final_state = payload
+                job_body_json = payload.get("job_body_json")
+                if job_body_json:
+                    try:
+                        result = _result_from_state(payload, thread_id)
+                    except Exception as e:
+                        logger.error(f"Error parsing job body JSON: {e}", exc_info=True)
+                        # If parsing fails, continue to final state retrieval
+                        final_state = None
         
-        # Parse job body from final state (fallback)
-        job_body_json = final_state.get("job_body_json")
-        if job_body_json:
-            job_body_dict = json.loads(job_body_json)
-            job_body = JobBody(**job_body_dict)
-            result = job_body_to_dict(job_body)
-            ruler_run = final_state.get("ruler_run", {})
-            result["ruler_score"] = ruler_run.get("best_score")
-            result["ruler_rankings"] = ruler_run.get("rankings", [])
-            result["ruler_num_candidates"] = ruler_run.get("num_candidates", 0)
-            result["thread_id"] = thread_id
+        if result is None:
+            # Get final state if streaming did not produce a result
+            if not final_state:
+                latest = await graph.aget_state(run_config)
+                final_state = latest.values if latest else {}
+            if not final_state.get("job_body_json"):
+                logger.error("No job body generated - graph execution failed")
+                raise ValueError("No job body generated")
+            result = _result_from_state(final_state, thread_id)
+            node_timings = final_state.get("timings") or node_timings
             logger.info(f"Job generation completed (fallback path, RULER score: {result.get('ruler_score')})")
-            preview_text = _build_preview_text(result)
-            for chunk in _chunk_text(preview_text):
-                yield {"type": "result_chunk", "text": chunk}
-            yield {"type": "result", "data": result}
         else:
-            logger.error("No job body generated - graph execution failed")
-            raise ValueError("No job body generated")
-    
+            logger.info(f"Job generation completed successfully (RULER score: {result.get('ruler_score')})")
+        
+        # Timings of the whole run, persist included
+        result["timings"] = _run_timings(node_timings, started_at)
+        preview_text = _build_preview_text(result)
+        for chunk in _chunk_text(preview_text):
+            yield {"type": "result_chunk", "text": chunk}
+        yield {"type": "result", "data": result}
+
+
+def request_fingerprint(
+    job_title: str,
+    config: JobGenerationConfig,
+    user_id: str = "default",
+    thread_id: Optional[str] = None,
+    company_urls: Optional[list] = None,
+    num_candidates: Optional[int] = None,
+    regenerate: bool = False,
+) -> str:
+    """Canonical hash of everything that determines a generation request."""
+    return stable_hash({
+        "job_title": (job_title or "").strip(),
+        "config": config,
+        "user_id": user_id,
+        "thread_id": thread_id,
+        "company_urls": sorted(company_urls or []),
+        "num_candidates": num_candidates,
+        # A regenerate bypasses the LLM response cache, so it must not share a cached run
+        "regenerate": bool(regenerate),
+    })
+
+
+class _Flight:
+    """
+    One in-flight generation shared by every identical concurrent request.
+
+    The leader publishes each event; followers replay the buffer from the
+    start and then wait for new events.  Followers may live on other event
+    loops (Streamlit drives each session from its own thread), so the buffer
+    is guarded by a threading lock and waiters are woken with
+    ``call_soon_threadsafe``.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.events: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.abandoned = False
+        self.has_result = False
+        self.followers = 0
+        self._lock = threading.Lock()
+        self._waiters: List[tuple] = []
+
+    def publish(self, event: Any) -> None:
+        with self._lock:
+            self.events.append(event)
+            if isinstance(event, dict) and event.get("type") == "result":
+                self.has_result = True
+            self._wake_locked()
+
+    def finish(self, error: Optional[BaseException] = None, abandoned: bool = False) -> None:
+        with self._lock:
+            if self.done:
+                return
+            self.done = True
+            self.error = error
+            self.abandoned = abandoned
+            self._wake_locked()
+
+    def _wake_locked(self) -> None:
+        waiters, self._waiters = self._waiters, []
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # Follower's loop already closed
+
+    async def subscribe(self):
+        """Yield every event (replaying from the start) until the leader finishes."""
+        idx = 0
+        while True:
+            with self._lock:
+                pending = self.events[idx:]
+                idx += len(pending)
+                done = self.done
+                waiter = None
+                if not pending and not done:
+                    waiter = asyncio.Event()
+                    self._waiters.append((asyncio.get_running_loop(), waiter))
+            for event in pending:
+                yield event
+            if waiter is not None:
+                await waiter.wait()
+            elif done and not pending:
+                return
+
+
+_inflight: Dict[str, _Flight] = {}
+_inflight_lock = threading.Lock()
+_singleflight_stats = {"leaders": 0, "followers": 0}
+
+
+def get_singleflight_stats() -> Dict[str, int]:
+    """Counts of generations that ran (leaders) vs. attached to a run (followers)."""
+    with _inflight_lock:
+        return {**_singleflight_stats, "in_flight": len(_inflight)}
+
+
+async def _generate_singleflight(
+    job_title: str,
+    config: JobGenerationConfig,
+    user_id: str = "default",
+    thread_id: Optional[str] = None,
+    company_urls: Optional[list] = None,
+    num_candidates: Optional[int] = None,
+    deadline: Optional[float] = None,
+    regenerate: bool = False,
+    inputs: Optional[Dict[str, Any]] = None,
+):
+    """
+    De-duplicate identical concurrent generations.
+
+    The first request for a fingerprint runs the graph; identical requests
+    that arrive while it is running attach to it and receive the same
+    progress events and result instead of paying for another 3 writer calls,
+    RULER judging and refinement.  Requests with a latency budget always run
+    on their own: the leader's run may be cut to a shorter budget, or run
+    past theirs.
+    """
+    if not GENERATION_SINGLEFLIGHT or deadline is not None:
+        async for event in _generate_with_graph_impl(
+            job_title, config, user_id, thread_id, company_urls, num_candidates, deadline, inputs
+        ):
+            yield event
+        return
+
+    key = request_fingerprint(job_title, config, user_id, thread_id, company_urls, num_candidates, regenerate)
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        is_leader = flight is None
+        if is_leader:
+            flight = _Flight(key)
+            _inflight[key] = flight
+            _singleflight_stats["leaders"] += 1
+        else:
+            flight.followers += 1
+            _singleflight_stats["followers"] += 1
+
+    if not is_leader:
+        logger.info(f"Attaching to in-flight generation for: {job_title} (user: {user_id})")
+        async for event in flight.subscribe():
+            yield event
+        if flight.error is not None:
+            raise flight.error
+        if flight.abandoned and not flight.has_result:
+            # Leader stopped before producing a result — run it ourselves
+            async for event in _generate_singleflight(
+                job_title, config, user_id, thread_id, company_urls, num_candidates, deadline, regenerate, inputs
+            ):
+                yield event
+        return
+
+    error: Optional[BaseException] = None
+    completed = False
+    try:
+        async for event in _generate_with_graph_impl(
+            job_title, config, user_id, thread_id, company_urls, num_candidates, deadline, inputs
+        ):
+            flight.publish(event)
+            yield event
+        completed = True
+    except Exception as e:
+        error = e
+        raise
     finally:
-        if conn is not None:
-            await conn.close()
+        with _inflight_lock:
+            if _inflight.get(key) is flight:
+                del _inflight[key]
+        # GeneratorExit / cancellation: followers either already have the
+        # result or re-run the request themselves.
+        flight.finish(error=error, abandoned=not completed and error is None)
+
+
+# ---------------------------------------------------------------------------
+# Result cache (exact match, database/result_cache.py)
+# ---------------------------------------------------------------------------
+
+def resolve_generation_inputs(job_title: str, config: JobGenerationConfig) -> Dict[str, Any]:
+    """
+    Resolve the StyleKit and duty bullets for a request (RAG lookups, sync).
+
+    Passed into the graph state, so the style_router and generator nodes use
+    exactly what the result cache key was built from.
+    """
+    from services.style_router import route_style
+    from services.style_retriever import retrieve_style_kit
+    from services.duty_retriever import build_duty_cascade
+
+    cfg = config.with_industry_defaults()
+    vector_store = None
+    try:
+        from services.startup import get_vector_store_manager
+        vector_store = get_vector_store_manager()
+    except Exception:
+        pass  # Same fallback as the style_router node: defaults are used
+
+    kit = retrieve_style_kit(
+        route_style(config), lang=config.language, vector_store=vector_store, formality=config.formality
+    )
+    try:
+        duty_bullets, duty_source = build_duty_cascade(
+            cfg.duty_keywords or [], job_title, cfg.seniority_label,
+            lang=cfg.language, vector_store=vector_store,
+        )
+    except Exception as e:
+        logger.warning(f"Duty retrieval failed, falling back to LLM: {e}")
+        duty_bullets, duty_source = [], "llm"
+    return {"style_kit": kit, "duty_bullets": duty_bullets, "duty_source": duty_source}
+
+
+def generation_cache_key(
+    job_title: str,
+    config: JobGenerationConfig,
+    inputs: Dict[str, Any],
+    user_id: str = "default",
+    company_urls: Optional[list] = None,
+    num_candidates: Optional[int] = None,
+) -> str:
+    """
+    Canonical key for a cached generation result.
+
+    Combines the title, full config, the run's resolved StyleKit and duty
+    bullets (*inputs* from ``resolve_generation_inputs``), company URLs,
+    candidate count and the user's memory version (gold standards + feedback),
+    so a new gold standard or gripe makes older entries unreachable.
+    """
+    from database.models import get_db_manager
+
+    return stable_hash({
+        "job_title": (job_title or "").strip(),
+        "config": config,
+        "style_kit": inputs["style_kit"],
+        "duty_bullets": inputs["duty_bullets"],
+        "company_urls": sorted(company_urls or []),
+        "num_candidates": num_candidates,
+        "user_id": user_id,
+        "memory_version": get_db_manager().get_memory_version(user_id),
+    })
+
+
+def invalidate_cached_results(user_id: str) -> int:
+    """Drop cached generations for *user_id* (call after new gold standards / gripes)."""
+    if not RESULT_CACHE_ENABLED:
+        return 0
+    from database.result_cache import get_result_cache
+    try:
+        return get_result_cache().invalidate_user(user_id)
+    except Exception as e:
+        logger.warning(f"Result cache invalidation failed: {e}")
+        return 0
+
+
+async def _generate_cached(
+    job_title: str,
+    config: JobGenerationConfig,
+    user_id: str = "default",
+    thread_id: Optional[str] = None,
+    company_urls: Optional[list] = None,
+    regenerate: bool = False,
+    num_candidates: Optional[int] = None,
+    deadline_s: Optional[float] = None,
+    cancel_token: Optional[CancelToken] = None,
+):
+    """
+    Serve repeat requests from the result cache, otherwise run (singleflight) and store.
+
+    Runs that continue an explicit thread are never cached.  ``regenerate=True``
+    skips the lookup (here and in the LLM response cache) but still stores the
+    fresh result.
+    """
+    started_at = time.perf_counter()
+    # The latency budget runs from the request's arrival (services/deadline.py)
+    deadline_s = deadline_s if deadline_s is not None else DEADLINE_DEFAULT_S
+    deadline = time.time() + deadline_s if deadline_s and deadline_s > 0 else None
+    cache = key = inputs = None
+    if RESULT_CACHE_ENABLED and not thread_id:
+        try:
+            from database.result_cache import get_result_cache
+            cache = get_result_cache()
+            # Resolved once: the key and the graph run share these inputs
+            inputs = await asyncio.to_thread(resolve_generation_inputs, job_title, config)
+            if not regenerate:
+                key = await asyncio.to_thread(
+                    generation_cache_key, job_title, config, inputs, user_id, company_urls, num_candidates
+                )
+        except Exception as e:
+            logger.warning(f"Result cache unavailable, generating without it: {e}")
+            cache = inputs = None
+
+    if cache is not None and not regenerate:
+        hit = await asyncio.to_thread(cache.get, key)
+        if hit is not None:
+            logger.info(f"Result cache hit for: {job_title} (user: {user_id})")
+            hit["cache_hit"] = True
+            yield {"type": "progress", "node": "result_cache"}
+            for chunk in _chunk_text(_build_preview_text(hit)):
+                yield {"type": "result_chunk", "text": chunk}
+            observe_generation("cache_hit", time.perf_counter() - started_at)
+            yield {"type": "result", "data": hit}
+            return
+
+    # Regenerate must also bypass the per-call LLM response cache (still refreshing it)
+    from llm_service import llm_cache_mode
+    mode_token = llm_cache_mode.set("refresh") if regenerate else None
+    # LLM call sites (governed) cancel outstanding calls once the budget is spent
+    from services.deadline import generation_deadline
+    deadline_token = generation_deadline.set(deadline)
+    # Stop / supersede cancels this task, and with it graph.astream and its LLM calls
+    if cancel_token is not None:
+        cancel_token.attach()
+
+    stored = observed = False
+    try:
+        async for event in _generate_singleflight(
+            job_title, config, user_id, thread_id, company_urls, num_candidates, deadline, regenerate, inputs
+        ):
+            if not observed and isinstance(event, dict) and event.get("type") == "result":
+                observe_generation("ok", time.perf_counter() - started_at)
+                observed = True
+            if (
+                cache is not None and not stored
+                and isinstance(event, dict) and event.get("type") == "result"
+                # A run degraded by load shedding or cut short by its latency budget
+                # is not what a later request should get
+                and not ((event.get("data") or {}).get("load_shed") or {}).get("tier")
+                and deadline is None
+            ):
+                # Timings describe this run only; a later cache hit has none
+                data = {
+                    k: v for k, v in (event.get("data") or {}).items()
+                    if k not in ("thread_id", "timings", "load_shed", "deadline_left_ms")
+                }
+                if key is None:
+                    # Regenerate skipped the lookup; the key is only needed now
+                    key = await asyncio.to_thread(
+                        generation_cache_key, job_title, config, inputs, user_id, company_urls, num_candidates
+                    )
+                await asyncio.to_thread(cache.put, key, data, user_id=user_id, job_title=job_title)
+                stored = True
+            yield event
+    except asyncio.CancelledError:
+        if cancel_token is None or not cancel_token.cancelled:
+            raise
+        logger.info(f"Generation cancelled ({cancel_token.reason}): {job_title} (user: {user_id})")
+        if not observed:
+            observe_generation("cancelled", time.perf_counter() - started_at)
+        raise cancel_token.consume() from None
+    except Exception:
+        if not observed:
+            observe_generation("error", time.perf_counter() - started_at)
+        raise
+    finally:
+        if cancel_token is not None:
+            cancel_token.detach()
+        try:
+            generation_deadline.reset(deadline_token)
+            if mode_token is not None:
+                llm_cache_mode.reset(mode_token)
+        except ValueError:
+            # Generator finalised from a different context; nothing to restore
+            pass
 
 
 async def generate_with_graph(
@@ -212,19 +707,32 @@ async def generate_with_graph(
     config: JobGenerationConfig,
     user_id: str = "default",
     thread_id: Optional[str] = None,
-    company_urls: Optional[list] = None
+    company_urls: Optional[list] = None,
+    regenerate: bool = False,
+    num_candidates: Optional[int] = None,
+    deadline_s: Optional[float] = None,
+    cancel_token: Optional[CancelToken] = None,
 ) -> Dict:
     """
     Generate job description using the LangGraph blackboard workflow (non-streaming).
     
     Uses LangGraph's store system for user memory across threads.
     Syncs gold standards and user gripes from ORM database to store before generation.
+    Repeat requests are served from the result cache unless ``regenerate`` is set.
+    Without ``num_candidates`` the adaptive candidate policy picks N
+    (services/candidate_policy.py), or RULER_NUM_CANDIDATES when it is off.
+    ``deadline_s`` bounds the run (default DEADLINE_DEFAULT_S, see services/deadline.py).
+    ``cancel_token.cancel()`` stops it; the call then raises GenerationCancelled
+    (services/cancellation.py).
     
     Returns:
         Dictionary with job fields and metadata
     """
     # Non-streaming: wait for the final result event
-    async for event in _generate_with_graph_impl(job_title, config, user_id, thread_id, company_urls):
+    async for event in _generate_cached(
+        job_title, config, user_id, thread_id, company_urls, regenerate, num_candidates, deadline_s,
+        cancel_token=cancel_token,
+    ):
         if isinstance(event, dict):
             if event.get("type") == "result":
                 return event.get("data")
@@ -240,10 +748,17 @@ def generate_job_with_blackboard(
     config: JobGenerationConfig,
     user_id: str = "default",
     thread_id: Optional[str] = None,
-    company_urls: Optional[list] = None
+    company_urls: Optional[list] = None,
+    regenerate: bool = False,
+    num_candidates: Optional[int] = None,
+    deadline_s: Optional[float] = None,
+    cancel_token: Optional[CancelToken] = None,
 ) -> Dict:
     """Synchronous wrapper for graph generation (non-streaming)."""
-    return _run_async(generate_with_graph(job_title, config, user_id, thread_id, company_urls))
+    return _run_async(generate_with_graph(
+        job_title, config, user_id, thread_id, company_urls, regenerate, num_candidates, deadline_s,
+        cancel_token=cancel_token,
+    ))
 
 
 async def generate_with_graph_stream(
@@ -251,9 +766,21 @@ async def generate_with_graph_stream(
     config: JobGenerationConfig,
     user_id: str = "default",
     thread_id: Optional[str] = None,
-    company_urls: Optional[list] = None
+    company_urls: Optional[list] = None,
+    regenerate: bool = False,
+    num_candidates: Optional[int] = None,
+    deadline_s: Optional[float] = None,
+    cancel_token: Optional[CancelToken] = None,
 ):
-    """Async generator for streaming job description generation."""
-    async for result in _generate_with_graph_impl(job_title, config, user_id, thread_id, company_urls):
+    """Async generator for streaming job description generation.
+
+    Repeat requests are served from the result cache (bypass with ``regenerate``);
+    identical concurrent requests share one graph run (see _generate_singleflight).
+    Cancelling ``cancel_token`` stops the run and raises GenerationCancelled.
+    """
+    async for result in _generate_cached(
+        job_title, config, user_id, thread_id, company_urls, regenerate, num_candidates, deadline_s,
+        cancel_token=cancel_token,
+    ):
         yield result
 
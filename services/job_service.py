@@ -3,57 +3,21 @@ Service layer for job description generation.
 Provides high-level functions that can use either the simple LLM approach
 or the advanced JobGenerationConfig approach with optional RULER ranking.
 """
-import asyncio
 from models.job_models import JobGenerationConfig, JobBody, SkillItem
 from generators.job_generator import render_job_body
 from ruler.ruler_utils import generate_best_job_body_with_ruler
 from llm_service import call_llm
 from utils import job_body_to_dict, dict_to_job_body, strip_bullet_prefix
 from logging_config import get_logger
+from config import RULER_NUM_CANDIDATES
 
 logger = get_logger(__name__)
 
 
 def _run_async(coro):
-    """Helper to run async functions, handling existing event loops."""
-    try:
-        # Try asyncio.run() first (works when no event loop exists)
-        return asyncio.run(coro)
-    except RuntimeError as e:
-        # If event loop already exists, try to use it
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # Loop is running - this is tricky in Streamlit
-                # Fall back to creating a new thread with a new event loop
-                import concurrent.futures
-                import threading
-                
-                result = None
-                exception = None
-                
-                def run_in_thread():
-                    nonlocal result, exception
-                    try:
-                        new_loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(new_loop)
-                        result = new_loop.run_until_complete(coro)
-                        new_loop.close()
-                    except Exception as e:
-                        exception = e
-                
-                thread = threading.Thread(target=run_in_thread)
-                thread.start()
-                thread.join()
-                
-                if exception:
-                    raise exception
-                return result
-            else:
-                return loop.run_until_complete(coro)
-        except Exception:
-            # If all else fails, raise the original error
-            raise e
+    """Run *coro* on the shared background loop (services/event_loop.py) and wait for it."""
+    from services.event_loop import get_background_loop
+    return get_background_loop().run(coro)
 
 
 def generate_full_job_description(
@@ -61,9 +25,10 @@ def generate_full_job_description(
     config: JobGenerationConfig | None = None,
     use_advanced: bool = True,
     use_ruler: bool = False,
-    num_candidates: int = 3,
+    num_candidates: int | None = None,
     user_id: str = "default",
     company_urls: list | None = None,
+    regenerate: bool = False,
 ) -> dict:
     """
     Generate a complete job description using blackboard architecture with multi-expert workflow.
@@ -74,8 +39,10 @@ def generate_full_job_description(
         config: Optional JobGenerationConfig. If None, uses defaults
         use_advanced: If True, uses blackboard architecture (default). If False, uses simple call_llm
         use_ruler: If True, generates multiple candidates and uses RULER to rank them
-        num_candidates: Number of candidates to generate when using RULER (default: 3)
+        num_candidates: Number of candidates to generate when using RULER. None lets the
+            adaptive candidate policy pick it (RULER_NUM_CANDIDATES when that is off)
         user_id: User ID for storing gold standards and feedback
+        regenerate: If True, bypass the generation result cache and run the graph again
         
     Returns:
         Dictionary with job fields compatible with session state
@@ -87,7 +54,8 @@ def generate_full_job_description(
             from database.models import get_db_manager
             
             result = generate_job_with_blackboard(
-                job_title, config, user_id=user_id, company_urls=company_urls
+                job_title, config, user_id=user_id, company_urls=company_urls,
+                regenerate=regenerate, num_candidates=num_candidates if use_ruler else None,
             )
             
             # Log interaction
@@ -97,7 +65,12 @@ def generate_full_job_description(
                 "generation",
                 input_data={"job_title": job_title, "config": config.model_dump()},
                 output_data=result,
-                metadata={"method": "blackboard", "ruler_score": result.get("ruler_score")},
+                metadata={
+                    "method": "blackboard",
+                    "ruler_score": result.get("ruler_score"),
+                    "ruler_judged": result.get("ruler_judged", True),
+                    "cache_hit": bool(result.get("cache_hit")),
+                },
                 job_title=job_title
             )
             
@@ -114,7 +87,7 @@ def generate_full_job_description(
                 # Run async function in sync context
                 best_job_body, scored_candidates = _run_async(
                     generate_best_job_body_with_ruler(
-                        job_title, config, num_candidates=num_candidates
+                        job_title, config, num_candidates=num_candidates or RULER_NUM_CANDIDATES
                     )
                 )
                 result = job_body_to_dict(best_job_body)
@@ -146,7 +119,10 @@ def generate_full_job_description(
             from services.graph_service import generate_job_with_blackboard
             from database.models import get_db_manager
             
-            result = generate_job_with_blackboard(job_title, default_config, user_id=user_id)
+            result = generate_job_with_blackboard(
+                job_title, default_config, user_id=user_id, regenerate=regenerate,
+                num_candidates=num_candidates if use_ruler else None,
+            )
             
             # Log interaction
             db = get_db_manager()
@@ -155,7 +131,12 @@ def generate_full_job_description(
                 "generation",
                 input_data={"job_title": job_title, "config": default_config.model_dump()},
                 output_data=result,
-                metadata={"method": "blackboard", "ruler_score": result.get("ruler_score")},
+                metadata={
+                    "method": "blackboard",
+                    "ruler_score": result.get("ruler_score"),
+                    "ruler_judged": result.get("ruler_judged", True),
+                    "cache_hit": bool(result.get("cache_hit")),
+                },
                 job_title=job_title
             )
             
@@ -167,7 +148,7 @@ def generate_full_job_description(
                 try:
                     best_job_body, scored_candidates = _run_async(
                         generate_best_job_body_with_ruler(
-                            job_title, default_config, num_candidates=num_candidates
+                            job_title, default_config, num_candidates=num_candidates or RULER_NUM_CANDIDATES
                         )
                     )
                     result = job_body_to_dict(best_job_body)
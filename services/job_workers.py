@@ -0,0 +1,326 @@
+"""
+Worker processes for the durable generation job queue (database/job_queue.py).
+
+With ``JOB_QUEUE_ENABLED`` the UI no longer runs generations in its own
+process.  It calls ``submit_generation()`` and follows the job's event log
+with ``follow_job()``; worker processes claim jobs and run
+``generate_with_graph_stream``.  Each worker process owns a background event
+loop and graph runtime (services/event_loop.py), and runs up to
+``JOB_QUEUE_JOBS_PER_WORKER`` jobs at a time.  Bursts therefore wait in the
+queue instead of piling onto the UI process, and generations spread across
+cores.
+
+Each running job:
+
+- records ``started`` / ``progress`` / ``first_token`` / ``partial`` (at most
+  every ``JOB_QUEUE_PARTIAL_INTERVAL_S``) / ``result`` events, plus ``retry``
+  when an attempt fails and is re-queued with backoff;
+- renews its lease every ``min(JOB_QUEUE_LEASE_S / 3, 2)`` seconds.  A
+  cancel request seen there cancels the run through its CancelToken
+  (services/cancellation.py).
+
+``ensure_job_workers()`` (services/startup.py) starts ``JOB_QUEUE_WORKERS``
+processes with the app.  More workers can run on the same box:
+
+    python -m services.job_workers --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterator, List, Optional
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Interactive (UI) generations go ahead of batch submissions
+JOB_PRIORITY_INTERACTIVE = 10
+JOB_PRIORITY_BATCH = 0
+
+_PURGE_EVERY_S = 3600.0
+
+
+# ---------------------------------------------------------------------------
+# Submitter side
+# ---------------------------------------------------------------------------
+
+class QueuedGeneration:
+    """Cancel handle for a queued job (same interface as CancelToken)."""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self._reason: Optional[str] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._reason is not None
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._reason
+
+    def cancel(self, reason: str = "cancelled") -> bool:
+        if self._reason is not None:
+            return False
+        self._reason = reason
+        from database.job_queue import get_job_queue
+        return get_job_queue().request_cancel(self.job_id, reason)
+
+
+def submit_generation(
+    job_title: str,
+    config,
+    *,
+    user_id: str = "default",
+    company_urls: Optional[list] = None,
+    regenerate: bool = False,
+    num_candidates: Optional[int] = None,
+    deadline_s: Optional[float] = None,
+    priority: int = JOB_PRIORITY_BATCH,
+) -> QueuedGeneration:
+    """Queue a ``generate_with_graph`` run and return its handle."""
+    from database.job_queue import get_job_queue
+
+    request = {
+        "job_title": job_title,
+        "config": config.model_dump(mode="json"),
+        "user_id": user_id,
+        "company_urls": company_urls,
+        "regenerate": regenerate,
+        "num_candidates": num_candidates,
+        "deadline_s": deadline_s,
+    }
+    job_id = get_job_queue().submit(request, user_id=user_id, job_title=job_title, priority=priority)
+    return QueuedGeneration(job_id)
+
+
+def follow_job(job_id: str, poll_s: float = 0.25) -> Iterator[Any]:
+    """
+    Yield the job's events as they are recorded (``HEARTBEAT`` while idle).
+
+    Returns once the job has finished and its events are drained.  A failed
+    job raises RuntimeError, a cancelled one GenerationCancelled.
+    """
+    from database.job_queue import TERMINAL, get_job_queue
+    from services.cancellation import GenerationCancelled
+    from services.event_loop import HEARTBEAT
+
+    queue = get_job_queue()
+    after = 0
+    while True:
+        # Read the status first so no event recorded before the job finished is missed
+        job = queue.get(job_id)
+        events = queue.events(job_id, after)
+        for after, event in events:
+            yield event
+        if job is None:
+            raise RuntimeError(f"Job {job_id} not found")
+        if job["status"] in TERMINAL:
+            break
+        if not events:
+            yield HEARTBEAT
+            time.sleep(poll_s)
+
+    if job["status"] == "failed":
+        raise RuntimeError(f"Generation failed after {job['attempts']} attempt(s): {job['error']}")
+    if job["status"] == "cancelled":
+        raise GenerationCancelled(job["cancel_reason"] or "cancelled")
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+def _execute(job: Dict[str, Any], worker: str) -> None:
+    """Run one claimed job to completion, failure or cancellation."""
+    from config import JOB_QUEUE_LEASE_S, JOB_QUEUE_PARTIAL_INTERVAL_S
+    from database.job_queue import get_job_queue
+    from models.job_models import JobGenerationConfig
+    from services.cancellation import CancelToken, GenerationCancelled
+    from services.event_loop import HEARTBEAT, get_background_loop
+    from services.graph_service import generate_with_graph_stream
+
+    queue = get_job_queue()
+    job_id, request = job["id"], job["request"]
+    queue.add_event(job_id, {"type": "started", "worker": worker, "attempt": job["attempts"]})
+
+    token = CancelToken()
+    # Frequent enough for Stop to feel immediate; a renewal is one small UPDATE
+    heartbeat_s = min(JOB_QUEUE_LEASE_S / 3, 2.0)
+    last_heartbeat = last_partial = 0.0
+    result = None
+    stream = get_background_loop().stream(
+        generate_with_graph_stream(
+            request["job_title"],
+            JobGenerationConfig.model_validate(request["config"]),
+            user_id=request.get("user_id", "default"),
+            company_urls=request.get("company_urls"),
+            regenerate=request.get("regenerate", False),
+            num_candidates=request.get("num_candidates"),
+            deadline_s=request.get("deadline_s"),
+            cancel_token=token,
+        ),
+        heartbeat_s=heartbeat_s,
+    )
+    try:
+        for item in stream:
+            now = time.monotonic()
+            if now - last_heartbeat >= heartbeat_s:
+                last_heartbeat = now
+                owned, cancel_reason = queue.heartbeat(job_id, worker)
+                if cancel_reason or not owned:
+                    token.cancel(cancel_reason or "lease_lost")
+            if item is HEARTBEAT or not isinstance(item, dict):
+                continue
+            kind = item.get("type")
+            if kind == "partial":
+                if now - last_partial < JOB_QUEUE_PARTIAL_INTERVAL_S:
+                    continue
+                last_partial = now
+            elif kind == "result":
+                result = item.get("data")
+            elif kind not in ("progress", "first_token"):
+                continue  # result_chunk previews are not needed by followers
+            queue.add_event(job_id, item)
+    except GenerationCancelled as e:
+        logger.info(f"[JobWorker {worker}] Job {job_id[:8]} cancelled ({e.reason})")
+        queue.mark_cancelled(job_id, worker, e.reason)
+        return
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        delay = queue.fail(job_id, worker, error)
+        if delay is None:
+            logger.error(f"[JobWorker {worker}] Job {job_id[:8]} failed: {error}")
+        else:
+            logger.warning(f"[JobWorker {worker}] Job {job_id[:8]} attempt {job['attempts']} failed, retry in {delay:.0f}s: {error}")
+            queue.add_event(job_id, {"type": "retry", "attempt": job["attempts"], "delay_s": delay, "error": error})
+        return
+    finally:
+        stream.close()
+
+    if result is None:
+        queue.fail(job_id, worker, "No job body generated")
+    else:
+        queue.complete(job_id, worker, result)
+
+
+def _claim_loop(worker: str, stop: threading.Event) -> None:
+    from config import JOB_QUEUE_POLL_S
+    from database.job_queue import get_job_queue
+
+    queue = get_job_queue()
+    while not stop.is_set():
+        try:
+            job = queue.claim(worker)
+        except Exception as e:
+            logger.warning(f"[JobWorker {worker}] Claim failed: {e}")
+            job = None
+        if job is None:
+            stop.wait(JOB_QUEUE_POLL_S)
+            continue
+        try:
+            _execute(job, worker)
+        except Exception as e:  # never let one job take the worker thread down
+            logger.error(f"[JobWorker {worker}] Unexpected error on job {job['id'][:8]}: {e}", exc_info=True)
+
+
+def run_worker(stop, jobs_per_worker: int = 1) -> None:
+    """Worker process entry point: claim and run jobs until *stop* is set."""
+    from logging_config import setup_logging
+    setup_logging()
+
+    from config import JOB_QUEUE_RETENTION_S
+    from database.job_queue import get_job_queue
+    from services.startup import ensure_graph_runtime
+
+    ensure_graph_runtime()
+    prefix = f"{os.getpid()}-{uuid.uuid4().hex[:4]}"
+    local_stop = threading.Event()
+    threads = [
+        threading.Thread(target=_claim_loop, args=(f"{prefix}/{i}", local_stop), name=f"job-worker-{i}", daemon=True)
+        for i in range(max(1, jobs_per_worker))
+    ]
+    for thread in threads:
+        thread.start()
+    logger.info(f"[JobWorker {prefix}] Started with {len(threads)} job slot(s)")
+
+    last_purge = 0.0
+    while not stop.wait(1.0):
+        if time.monotonic() - last_purge > _PURGE_EVERY_S:
+            last_purge = time.monotonic()
+            try:
+                removed = get_job_queue().purge(JOB_QUEUE_RETENTION_S)
+                if removed:
+                    logger.info(f"[JobWorker {prefix}] Purged {removed} finished job(s)")
+            except Exception as e:
+                logger.warning(f"[JobWorker {prefix}] Purge failed: {e}")
+    local_stop.set()
+    for thread in threads:
+        thread.join()
+
+
+class JobWorkerPool:
+    """A set of worker processes (spawned, so no loop or connection is inherited)."""
+
+    def __init__(self, workers: int = 2, jobs_per_worker: int = 1):
+        self.workers = max(1, workers)
+        self.jobs_per_worker = max(1, jobs_per_worker)
+        self._ctx = multiprocessing.get_context("spawn")
+        self._stop = self._ctx.Event()
+        self._processes: List[multiprocessing.Process] = []
+
+    def start(self) -> "JobWorkerPool":
+        for i in range(self.workers):
+            process = self._ctx.Process(
+                target=run_worker, args=(self._stop, self.jobs_per_worker), name=f"jd-job-worker-{i}", daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+        logger.info(f"[JobWorkerPool] {self.workers} worker process(es) x {self.jobs_per_worker} job slot(s)")
+        return self
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Let running jobs finish (up to *timeout*), then terminate stragglers."""
+        self._stop.set()
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+        self._processes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "alive": sum(1 for p in self._processes if p.is_alive()),
+            "jobs_per_worker": self.jobs_per_worker,
+        }
+
+
+def main() -> None:
+    from config import JOB_QUEUE_WORKERS, JOB_QUEUE_JOBS_PER_WORKER
+
+    parser = argparse.ArgumentParser(description="Run generation job workers against the shared queue.")
+    parser.add_argument("--workers", type=int, default=max(1, JOB_QUEUE_WORKERS), help="Worker processes")
+    parser.add_argument("--jobs-per-worker", type=int, default=JOB_QUEUE_JOBS_PER_WORKER,
+                        help="Concurrent jobs per worker process")
+    args = parser.parse_args()
+
+    pool = JobWorkerPool(args.workers, args.jobs_per_worker).start()
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
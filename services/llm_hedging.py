@@ -0,0 +1,269 @@
+"""
+Hedged LLM requests for writer and style calls.
+
+OpenRouter latency has a long tail: one slow provider stalls a whole
+generation.  ``Hedger.call`` starts the request and, if it has not returned
+by the rolling p90 latency measured locally for that call site, fires one
+duplicate.  The first good result wins and the loser is cancelled.
+
+A global budget caps duplicates to a fraction of primary calls (default 10%)
+so hedging cannot multiply spend during a provider-wide slowdown.
+
+Usage:
+    from services.llm_hedging import get_hedger
+
+    payload = await get_hedger().call(
+        ("writer", MODEL_BASE),
+        lambda: writer_model.ainvoke(prompt),
+        is_good=lambda jb: bool(jb and jb.job_description),
+    )
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Optional, TypeVar
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+def _percentile(samples, pct: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+class Hedger:
+    """Rolling per-key latency tracker + hedge budget (thread-safe, loop-agnostic)."""
+
+    def __init__(
+        self,
+        *,
+        budget_ratio: float = 0.10,
+        window: int = 200,
+        min_samples: int = 20,
+        hedge_percentile: float = 90.0,
+        min_delay_s: float = 1.0,
+    ):
+        self.budget_ratio = max(0.0, budget_ratio)
+        self.window = max(1, window)
+        self.min_samples = max(1, min_samples)
+        self.hedge_percentile = hedge_percentile
+        self.min_delay_s = min_delay_s
+
+        self._lock = threading.Lock()
+        # Latency of individual attempts (used for the hedge delay).  A loser
+        # cancelled by the winner adds its elapsed time as a lower bound, so
+        # slow attempts are not dropped from the p90 the moment hedging works.
+        self._attempt_latency: Dict[Hashable, Deque[float]] = {}
+        # End-to-end latency as seen by callers (hedged or not), for metrics
+        self._call_latency: Dict[Hashable, Deque[float]] = {}
+        # Calls that fired a duplicate, per key (hedges_fired is the total)
+        self._hedged_calls: Dict[Hashable, int] = {}
+        self._primary_calls = 0
+        self._hedges_fired = 0
+        self._hedge_wins = 0
+        self._budget_denied = 0
+
+    # ------------------------------------------------------------------
+    # Bookkeeping
+    # ------------------------------------------------------------------
+
+    def _record(self, table: Dict[Hashable, Deque[float]], key: Hashable, seconds: float) -> None:
+        with self._lock:
+            samples = table.get(key)
+            if samples is None:
+                samples = table[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def hedge_delay(self, key: Hashable) -> Optional[float]:
+        """Seconds to wait before hedging *key*, or None until enough samples exist."""
+        with self._lock:
+            samples = list(self._attempt_latency.get(key, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return max(self.min_delay_s, _percentile(samples, self.hedge_percentile))
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            # +1 so the very first slow call after warm-up can hedge
+            if self._hedges_fired + 1 > self.budget_ratio * self._primary_calls + 1:
+                self._budget_denied += 1
+                return False
+            self._hedges_fired += 1
+            return True
+
+    # ------------------------------------------------------------------
+    # Call
+    # ------------------------------------------------------------------
+
+    async def call(
+        self,
+        key: Hashable,
+        make_call: Callable[[], Awaitable[T]],
+        *,
+        is_good: Optional[Callable[[T], bool]] = None,
+    ) -> T:
+        """
+        Run ``make_call()`` with at most one speculative duplicate.
+
+        *make_call* must create a new request each time it is called.  A result
+        for which *is_good* returns False counts as a failure (the other
+        attempt, if any, is awaited).  If every attempt fails, the primary's
+        error (or last bad result) is surfaced.
+        """
+        with self._lock:
+            self._primary_calls += 1
+        started = time.perf_counter()
+
+        async def attempt(index: int):
+            t0 = time.perf_counter()
+            result = await make_call()
+            return index, result, time.perf_counter() - t0
+
+        attempt_started: Dict[asyncio.Future, float] = {}
+
+        def launch(index: int) -> asyncio.Future:
+            task = asyncio.ensure_future(attempt(index))
+            attempt_started[task] = time.perf_counter()
+            return task
+
+        primary = launch(0)
+        pending = {primary}
+        won = False
+        delay = self.hedge_delay(key)
+        hedged = False
+        first_error: Optional[BaseException] = None
+        bad_result: Any = None
+        has_bad_result = False
+
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done and self._take_budget():
+                    hedged = True
+                    logger.debug(f"[Hedge] {key}: no reply after {delay:.2f}s, firing duplicate")
+                    pending.add(launch(1))
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        index, result, seconds = task.result()
+                    except Exception as e:
+                        if first_error is None:
+                            first_error = e
+                        continue
+                    self._record(self._attempt_latency, key, seconds)
+                    if is_good is not None and not is_good(result):
+                        bad_result, has_bad_result = result, True
+                        continue
+                    if index == 1:
+                        with self._lock:
+                            self._hedge_wins += 1
+                    won = True
+                    self._record(self._call_latency, key, time.perf_counter() - started)
+                    return result
+        finally:
+            if hedged:
+                with self._lock:
+                    self._hedged_calls[key] = self._hedged_calls.get(key, 0) + 1
+            now = time.perf_counter()
+            for task in pending:
+                if won:
+                    self._record(self._attempt_latency, key, now - attempt_started[task])
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        self._record(self._call_latency, key, time.perf_counter() - started)
+        if has_bad_result:
+            return bad_result
+        if first_error is not None:
+            raise first_error
+        raise RuntimeError(f"Hedged call {key} produced no result")  # pragma: no cover
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Hedge counters plus per-key hedged calls and end-to-end p50/p90/p99 (seconds)."""
+        with self._lock:
+            per_key = {
+                str(key): {
+                    "n": len(samples),
+                    "hedged": self._hedged_calls.get(key, 0),
+                    "p50_s": _percentile(samples, 50),
+                    "p90_s": _percentile(samples, 90),
+                    "p99_s": _percentile(samples, 99),
+                }
+                for key, samples in self._call_latency.items()
+            }
+            return {
+                "primary_calls": self._primary_calls,
+                "hedges_fired": self._hedges_fired,
+                "hedge_wins": self._hedge_wins,
+                "budget_denied": self._budget_denied,
+                "hedge_ratio": round(self._hedges_fired / self._primary_calls, 4) if self._primary_calls else 0.0,
+                "latency": per_key,
+            }
+
+
+# ---------------------------------------------------------------------------
+# Module-level singleton
+# ---------------------------------------------------------------------------
+
+_hedger: Optional[Hedger] = None
+_hedger_lock = threading.Lock()
+
+
+def get_hedger() -> Hedger:
+    """Return the process-wide Hedger configured from config.py."""
+    global _hedger
+    if _hedger is None:
+        with _hedger_lock:
+            if _hedger is None:
+                from config import (
+                    LLM_HEDGE_BUDGET_RATIO,
+                    LLM_HEDGE_PERCENTILE,
+                    LLM_HEDGE_MIN_SAMPLES,
+                    LLM_HEDGE_MIN_DELAY_S,
+                )
+                _hedger = Hedger(
+                    budget_ratio=LLM_HEDGE_BUDGET_RATIO,
+                    hedge_percentile=LLM_HEDGE_PERCENTILE,
+                    min_samples=LLM_HEDGE_MIN_SAMPLES,
+                    min_delay_s=LLM_HEDGE_MIN_DELAY_S,
+                )
+    return _hedger
+
+
+async def hedged_ainvoke(key: Hashable, runnable, prompt, *, is_good=None):
+    """
+    ``runnable.ainvoke(prompt)`` through the shared hedger (or directly if disabled).
+
+    Each attempt (including a hedge duplicate) takes its own slot from the
+    concurrency governor, keyed on the model in ``key = (site, model)``.
+    """
+    from config import LLM_HEDGING_ENABLED
+    from services.concurrency import governed
+
+    model = key[-1] if isinstance(key, tuple) else str(key)
+    site = str(key[0]) if isinstance(key, tuple) else "default"
+
+    def make_call():
+        return governed(model, lambda: runnable.ainvoke(prompt), site=site)
+
+    if not LLM_HEDGING_ENABLED:
+        return await make_call()
+    return await get_hedger().call(key, make_call, is_good=is_good)
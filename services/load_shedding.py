@@ -0,0 +1,171 @@
+"""
+Load shedding for graph generations under queue pressure.
+
+When many recruiters hit Generate at once, every run still costs several
+writer calls, the judge, an optional style pass and a re-score, and p95
+latency collapses.  ``LoadShedder.admit()`` is called once per graph run.
+It looks at the generations in flight (this one included) and the requests
+queued at the concurrency governor, and picks a degradation tier:
+
+  tier  name       candidates  refinement  re-score  judge
+  0     full       as asked    yes         yes       RULER
+  1     reduced    <= 2        yes         no        RULER
+  2     lean       <= 2        no          no        RULER
+  3     prescore   <= 2        no          no        local pre-score
+
+The load is ``max(in_flight / LOAD_SHED_INFLIGHT, queued / LOAD_SHED_QUEUE)``.
+Its integer part is the tier (capped at 3), so tier 1 starts at the soft
+limits and every further multiple steps down once more.
+
+In a job worker process (services/job_workers.py) this process alone never
+sees enough load to shed: it runs at most ``JOB_QUEUE_JOBS_PER_WORKER``
+jobs, and the backlog waits in the shared queue.  There, ``in_flight`` is
+the number of running jobs across all workers, and the queued jobs add a
+third term, ``queued_jobs / LOAD_SHED_JOB_QUEUE``.  The decision is
+stored in the graph state (``load_shed``) and in ``ruler_run``.
+
+Usage:
+    from services.load_shedding import get_load_shedder
+
+    shed = await get_load_shedder().aadmit()  # or .admit() from sync code
+    try:
+        ...  # run the graph with state["load_shed"] = shed
+    finally:
+        get_load_shedder().release()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+TIERS: List[Dict[str, Any]] = [
+    {"tier": 0, "name": "full", "max_candidates": None, "refine": True, "rescore": True, "judge": True},
+    {"tier": 1, "name": "reduced", "max_candidates": 2, "refine": True, "rescore": False, "judge": True},
+    {"tier": 2, "name": "lean", "max_candidates": 2, "refine": False, "rescore": False, "judge": True},
+    {"tier": 3, "name": "prescore", "max_candidates": 2, "refine": False, "rescore": False, "judge": False},
+]
+
+
+def _job_queue_load() -> Tuple[int, int]:
+    """(running, queued) jobs in the shared job queue; (0, 0) unless this process uses it."""
+    module = sys.modules.get("database.job_queue")
+    queue = getattr(module, "_job_queue", None) if module is not None else None
+    if queue is None:
+        return 0, 0
+    try:
+        jobs = queue.stats()["jobs"]
+    except Exception as e:
+        logger.warning(f"Load shedding: job queue stats unavailable: {e}")
+        return 0, 0
+    return jobs.get("running", 0), jobs.get("queued", 0)
+
+
+def _queued_llm_calls() -> int:
+    """Requests waiting for a governor slot (0 until the governor exists)."""
+    module = sys.modules.get("services.concurrency")
+    governor = getattr(module, "_governor", None) if module is not None else None
+    if governor is None:
+        return 0
+    return sum(s["queued"] for s in governor.stats().values())
+
+
+class LoadShedder:
+    """Counts in-flight generations and maps load to a degradation tier (thread-safe)."""
+
+    def __init__(
+        self,
+        *,
+        inflight_soft: int = 6,
+        queue_soft: int = 16,
+        job_queue_soft: int = 8,
+        enabled: bool = True,
+    ):
+        self.inflight_soft = max(1, inflight_soft)
+        self.queue_soft = max(1, queue_soft)
+        self.job_queue_soft = max(1, job_queue_soft)
+        self.enabled = enabled
+        self._in_flight = 0
+        self._peak = 0
+        self._tiers: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def admit(self) -> Dict[str, Any]:
+        """Register one generation and return its tier (plus the load that chose it)."""
+        return self._admit(_job_queue_load())
+
+    async def aadmit(self) -> Dict[str, Any]:
+        """:meth:`admit` for coroutines: the job-queue read (SQLite) runs off the event loop."""
+        return self._admit(await asyncio.to_thread(_job_queue_load))
+
+    def _admit(self, job_queue_load: Tuple[int, int]) -> Dict[str, Any]:
+        queued = _queued_llm_calls()
+        running_jobs, queued_jobs = job_queue_load
+        with self._lock:
+            self._in_flight += 1
+            self._peak = max(self._peak, self._in_flight)
+            # A running job is in flight here too; the max avoids counting it twice
+            in_flight = max(self._in_flight, running_jobs)
+            load = max(
+                in_flight / self.inflight_soft,
+                queued / self.queue_soft,
+                queued_jobs / self.job_queue_soft,
+            )
+            level = min(len(TIERS) - 1, int(load)) if self.enabled else 0
+            self._tiers[TIERS[level]["name"]] += 1
+        if level:
+            logger.info(
+                f"Load shedding: tier {level} ({TIERS[level]['name']}), "
+                f"in_flight={in_flight} queued={queued} queued_jobs={queued_jobs}"
+            )
+        return {
+            **TIERS[level],
+            "in_flight": in_flight,
+            "queued": queued,
+            "queued_jobs": queued_jobs,
+            "load": round(load, 2),
+        }
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "peak_in_flight": self._peak,
+                "tiers": {t["name"]: self._tiers[t["name"]] for t in TIERS},
+            }
+
+
+_shedder: Optional[LoadShedder] = None
+_shedder_lock = threading.Lock()
+
+
+def get_load_shedder() -> LoadShedder:
+    """Return the process-wide load shedder configured from config.py."""
+    global _shedder
+    if _shedder is None:
+        with _shedder_lock:
+            if _shedder is None:
+                from config import (
+                    LOAD_SHEDDING_ENABLED,
+                    LOAD_SHED_INFLIGHT,
+                    LOAD_SHED_QUEUE,
+                    LOAD_SHED_JOB_QUEUE,
+                )
+                _shedder = LoadShedder(
+                    inflight_soft=LOAD_SHED_INFLIGHT,
+                    queue_soft=LOAD_SHED_QUEUE,
+                    job_queue_soft=LOAD_SHED_JOB_QUEUE,
+                    enabled=LOAD_SHEDDING_ENABLED,
+                )
+    return _shedder
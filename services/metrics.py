@@ -0,0 +1,421 @@
+"""
+In-process metrics registry with a Prometheus text-exposition endpoint.
+
+Counters and histograms are recorded at the choke points of the service:
+
+  jd_generations_total{outcome}             ok / cache_hit / error
+  jd_generation_duration_seconds            request → final result
+  jd_node_duration_seconds{node}            per graph node (services/timing.py)
+  jd_llm_calls_total{model,outcome}         ok / rate_limited / timeout / error / cancelled
+  jd_llm_call_duration_seconds{model}       excludes governor queue wait
+  jd_ruler_judgements_total{outcome}        ok / memo / fallback (score_group_with_fallback → None)
+  jd_vector_search_duration_seconds{store}  VectorStoreManager.search_company_content
+  jd_db_query_duration_seconds{operation}   ORM database (SQLAlchemy cursor events)
+
+On every scrape the existing ``stats()`` functions (governor, hedger, LLM
+HTTP pool, result / LLM response caches, singleflight, graph runtime,
+memory sync) are exported as gauges and counters, but only for components
+the process has already started, so scraping never creates singletons.
+
+``start_metrics_server()`` serves ``/metrics`` on a side port from a daemon
+thread; it is idempotent and works the same in the Streamlit process and in
+batch entry points (``evals/run_eval.py``).  Recording is cheap enough to
+stay on when the endpoint is disabled.
+
+Usage:
+    from services.metrics import get_metrics_registry, start_metrics_server
+
+    start_metrics_server(port=9464)
+    get_metrics_registry().render()   # Prometheus text format
+"""
+
+from __future__ import annotations
+
+import bisect
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds; generations take tens of seconds, nodes / LLM calls up to a minute
+GENERATION_BUCKETS = (1, 2.5, 5, 10, 15, 20, 30, 45, 60, 90, 120, 180)
+CALL_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+QUERY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+Labels = Tuple[str, ...]
+# (name, type, help, [(labels dict, value)]) as produced by collectors
+Sample = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[Any], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Labelled metric family (thread-safe)."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Labels:
+        return tuple(str(labels.get(n, "")) for n in self.label_names)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(v)}" for key, v in items
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = CALL_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [bucket counts..., +Inf count], sum
+        self._values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][idx] += 1
+            entry[1][0] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        lines = self.header()
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named counters / histograms plus pull collectors, rendered as Prometheus text."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, help_text: str, labels: Sequence[str], **kwargs) -> Any:
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name, help_text, labels, **kwargs)
+        if not isinstance(metric, cls):
+            raise ValueError(f"metric {name!r} already registered as {metric.kind}")
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help_text, labels)
+
+    def histogram(
+        self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = CALL_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, labels, buckets=buckets)
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        """Register a callable that yields samples on every scrape."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+            collectors = list(self._collectors)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                for name, kind, help_text, samples in collector():
+                    lines.append(f"# HELP {name} {help_text}")
+                    lines.append(f"# TYPE {name} {kind}")
+                    for labels, value in samples:
+                        lines.append(
+                            f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}"
+                        )
+            except Exception as e:
+                logger.warning(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+        return "\n".join(lines) + "\n"
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Return the process-wide metrics registry (with the component-stats collector)."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                registry = MetricsRegistry()
+                registry.add_collector(_component_stats)
+                _registry = registry
+    return _registry
+
+
+# ---------------------------------------------------------------------------
+# Recording helpers (one per instrumented call site)
+# ---------------------------------------------------------------------------
+
+def observe_generation(outcome: str, seconds: float) -> None:
+    registry = get_metrics_registry()
+    registry.counter("jd_generations_total", "Finished generation requests.", ("outcome",)).inc(outcome=outcome)
+    if outcome not in ("error", "cancelled"):
+        registry.histogram(
+            "jd_generation_duration_seconds", "Generation request to final result.", buckets=GENERATION_BUCKETS
+        ).observe(seconds)
+
+
+def observe_node(node: str, seconds: float) -> None:
+    get_metrics_registry().histogram(
+        "jd_node_duration_seconds", "Graph node wall time.", ("node",)
+    ).observe(seconds, node=node)
+
+
+def observe_llm_call(model: str, outcome: str, seconds: float) -> None:
+    registry = get_metrics_registry()
+    registry.counter("jd_llm_calls_total", "LLM calls by model and outcome.", ("model", "outcome")).inc(
+        model=model, outcome=outcome
+    )
+    if outcome == "ok":
+        registry.histogram(
+            "jd_llm_call_duration_seconds", "Successful LLM call latency (excl. queue wait).", ("model",)
+        ).observe(seconds, model=model)
+
+
+def observe_ruler_judgement(outcome: str) -> None:
+    get_metrics_registry().counter(
+        "jd_ruler_judgements_total", "RULER group judgements (fallback = scoring failed).", ("outcome",)
+    ).inc(outcome=outcome)
+
+
+def observe_vector_search(store: str, seconds: float) -> None:
+    get_metrics_registry().histogram(
+        "jd_vector_search_duration_seconds", "Vector store similarity search.", ("store",), buckets=QUERY_BUCKETS
+    ).observe(seconds, store=store)
+
+
+def observe_db_query(operation: str, seconds: float) -> None:
+    get_metrics_registry().histogram(
+        "jd_db_query_duration_seconds", "ORM database statement time.", ("operation",), buckets=QUERY_BUCKETS
+    ).observe(seconds, operation=operation)
+
+
+# ---------------------------------------------------------------------------
+# Component stats (pulled on scrape)
+# ---------------------------------------------------------------------------
+
+def _started(module: str, attr: str) -> Any:
+    """The module-level singleton *attr* of *module*, if both already exist."""
+    mod = sys.modules.get(module)
+    return getattr(mod, attr, None) if mod is not None else None
+
+
+def _component_stats() -> Iterable[Sample]:
+    governor = _started("services.concurrency", "_governor")
+    if governor is not None:
+        stats = governor.stats()
+        yield ("jd_llm_concurrency_limit", "gauge", "Adaptive concurrency limit per model.",
+               [({"model": m}, s["limit"]) for m, s in stats.items()])
+        yield ("jd_llm_in_flight", "gauge", "LLM calls holding a governor slot.",
+               [({"model": m}, s["in_flight"]) for m, s in stats.items()])
+        yield ("jd_llm_queued", "gauge", "LLM calls waiting for a governor slot.",
+               [({"model": m}, s["queued"]) for m, s in stats.items()])
+        yield ("jd_llm_queue_wait_avg_ms", "gauge", "Average governor queue wait.",
+               [({"model": m}, s["avg_wait_ms"]) for m, s in stats.items()])
+
+    hedger = _started("services.llm_hedging", "_hedger")
+    if hedger is not None:
+        stats = hedger.stats()
+        yield ("jd_llm_hedges_fired_total", "counter", "Hedge duplicates fired.", [({}, stats["hedges_fired"])])
+        yield ("jd_llm_hedge_wins_total", "counter", "Hedge duplicates that won.", [({}, stats["hedge_wins"])])
+        yield ("jd_llm_hedged_primary_calls_total", "counter", "Primary calls through the hedger.",
+               [({}, stats["primary_calls"])])
+        yield ("jd_llm_hedged_calls_total", "counter", "Calls that fired a hedge duplicate, per call site.",
+               [({"site": site}, s["hedged"]) for site, s in stats["latency"].items()])
+
+    llm_service = sys.modules.get("llm_service")
+    if llm_service is not None:
+        stats = llm_service.llm_pool_stats()
+        yield ("jd_llm_http_in_flight", "gauge", "Requests on the shared LLM HTTP pool.", [({}, stats["in_flight"])])
+        yield ("jd_llm_http_saturated_total", "counter", "Requests that found the HTTP pool full.",
+               [({}, stats["saturated_requests"])])
+
+    caches = []
+    result_cache = _started("database.result_cache", "_result_cache")
+    if result_cache is not None:
+        stats = result_cache.stats()
+        caches.append(("result", stats["hits"], stats["misses"], stats["entries"]))
+    llm_cache = _started("database.llm_cache", "_llm_cache")
+    if llm_cache is not None:
+        stats = llm_cache.stats()
+        caches.append(("llm", stats["hits"], stats["misses"], stats["entries"]))
+        yield ("jd_llm_cache_site_hits_total", "counter", "LLM response cache hits per call site.",
+               [({"site": site}, c["hits"]) for site, c in stats["sites"].items()])
+        yield ("jd_llm_cache_site_misses_total", "counter", "LLM response cache misses per call site.",
+               [({"site": site}, c["misses"]) for site, c in stats["sites"].items()])
+    judge_memo = _started("ruler.ruler_utils", "_judge_memo")
+    if judge_memo is not None:
+        stats = judge_memo.stats()
+        caches.append(("judge_memo", stats["hits"], stats["misses"], stats["entries"]))
+    if caches:
+        yield ("jd_cache_hits_total", "counter", "Cache hits.", [({"cache": c}, h) for c, h, _, _ in caches])
+        yield ("jd_cache_misses_total", "counter", "Cache misses.", [({"cache": c}, m) for c, _, m, _ in caches])
+        yield ("jd_cache_entries", "gauge", "Cache entries.", [({"cache": c}, e) for c, _, _, e in caches])
+
+    shedder = _started("services.load_shedding", "_shedder")
+    if shedder is not None:
+        stats = shedder.stats()
+        yield ("jd_generations_in_flight", "gauge", "Graph runs in flight (load-shedding input).",
+               [({}, stats["in_flight"])])
+        yield ("jd_load_shed_total", "counter", "Graph runs admitted per load-shedding tier.",
+               [({"tier": t}, c) for t, c in stats["tiers"].items()])
+
+    policy = _started("services.candidate_policy", "_policy")
+    if policy is not None:
+        stats = policy.stats()
+        yield ("jd_candidate_policy_decisions_total", "counter", "Candidate-count decisions by reason.",
+               [({"reason": r}, c) for r, c in stats["decisions"].items()])
+        yield ("jd_candidate_policy_calls_saved", "gauge", "Net calls saved vs. the default candidate count.",
+               [({"call": "writer"}, stats["writer_calls_saved"]), ({"call": "judge"}, stats["judge_calls_saved"])])
+
+    job_queue = _started("database.job_queue", "_job_queue")
+    if job_queue is not None:
+        stats = job_queue.stats()
+        yield ("jd_job_queue_jobs", "gauge", "Generation jobs in the durable queue by status.",
+               [({"status": s}, c) for s, c in stats["jobs"].items()])
+
+    background_loop = _started("services.event_loop", "_background_loop")
+    if background_loop is not None:
+        stats = background_loop.stats()
+        yield ("jd_event_loop_submitted_total", "counter", "Coroutines submitted to the shared background loop.",
+               [({}, stats["submitted"])])
+        yield ("jd_event_loop_active", "gauge", "Submitted coroutines still running on the background loop.",
+               [({}, stats["active"])])
+
+    graph_service = sys.modules.get("services.graph_service")
+    if graph_service is not None:
+        stats = graph_service.get_singleflight_stats()
+        yield ("jd_singleflight_total", "counter", "Generations that ran (leader) or attached (follower).",
+               [({"role": "leader"}, stats["leaders"]), ({"role": "follower"}, stats["followers"])])
+        yield ("jd_singleflight_in_flight", "gauge", "Distinct generations in flight.", [({}, stats["in_flight"])])
+
+    runtime = _started("graph.runtime", "_graph_runtime")
+    if runtime is not None:
+        stats = runtime.stats()
+        yield ("jd_checkpointer_borrows_total", "counter", "Checkpointer pool borrows.", [({}, stats["borrows"])])
+        yield ("jd_checkpointer_wait_avg_ms", "gauge", "Average checkpointer pool wait.", [({}, stats["avg_wait_ms"])])
+        yield ("jd_checkpointer_idle_slots", "gauge", "Idle checkpointer connections.", [({}, stats["idle_slots"])])
+        sync = runtime._memory_sync  # not created until the first request
+        if sync is not None:
+            yield ("jd_memory_sync_rows_total", "counter", "ORM rows applied to the graph store.",
+                   [({}, sync.stats()["rows_applied"])])
+
+
+# ---------------------------------------------------------------------------
+# Exposition endpoint
+# ---------------------------------------------------------------------------
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = get_metrics_registry().render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002 - silence per-scrape access logs
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(host: Optional[str] = None, port: Optional[int] = None) -> Optional[ThreadingHTTPServer]:
+    """
+    Serve ``/metrics`` on a daemon thread (once per process).
+
+    Defaults come from METRICS_HOST / METRICS_PORT.  Returns the server, or
+    None if the port is taken (e.g. a second worker on the same host).
+    """
+    global _server
+    if _server is not None:
+        return _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+        from config import METRICS_HOST, METRICS_PORT
+
+        host = METRICS_HOST if host is None else host
+        port = METRICS_PORT if port is None else port
+        try:
+            server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            logger.warning(f"Metrics endpoint not started on {host}:{port}: {e}")
+            return None
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        _server = server
+        logger.info(f"Metrics endpoint on http://{host}:{server.server_address[1]}/metrics")
+        return _server
@@ -91,36 +91,7 @@ def scrape_urls_sync(urls: List[str]) -> Dict[str, str]:
     """
     Synchronous wrapper for scraping URLs.
     Use this when you can't use async context.
+    Runs on the shared background loop (services/event_loop.py).
     """
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If loop is already running, create new event loop in thread
-            import concurrent.futures
-            import threading
-            
-            result = None
-            exception = None
-            
-            def run_in_thread():
-                nonlocal result, exception
-                try:
-                    new_loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(new_loop)
-                    result = new_loop.run_until_complete(scrape_urls(urls))
-                    new_loop.close()
-                except Exception as e:
-                    exception = e
-            
-            thread = threading.Thread(target=run_in_thread)
-            thread.start()
-            thread.join()
-            
-            if exception:
-                raise exception
-            return result or {}
-        else:
-            return loop.run_until_complete(scrape_urls(urls))
-    except RuntimeError:
-        # No event loop, create one
-        return asyncio.run(scrape_urls(urls))
+    from services.event_loop import get_background_loop
+    return get_background_loop().run(scrape_urls(urls)) or {}
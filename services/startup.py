@@ -17,6 +17,12 @@ Usage:
 
     # Get the cached VectorStoreManager singleton
     vs = get_vector_store_manager()
+
+    # Compile the graph + warm the checkpointer pool (idempotent)
+    ensure_graph_runtime()
+
+    # Start generation worker processes for the durable job queue (JOB_QUEUE_ENABLED)
+    ensure_job_workers()
 """
 
 from __future__ import annotations
@@ -39,6 +45,8 @@ DUTY_CHUNKS_PATH: str = _DUTY_CFG or os.getenv("DUTY_CHUNKS_PATH", "duty_chunks.
 
 # Module-level singleton
 _style_vector_store: Optional[object] = None
+_graph_runtime_started: bool = False
+_job_worker_pool: Optional[object] = None
 
 
 # ---------------------------------------------------------------------------
@@ -147,6 +155,93 @@ def get_vector_store_manager():
 get_style_vector_store = get_vector_store_manager
 
 
+def _shutdown_background_loop() -> None:
+    """atexit: release loop-bound resources, then stop the shared loop."""
+    from graph.runtime import shutdown_graph_runtime
+    from llm_service import aclose_llm_clients
+    from services.event_loop import get_background_loop
+
+    loop = get_background_loop()
+    for close in (shutdown_graph_runtime, aclose_llm_clients):
+        try:
+            loop.run(close(), timeout=10)
+        except Exception as e:
+            logger.warning(f"[Startup] {close.__name__} failed during shutdown: {e}")
+    loop.stop()
+
+
+def ensure_graph_runtime() -> bool:
+    """
+    Compile the blackboard graph and warm the checkpointer pool once per process.
+
+    Idempotent — Streamlit re-executes app.py on every rerun, so repeat calls
+    return immediately.  The runtime is started on the shared background loop
+    (services/event_loop.py) that later runs the generations, and an atexit
+    hook closes the pooled connections and LLM clients there, then stops it.
+
+    Returns True if the runtime is ready, False on failure (requests will
+    then start it lazily on first use).
+    """
+    global _graph_runtime_started
+
+    if _graph_runtime_started:
+        return True
+
+    try:
+        import atexit
+        from graph.runtime import startup_graph_runtime
+        from services.event_loop import get_background_loop
+
+        runtime = get_background_loop().run(startup_graph_runtime())
+        atexit.register(_shutdown_background_loop)
+        _graph_runtime_started = True
+        logger.info(f"[Startup] Graph runtime ready: {runtime.stats()}")
+        return True
+    except Exception as e:
+        logger.warning(f"[Startup] Could not start graph runtime (will start lazily): {e}")
+        return False
+
+
+def ensure_metrics_server() -> bool:
+    """
+    Start the Prometheus metrics endpoint if METRICS_ENABLED (once per process).
+
+    Safe to call from every entry point (Streamlit reruns, eval CLI, workers).
+    Returns True if the endpoint is serving.
+    """
+    from config import METRICS_ENABLED
+
+    if not METRICS_ENABLED:
+        return False
+    from services.metrics import start_metrics_server
+
+    return start_metrics_server() is not None
+
+
+def ensure_job_workers() -> bool:
+    """
+    Start JOB_QUEUE_WORKERS generation worker processes if JOB_QUEUE_ENABLED (once per process).
+
+    Workers are stopped at exit; running jobs get a grace period to finish,
+    and anything cut off is re-claimed from the queue after its lease expires.
+    Returns True if workers were started by this process.
+    """
+    global _job_worker_pool
+    from config import JOB_QUEUE_ENABLED, JOB_QUEUE_WORKERS, JOB_QUEUE_JOBS_PER_WORKER
+
+    if not JOB_QUEUE_ENABLED or JOB_QUEUE_WORKERS <= 0:
+        return False
+    if _job_worker_pool is not None:
+        return True
+
+    import atexit
+    from services.job_workers import JobWorkerPool
+
+    _job_worker_pool = JobWorkerPool(JOB_QUEUE_WORKERS, JOB_QUEUE_JOBS_PER_WORKER).start()
+    atexit.register(_job_worker_pool.stop)
+    return True
+
+
 # ---------------------------------------------------------------------------
 # Internal helpers
 # ---------------------------------------------------------------------------
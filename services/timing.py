@@ -0,0 +1,369 @@
+"""
+Per-node timing and LLM-call instrumentation for the blackboard graph.
+
+``timed_node(name, fn)`` wraps a graph node.  While it runs, a per-node
+collector lives in a context var; LLM calls made inside the node are picked
+up by a LangChain callback (registered once through a configure hook), and
+the governor / response cache / judge report queue wait, cache hits and
+retries into the same collector.  When the node returns, its summary is
+added to the node's state update under ``timings`` and folded into the
+process-wide :class:`TimingRegistry`.
+
+Per node the summary holds wall time, queue wait, LLM calls / time,
+prompt + completion tokens, cache hits, retries (failed LLM runs, cancelled
+hedges included) and the models used, plus one compact span per LLM call.
+Retries inside the OpenAI client and LiteLLM judge tokens are not visible.
+
+With ``TIMING_ENABLED=false`` nodes are registered unwrapped and the
+``note_*`` hooks reduce to a context-var lookup.
+
+Usage:
+    from services.timing import timed_node, get_timing_registry
+
+    workflow.add_node("generator", timed_node("generator", node_generator_expert))
+    get_timing_registry().stats()
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from logging_config import get_logger
+from services.metrics import observe_node
+
+logger = get_logger(__name__)
+
+# Collector of the node currently executing in this context (None outside nodes)
+_current_node: contextvars.ContextVar = contextvars.ContextVar("timing_node", default=None)
+# LangChain callback attached to every run configured inside a timed node
+_node_handler: contextvars.ContextVar = contextvars.ContextVar("timing_node_handler", default=None)
+
+_handler_cls = None
+_handler_lock = threading.Lock()
+
+
+def _percentile(samples, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+class NodeTimings:
+    """Spans and counters collected while one graph node runs (thread-safe)."""
+
+    def __init__(self, node: str):
+        self.node = node
+        self.started = time.perf_counter()
+        self.wall_ms = 0.0
+        self.queue_ms = 0.0
+        self.cache_hits = 0
+        self.retries = 0
+        self.spans: List[Dict[str, Any]] = []
+        self._open: Dict[Any, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    # -- LLM runs (LangChain callback) ------------------------------------
+
+    def start_llm(self, run_id: Any, model: Optional[str]) -> None:
+        with self._lock:
+            self._open[run_id] = {"model": model or "unknown", "t0": time.perf_counter()}
+
+    def end_llm(self, run_id: Any, prompt_tokens: int = 0, completion_tokens: int = 0, error: Optional[str] = None) -> None:
+        with self._lock:
+            opened = self._open.pop(run_id, None)
+            if opened is None:
+                return
+            span = {
+                "model": opened["model"],
+                "wall_ms": round((time.perf_counter() - opened["t0"]) * 1000, 1),
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+            }
+            if error:
+                span["error"] = error
+                self.retries += 1
+            self.spans.append(span)
+
+    def add_span(self, span: Dict[str, Any]) -> None:
+        with self._lock:
+            if span.get("error"):
+                self.retries += 1
+            self.spans.append(span)
+
+    # -- Hooks from governor / cache ----------------------------------------
+
+    def add_queue_wait(self, wait_s: float) -> None:
+        with self._lock:
+            self.queue_ms += wait_s * 1000
+
+    def add_cache_hit(self) -> None:
+        with self._lock:
+            self.cache_hits += 1
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = list(self.spans)
+            return {
+                "wall_ms": round(self.wall_ms, 1),
+                "queue_ms": round(self.queue_ms, 1),
+                "llm_calls": len(spans),
+                "llm_ms": round(sum(s["wall_ms"] for s in spans), 1),
+                "prompt_tokens": sum(s.get("prompt_tokens", 0) for s in spans),
+                "completion_tokens": sum(s.get("completion_tokens", 0) for s in spans),
+                "cache_hits": self.cache_hits,
+                "retries": self.retries,
+                "models": sorted({s["model"] for s in spans}),
+                "spans": spans,
+            }
+
+
+def _usage_from_response(response) -> tuple:
+    """(prompt, completion) tokens from an LLMResult (usage_metadata, then llm_output)."""
+    prompt = completion = 0
+    for generations in response.generations:
+        for gen in generations:
+            usage = getattr(getattr(gen, "message", None), "usage_metadata", None) or {}
+            prompt += usage.get("input_tokens", 0)
+            completion += usage.get("output_tokens", 0)
+    if not (prompt or completion):
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt = usage.get("prompt_tokens", 0) or 0
+        completion = usage.get("completion_tokens", 0) or 0
+    return prompt, completion
+
+
+def _get_handler_cls():
+    """Build the LangChain callback class and register its configure hook once."""
+    global _handler_cls
+    if _handler_cls is not None:
+        return _handler_cls
+    with _handler_lock:
+        if _handler_cls is not None:
+            return _handler_cls
+
+        from langchain_core.callbacks import BaseCallbackHandler
+        from langchain_core.tracers.context import register_configure_hook
+
+        class NodeTimingHandler(BaseCallbackHandler):
+            """Forwards LLM run start / end / error to a :class:`NodeTimings`."""
+
+            run_inline = True
+
+            def __init__(self, collector: NodeTimings):
+                self.collector = collector
+
+            def _start(self, run_id, kwargs) -> None:
+                params = kwargs.get("invocation_params") or {}
+                model = (
+                    params.get("model")
+                    or params.get("model_name")
+                    or (kwargs.get("metadata") or {}).get("ls_model_name")
+                )
+                self.collector.start_llm(run_id, model)
+
+            def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+                self._start(run_id, kwargs)
+
+            def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+                self._start(run_id, kwargs)
+
+            def on_llm_end(self, response, *, run_id, **kwargs):
+                prompt, completion = _usage_from_response(response)
+                self.collector.end_llm(run_id, prompt, completion)
+
+            def on_llm_error(self, error, *, run_id, **kwargs):
+                self.collector.end_llm(run_id, error=type(error).__name__)
+
+        register_configure_hook(_node_handler, True)
+        _handler_cls = NodeTimingHandler
+        return _handler_cls
+
+
+# ---------------------------------------------------------------------------
+# Hooks for call sites (cheap no-ops outside timed nodes)
+# ---------------------------------------------------------------------------
+
+def note_queue_wait(wait_s: float) -> None:
+    """Attribute concurrency-governor queue wait to the running node."""
+    collector = _current_node.get()
+    if collector is not None:
+        collector.add_queue_wait(wait_s)
+
+
+def note_cache_hit() -> None:
+    """Count an LLM response-cache hit for the running node."""
+    collector = _current_node.get()
+    if collector is not None:
+        collector.add_cache_hit()
+
+
+@contextmanager
+def llm_span(site: str, model: str):
+    """Time a non-LangChain LLM call (e.g. the LiteLLM judge) as one span."""
+    collector = _current_node.get()
+    if collector is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        span = {"site": site, "model": model, "wall_ms": round((time.perf_counter() - t0) * 1000, 1)}
+        if error:
+            span["error"] = error
+        collector.add_span(span)
+
+
+# ---------------------------------------------------------------------------
+# Node wrapper
+# ---------------------------------------------------------------------------
+
+def _enter(node: str):
+    collector = NodeTimings(node)
+    handler = _get_handler_cls()(collector)
+    return collector, _current_node.set(collector), _node_handler.set(handler)
+
+
+def _exit(collector: NodeTimings, tokens, result):
+    _node_handler.reset(tokens[1])
+    _current_node.reset(tokens[0])
+    collector.wall_ms = (time.perf_counter() - collector.started) * 1000
+    summary = collector.summary()
+    get_timing_registry().record(collector.node, summary)
+    observe_node(collector.node, collector.wall_ms / 1000)
+    if isinstance(result, dict):
+        result = {**result, "timings": {collector.node: summary}}
+    return result
+
+
+def timed_node(name: str, fn):
+    """Wrap a (sync or async) graph node so its timings land in state["timings"][name]."""
+    from config import TIMING_ENABLED
+
+    if not TIMING_ENABLED:
+        return fn
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            collector, *tokens = _enter(name)
+            result = None
+            try:
+                result = await fn(*args, **kwargs)
+            finally:
+                result = _exit(collector, tokens, result)
+            return result
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def sync_wrapper(*args, **kwargs):
+        collector, *tokens = _enter(name)
+        result = None
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            result = _exit(collector, tokens, result)
+        return result
+    return sync_wrapper
+
+
+# ---------------------------------------------------------------------------
+# Process-wide registry
+# ---------------------------------------------------------------------------
+
+class TimingRegistry:
+    """Rolling per-node and per-model aggregates of node summaries (thread-safe)."""
+
+    def __init__(self, window: int = 500):
+        self.window = max(1, window)
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+        self._models: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, node: str, summary: Dict[str, Any]) -> None:
+        with self._lock:
+            entry = self._nodes.get(node)
+            if entry is None:
+                entry = self._nodes[node] = {
+                    "count": 0, "total_ms": 0.0, "queue_ms": 0.0, "cache_hits": 0,
+                    "retries": 0, "samples": deque(maxlen=self.window),
+                }
+            entry["count"] += 1
+            entry["total_ms"] += summary["wall_ms"]
+            entry["queue_ms"] += summary["queue_ms"]
+            entry["cache_hits"] += summary["cache_hits"]
+            entry["retries"] += summary["retries"]
+            entry["samples"].append(summary["wall_ms"])
+
+            for span in summary["spans"]:
+                model = self._models.get(span["model"])
+                if model is None:
+                    model = self._models[span["model"]] = {
+                        "calls": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                        "samples": deque(maxlen=self.window),
+                    }
+                model["calls"] += 1
+                model["errors"] += 1 if span.get("error") else 0
+                model["prompt_tokens"] += span.get("prompt_tokens", 0)
+                model["completion_tokens"] += span.get("completion_tokens", 0)
+                model["samples"].append(span["wall_ms"])
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-node count / mean / p50 / p95 / queue wait and per-model call stats."""
+        with self._lock:
+            nodes = {
+                node: {
+                    "count": e["count"],
+                    "mean_ms": round(e["total_ms"] / e["count"], 1),
+                    "p50_ms": round(_percentile(e["samples"], 50), 1),
+                    "p95_ms": round(_percentile(e["samples"], 95), 1),
+                    "avg_queue_ms": round(e["queue_ms"] / e["count"], 1),
+                    "cache_hits": e["cache_hits"],
+                    "retries": e["retries"],
+                }
+                for node, e in self._nodes.items()
+            }
+            models = {
+                name: {
+                    "calls": m["calls"],
+                    "errors": m["errors"],
+                    "prompt_tokens": m["prompt_tokens"],
+                    "completion_tokens": m["completion_tokens"],
+                    "p50_ms": round(_percentile(m["samples"], 50), 1),
+                    "p95_ms": round(_percentile(m["samples"], 95), 1),
+                }
+                for name, m in self._models.items()
+            }
+        return {"nodes": nodes, "models": models}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._nodes.clear()
+            self._models.clear()
+
+
+_registry: Optional[TimingRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_timing_registry() -> TimingRegistry:
+    """Return the process-wide timing registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = TimingRegistry()
+    return _registry
@@ -0,0 +1,95 @@
+"""
+Token-level streaming helpers for the blackboard graph.
+
+The writer and style nodes call ``with_structured_output(JobBody)``, so the
+tokens they stream are fragments of a JSON object (either message content or
+tool-call argument chunks).  ``PartialJobBodyStream`` accumulates the fragments
+of ONE LLM run and parses the incomplete JSON into the same section dict the UI
+already uses (see ``utils.job_body_to_dict``), so drafts can be shown while the
+model is still writing.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Optional
+
+from utils import strip_bullet_prefix
+
+# Re-parse the buffer only after this many new characters (parsing is O(n))
+_PARSE_EVERY_CHARS = 40
+
+_LIST_SECTIONS = ("requirements", "duties", "benefits")
+
+
+def chunk_text_delta(chunk: Any) -> str:
+    """Return the JSON text carried by an ``AIMessageChunk`` (content or tool-call args)."""
+    if chunk is None:
+        return ""
+    tool_chunks = getattr(chunk, "tool_call_chunks", None) or []
+    args = "".join(tc.get("args") or "" for tc in tool_chunks if isinstance(tc, dict))
+    if args:
+        return args
+    content = getattr(chunk, "content", "")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        # Content blocks (e.g. [{"type": "text", "text": "..."}])
+        return "".join(
+            block.get("text", "") for block in content if isinstance(block, dict)
+        )
+    return ""
+
+
+def partial_sections(data: Dict[str, Any]) -> Dict[str, str]:
+    """Map a (possibly incomplete) JobBody dict onto the UI's section keys."""
+    sections: Dict[str, str] = {}
+    description = data.get("job_description")
+    if isinstance(description, str) and description:
+        sections["job_description"] = description
+    for key in _LIST_SECTIONS:
+        items = data.get(key)
+        if isinstance(items, list):
+            lines = [strip_bullet_prefix(i) for i in items if isinstance(i, str) and i.strip()]
+            if lines:
+                sections[key] = "\n".join(lines)
+    summary = data.get("summary")
+    if isinstance(summary, str) and summary:
+        sections["footer"] = summary
+    return sections
+
+
+class PartialJobBodyStream:
+    """Accumulates one LLM run's JSON fragments and yields progressively parsed sections."""
+
+    def __init__(self, run_id: Any, task: Any):
+        self.run_id = run_id
+        self.task = task
+        self.started_at = time.perf_counter()
+        self.chars = 0
+        self._buffer: list[str] = []
+        self._parsed_at = 0
+        self._last: Dict[str, str] = {}
+
+    def feed(self, text: str, *, force: bool = False) -> Optional[Dict[str, str]]:
+        """Add *text*; return the new section dict if it changed since the last call."""
+        if text:
+            self._buffer.append(text)
+            self.chars += len(text)
+        if not force and self.chars - self._parsed_at < _PARSE_EVERY_CHARS:
+            return None
+        self._parsed_at = self.chars
+
+        from langchain_core.utils.json import parse_partial_json
+
+        try:
+            data = parse_partial_json("".join(self._buffer))
+        except Exception:
+            return None
+        if not isinstance(data, dict):
+            return None
+        sections = partial_sections(data)
+        if not sections or sections == self._last:
+            return None
+        self._last = sections
+        return sections
@@ -8,11 +8,13 @@ from config).  Any OpenAI-compatible embedding model available on OpenRouter
 can be used — the model name is set via MODEL_EMBEDDING in config.py.
 """
 import os
+import time
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
 import json
 from logging_config import get_logger
+from services.metrics import observe_vector_search
 
 logger = get_logger(__name__)
 
@@ -20,23 +22,50 @@ logger = get_logger(__name__)
 FAISS_AVAILABLE = False
 CHROMA_AVAILABLE = False
 
+# Both backends embed through OpenAIEmbeddings (see _governed_embeddings_cls)
+try:
+    from langchain_openai import OpenAIEmbeddings
+except ImportError:
+    OpenAIEmbeddings = None
+
 try:
     import faiss
     from langchain_community.vectorstores import FAISS
-    from langchain_openai import OpenAIEmbeddings
-    FAISS_AVAILABLE = True
+    FAISS_AVAILABLE = OpenAIEmbeddings is not None
 except ImportError:
     pass
 
 try:
     import chromadb
     from langchain_community.vectorstores import Chroma
-    from langchain_openai import OpenAIEmbeddings
-    CHROMA_AVAILABLE = True
+    CHROMA_AVAILABLE = OpenAIEmbeddings is not None
 except ImportError:
     pass
 
 
+_GovernedEmbeddings = None
+
+
+def _governed_embeddings_cls():
+    """OpenAIEmbeddings subclass whose calls take a slot from the concurrency governor."""
+    global _GovernedEmbeddings
+    if _GovernedEmbeddings is None:
+        from services.concurrency import governed, governed_sync
+
+        class GovernedOpenAIEmbeddings(OpenAIEmbeddings):
+            # embed_query / aembed_query delegate to these, so they are covered too
+            def embed_documents(self, texts, *args, **kwargs):
+                parent = super()
+                return governed_sync(self.model, lambda: parent.embed_documents(texts, *args, **kwargs), site="embed")
+
+            async def aembed_documents(self, texts, *args, **kwargs):
+                parent = super()
+                return await governed(self.model, lambda: parent.aembed_documents(texts, *args, **kwargs), site="embed")
+
+        _GovernedEmbeddings = GovernedOpenAIEmbeddings
+    return _GovernedEmbeddings
+
+
 def _build_embeddings(
     embedding_model: str | None = None,
     api_key: str | None = None,
@@ -80,8 +109,7 @@ def _build_embeddings(
         return None
 
     try:
-        from langchain_openai import OpenAIEmbeddings as _OAIEmb
-        return _OAIEmb(
+        return _governed_embeddings_cls()(
             model=embedding_model,
             openai_api_key=api_key,
             openai_api_base=base_url,
@@ -263,6 +291,7 @@ class VectorStoreManager:
         if not self.is_available():
             return []
         
+        started = time.perf_counter()
         try:
             # Search with metadata filter if supported
             if self.store_type == "faiss" and FAISS_AVAILABLE:
@@ -305,6 +334,8 @@ class VectorStoreManager:
         except Exception as e:
             logger.error(f"Error searching company content: {e}", exc_info=True)
             return []
+        finally:
+            observe_vector_search(self.store_type, time.perf_counter() - started)
     
     def get_company_content(
         self,
@@ -3,6 +3,7 @@ Langfuse tracing integration for LangGraph agent workflows.
 Standard feature - automatically enabled when API keys are configured in .env.
 Provides observability and tracing for the blackboard architecture.
 """
+import asyncio
 from typing import Optional, List, Any
 from config import LANGFUSE_ENABLED, LANGFUSE_SECRET_KEY, LANGFUSE_PUBLIC_KEY, LANGFUSE_BASE_URL
 from logging_config import get_logger
@@ -29,7 +30,7 @@ def _initialize_langfuse() -> Optional[Any]:
         # CallbackHandler() automatically reads LANGFUSE_SECRET_KEY, LANGFUSE_PUBLIC_KEY, 
         # and LANGFUSE_HOST from os.environ (already set in config.py)
         # No parameters needed - matches the working pattern from user's code
-        handler = CallbackHandler()
+        handler = _cancellation_aware(CallbackHandler)()
         
         logger.info("Langfuse tracing initialized and enabled")
         return handler
@@ -47,6 +48,28 @@ def _initialize_langfuse() -> Optional[Any]:
         return None
 
 
+def _cancellation_aware(handler_cls):
+    """
+    Subclass *handler_cls* so cancelled chains end with ``{"cancelled": reason}``.
+
+    A generation stopped by the user or superseded by a newer request
+    (services/cancellation.py) unwinds the graph with CancelledError; the
+    trace should show the run as cancelled rather than as a failure.
+    """
+    class CancellationAwareHandler(handler_cls):
+        def on_chain_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+            if isinstance(error, asyncio.CancelledError):
+                return self.on_chain_end(
+                    {"cancelled": str(error) or "cancelled"},
+                    run_id=run_id,
+                    parent_run_id=parent_run_id,
+                    **kwargs,
+                )
+            return super().on_chain_error(error, run_id=run_id, parent_run_id=parent_run_id, **kwargs)
+
+    return CancellationAwareHandler
+
+
 def get_langfuse_callbacks() -> Optional[List[Any]]:
     """
     Get Langfuse callback handler as a list (for LangGraph/LangChain config).
@@ -2,6 +2,7 @@
 UI components for JobGenerationConfig settings.
 """
 import streamlit as st
+from config import RULER_TOURNAMENT_GROUP_SIZE
 from models.job_models import JobGenerationConfig
 
 
@@ -10,13 +11,18 @@ def render_ruler_rankings():
     rankings = st.session_state.get("last_ruler_rankings", [])
     best_score = st.session_state.get("last_ruler_score")
     num_candidates = st.session_state.get("last_ruler_num_candidates", 0)
+    judged = st.session_state.get("last_ruler_judged", True)
     
     if (rankings and len(rankings) > 0) or (best_score is not None) or (num_candidates > 0):
         st.markdown("---")
         st.header("📊 RULER Rankings")
         
         if best_score is not None:
-            st.metric("Best Score", f"{best_score:.3f}")
+            if judged:
+                st.metric("Best Score", f"{best_score:.3f}")
+            else:
+                st.metric("Best Pre-score", f"{best_score:.3f}")
+                st.caption("RULER judging was skipped (busy or out of time); candidates were ranked by the local pre-score.")
         
         if num_candidates > 0:
             st.caption(f"Evaluated {num_candidates} candidates")
@@ -64,6 +70,32 @@ def render_ruler_rankings():
             st.caption("No ranking details available for this run.")
 
 
+def render_generation_timings():
+    """Display per-node timings of the last generation in the sidebar if available."""
+    timings = st.session_state.get("last_timings")
+    if not timings or not timings.get("nodes"):
+        return
+
+    with st.expander("⏱️ Node Timings"):
+        st.caption(
+            f"Total {timings.get('total_ms', 0.0) / 1000:.2f} s · "
+            f"{timings.get('llm_calls', 0)} LLM calls · "
+            f"{timings.get('prompt_tokens', 0)} + {timings.get('completion_tokens', 0)} tokens · "
+            f"queue {timings.get('queue_ms', 0.0):.0f} ms"
+        )
+        for node, entry in timings["nodes"].items():
+            extras = []
+            if entry.get("cache_hits"):
+                extras.append(f"{entry['cache_hits']} cached")
+            if entry.get("retries"):
+                extras.append(f"{entry['retries']} retried")
+            st.markdown(
+                f"**{node}** — {entry.get('wall_ms', 0.0):.0f} ms"
+                + (f" · LLM {entry['llm_ms']:.0f} ms ({entry['llm_calls']} calls)" if entry.get("llm_calls") else "")
+                + (f" · {', '.join(extras)}" if extras else "")
+            )
+
+
 def _init_config_defaults():
     """Set default values for config widgets ONCE via setdefault.
 
@@ -73,6 +105,7 @@ def _init_config_defaults():
     """
     st.session_state.setdefault("use_advanced_generation", True)
     st.session_state.setdefault("use_ruler", False)
+    st.session_state.setdefault("ruler_auto_candidates", True)
     st.session_state.setdefault("ruler_num_candidates", 3)
     st.session_state.setdefault("config_language", "en")
     st.session_state.setdefault("config_formality", "neutral")
@@ -108,12 +141,21 @@ def render_config_sidebar():
         )
 
         if use_ruler:
+            auto_candidates = st.checkbox(
+                "Auto number of candidates",
+                key="ruler_auto_candidates",
+                help="Pick the candidate count from past RULER score spread for similar ads",
+            )
             st.slider(
                 "Number of Candidates",
                 min_value=2,
-                max_value=5,
+                max_value=12,
                 key="ruler_num_candidates",
-                help="More candidates = better quality but slower generation"
+                disabled=auto_candidates,
+                help=(
+                    "More candidates = better quality but slower generation "
+                    f"(above {RULER_TOURNAMENT_GROUP_SIZE} they are judged as a tournament)"
+                ),
             )
 
         st.markdown("---")
@@ -247,6 +289,7 @@ def render_config_sidebar():
         
         # Display RULER rankings if available
         render_ruler_rankings()
+        render_generation_timings()
 
 
 def render_config_expander():
@@ -76,26 +76,25 @@ def _run_async_with_progress(
     poll_interval: float = 0.25,
 ):
     """
-    Run an async coroutine in a background thread while polling progress
+    Run an async coroutine on the shared background loop while polling progress
     back into Streamlit's main thread – gives a tqdm-style live progress bar.
 
     *coro_factory* is  ``lambda cb: _run_eval_async(scenarios, progress_callback=cb)``
     so that the callback is wired into the coroutine **before** it starts.
     """
+    from services.event_loop import get_background_loop
+
     tracker = _ProgressTracker()
 
-    def _worker() -> None:
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(coro_factory(tracker.update))
-            loop.close()
-            tracker.finish(result=result)
-        except Exception as exc:
-            tracker.finish(error=exc)
+    def _finished(future) -> None:
+        if future.cancelled():
+            tracker.finish(error=RuntimeError("Evaluation cancelled"))
+        elif future.exception() is not None:
+            tracker.finish(error=future.exception())
+        else:
+            tracker.finish(result=future.result())
 
-    t = threading.Thread(target=_worker, daemon=True)
-    t.start()
+    get_background_loop().submit(coro_factory(tracker.update)).add_done_callback(_finished)
 
     # ── Poll progress from the main thread ──
     while True:
@@ -108,8 +107,6 @@ def _run_async_with_progress(
             break
         time.sleep(poll_interval)
 
-    t.join()
-
     if tracker.error:
         raise tracker.error
     return tracker.result
@@ -193,7 +190,13 @@ async def _run_eval_async(
     scenarios = [EvalScenario(**s) for s in scenarios_raw]
     total = len(scenarios)
 
-    semaphore = asyncio.Semaphore(5)
+    # Eval traffic yields to interactive generations; the adaptive governor
+    # (services/concurrency.py) sets the real LLM request rate.
+    from config import LLM_CONCURRENCY_MAX
+    from services.concurrency import Priority, llm_priority
+
+    llm_priority.set(Priority.BATCH)
+    semaphore = asyncio.Semaphore(LLM_CONCURRENCY_MAX)
     phase1_t0 = time.monotonic()
 
     # ── Phase 1: Generate JDs (60 % of the bar) ──
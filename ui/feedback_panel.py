@@ -9,6 +9,7 @@ from models.job_models import JobBody
 from config import DEFAULT_JOB_DATA
 from helpers.config_helper import get_job_config_from_session
 from llm_service import call_llm
+from services.graph_service import invalidate_cached_results
 
 
 def render_feedback_buttons(job_title: str, job_body_dict: dict):
@@ -52,6 +53,7 @@ def render_feedback_buttons(job_title: str, job_body_dict: dict):
                 output_data={"feedback_type": "accepted", "gold_id": gold_id},
                 job_title=job_title
             )
+            invalidate_cached_results(user_id)
             st.success("✅ Saved as gold standard!")
             st.rerun()
     
@@ -152,6 +154,7 @@ def render_feedback_buttons(job_title: str, job_body_dict: dict):
                         job_title=job_title
                     )
                     # Note: LangGraph store will be updated when graph runs with feedback_label="rejected"
+                    invalidate_cached_results(user_id)
                     st.success("Feedback saved. We'll avoid this in future generations.")
                     st.rerun()
                 else:
@@ -173,6 +176,7 @@ def render_feedback_buttons(job_title: str, job_body_dict: dict):
                         job_title=job_title
                     )
                     # Note: LangGraph store will be updated when graph runs with feedback_label="edited"
+                    invalidate_cached_results(user_id)
                     st.success("Edit feedback saved.")
                     st.rerun()
                 else:
@@ -211,6 +215,7 @@ def render_history_panel():
                     with col_delete:
                         if st.button("🗑️ Delete", key=f"delete_gold_{gs['id']}", use_container_width=True, type="secondary"):
                             if db.delete_gold_standard(gs['id'], user_id):
+                                invalidate_cached_results(user_id)
                                 st.success("Gold standard deleted!")
                                 st.rerun()
                             else:
@@ -230,6 +235,7 @@ def render_history_panel():
                     st.caption(f"Date: {fb['created_at']}")
                     if st.button("🗑️ Delete", key=f"delete_feedback_{fb['id']}", use_container_width=True, type="secondary"):
                         if db.delete_user_feedback(fb['id'], user_id):
+                            invalidate_cached_results(user_id)
                             st.success("Feedback deleted!")
                             st.rerun()
                         else:
@@ -104,99 +104,101 @@ def render_chat_input(handle_agent_chat):
         )
 
 
-def _run_async_stream(coro, on_item=None):
+def _run_async_stream(agen, on_item=None, on_idle=None, poll_s=0.25):
     """Helper to run async generators in Streamlit context.
 
     IMPORTANT: We must drain the async generator to completion.
     If we stop consuming early, LangGraph gets cancelled mid-run which shows up as
     ERROR/empty runs in tracing UIs (even if curator already yielded a result).
+    A run is stopped through its CancelToken instead (services/cancellation.py),
+    which graph_service reports as cancelled.
+
+    The generator is drained on the shared background loop (services/event_loop.py),
+    so pooled LLM clients and checkpointer connections are reused across reruns.
+    Items are handed back to this (script) thread, where ``on_item`` runs, and
+    ``on_idle`` is called every ``poll_s`` seconds without one.  Both touch
+    Streamlit elements, so a rerun (Stop button, a new Generate click) can
+    interrupt this call while the generation carries on until its token is
+    cancelled (see _supersede_generation).
+
+    Returns the final result item.
+    """
+    from services.event_loop import get_background_loop
+
+    return _consume_stream(get_background_loop().stream(agen, heartbeat_s=poll_s), on_item, on_idle)
+
+
+def _consume_stream(items, on_item=None, on_idle=None):
+    """Feed stream items (or ``HEARTBEAT`` while idle) to the UI callbacks; return the result."""
+    from services.event_loop import HEARTBEAT
+
+    final = None
+    for item in items:
+        if item is HEARTBEAT:
+            if on_idle:
+                on_idle()
+            continue
+        if on_item:
+            on_item(item)
+        # Accept both the legacy dict and typed result event
+        if isinstance(item, dict) and item.get("type") == "result":
+            final = item.get("data")
+        elif isinstance(item, dict) and "type" not in item:
+            final = item
+    return final
+
 
-    Returns the final result item. Optionally accepts an on_item callback for streaming UI updates.
+def _stop_generation():
+    """Stop button callback: cancel the generation streaming for this session."""
+    token = st.session_state.get("generation_cancel_token")
+    if token is not None:
+        token.cancel("stopped")
+
+
+def _supersede_generation():
+    """Cancel a generation whose script run was interrupted by this rerun.
+
+    Any rerun while a generation streams (a new Generate click, an edited
+    field) means nobody will consume its result, so its writer and judge
+    calls are cancelled.  The Stop button's callback runs first and wins.
     """
-    import asyncio
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If loop is running, use thread
-            import threading
-            
-            result = None
-            exception = None
-            
-            def run_in_thread():
-                nonlocal result, exception
-                try:
-                    new_loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(new_loop)
-                    async def get_first_and_drain():
-                        final = None
-                        async for item in coro:
-                            if on_item:
-                                on_item(item)
-                            # Accept both the legacy dict and typed result event
-                            if isinstance(item, dict) and item.get("type") == "result":
-                                final = item.get("data")
-                            elif isinstance(item, dict) and "type" not in item:
-                                final = item
-                        return final
-
-                    result = new_loop.run_until_complete(get_first_and_drain())
-                    new_loop.close()
-                except Exception as e:
-                    exception = e
-            
-            thread = threading.Thread(target=run_in_thread)
-            thread.start()
-            thread.join()
-            
-            if exception:
-                raise exception
-            return result
-        else:
-            async def get_first_and_drain():
-                final = None
-                async for item in coro:
-                    if on_item:
-                        on_item(item)
-                    if isinstance(item, dict) and item.get("type") == "result":
-                        final = item.get("data")
-                    elif isinstance(item, dict) and "type" not in item:
-                        final = item
-                return final
-
-            return loop.run_until_complete(get_first_and_drain())
-    except RuntimeError:
-        # No event loop, create one
-        async def get_first_and_drain():
-            final = None
-            async for item in coro:
-                if on_item:
-                    on_item(item)
-                if isinstance(item, dict) and item.get("type") == "result":
-                    final = item.get("data")
-                elif isinstance(item, dict) and "type" not in item:
-                    final = item
-            return final
-
-        return asyncio.run(get_first_and_drain())
+    token = st.session_state.pop("generation_cancel_token", None)
+    if token is not None:
+        token.cancel("superseded")
+        if token.reason == "stopped":
+            st.info("⏹ Generation stopped.")
 
 
 def render_content_editor():
     """Render the left column content editor."""
     st.subheader("Content editor")
+    # A generation still streaming from an interrupted run is stopped or superseded
+    _supersede_generation()
     
+    # Repeat requests are served from the result cache; tick to force a fresh run
+    regenerate = st.checkbox(
+        "🔁 Regenerate (skip cached result)",
+        key="regenerate_bypass_cache",
+        help="Identical requests return the cached result instantly. Tick to run the full workflow again.",
+    )
+
     # Generate full JD button (blackboard architecture always enabled)
     if st.button("🚀 Generate Full Job Description", use_container_width=True, type="primary", key="generate_full_jd"):
             job_title = st.session_state.get("job_headline", "")
             if job_title:
                 from services.graph_service import generate_with_graph_stream
-                from helpers.config_helper import get_job_config_from_session, update_session_from_job_body
+                from services.cancellation import CancelToken, GenerationCancelled
+                from config import JOB_QUEUE_ENABLED
+                from helpers.config_helper import (
+                    get_job_config_from_session, get_num_candidates_from_session, update_session_from_job_body,
+                )
                 from database.models import get_db_manager
                 import asyncio
                 
                 config = get_job_config_from_session()
                 use_ruler = st.session_state.get("use_ruler", False)
-                num_candidates = st.session_state.get("ruler_num_candidates", 3)
+                # None unless the user picked N; the adaptive policy decides otherwise
+                num_candidates = get_num_candidates_from_session()
                 user_id = st.session_state.get("user_id", "default")
                 
                 # Get company URLs from session state (if scraping is enabled)
@@ -204,11 +206,37 @@ def render_content_editor():
                 company_urls = get_company_urls_from_session()
                 
                 # Create status container for streaming updates
+                import time
                 status_container = st.empty()
+                ttft_container = st.empty()
+                draft_container = st.empty()
                 last_node = None
+                started_at = time.perf_counter()
+                ttft_ms = None
+                
+                # One cancel token per generation: the Stop button or any later rerun cancels it
+                if JOB_QUEUE_ENABLED:
+                    # Run by the job worker processes; this session follows the job's events
+                    from services.job_workers import submit_generation, JOB_PRIORITY_INTERACTIVE
+                    cancel_token = submit_generation(
+                        job_title,
+                        config,
+                        user_id=user_id,
+                        company_urls=company_urls if company_urls else None,
+                        regenerate=regenerate,
+                        num_candidates=num_candidates,
+                        priority=JOB_PRIORITY_INTERACTIVE,
+                    )
+                else:
+                    cancel_token = CancelToken()
+                st.session_state["generation_cancel_token"] = cancel_token
+                st.button("⏹ Stop generation", key="stop_generation", on_click=_stop_generation)
                 
                 if use_ruler:
-                    status_container.info(f"🔄 Generating with blackboard architecture and RULER ranking ({num_candidates} candidates)...")
+                    status_container.info(
+                        "🔄 Generating with blackboard architecture and RULER ranking "
+                        f"({num_candidates or 'auto'} candidates)..."
+                    )
                 else:
                     status_container.info("🔄 Generating with blackboard architecture (multi-expert workflow)...")
                 
@@ -217,9 +245,19 @@ def render_content_editor():
                     from services.graph_service import generate_with_graph_stream
                     
                     def handle_stream_item(item):
-                        nonlocal last_node
+                        nonlocal last_node, ttft_ms
                         if isinstance(item, dict):
-                            if item.get("type") == "progress":
+                            if ttft_ms is None and item.get("type") in ("first_token", "partial", "result"):
+                                # Time-to-first-token as the recruiter perceives it (click → first text)
+                                ttft_ms = (time.perf_counter() - started_at) * 1000
+                                ttft_container.caption(f"⚡ First tokens after {ttft_ms / 1000:.2f} s")
+                            if item.get("type") == "partial":
+                                # Live draft of the candidate being written (replaced by the winner)
+                                node_label = "Refining" if item.get("node") == "style_expert" else "Drafting"
+                                with draft_container.container():
+                                    st.caption(f"✍️ {node_label} (live draft)")
+                                    st.text(item.get("text", ""))
+                            elif item.get("type") == "progress":
                                 node = item.get("node")
                                 # Hide scrape progress when no scraping is enabled
                                 if node == "scrape_company" and not company_urls:
@@ -227,19 +265,48 @@ def render_content_editor():
                                 if node and node != last_node:
                                     status_container.info(f"🔄 {node}...")
                                     last_node = node
+                            elif item.get("type") == "retry":
+                                status_container.warning(
+                                    f"⚠️ Attempt {item.get('attempt')} failed, retrying in {item.get('delay_s', 0):.0f} s..."
+                                )
+
+                    def handle_idle():
+                        # Keeps the script responsive to Stop while a node is busy
+                        if last_node:
+                            elapsed_s = time.perf_counter() - started_at
+                            status_container.info(f"🔄 {last_node}... ({elapsed_s:.0f} s)")
 
                     # Stream generation with live progress updates
-                    job_dict = _run_async_stream(
-                        generate_with_graph_stream(
-                            job_title,
-                            config,
-                            user_id=user_id,
-                            company_urls=company_urls if company_urls else None,
-                        ),
-                        on_item=handle_stream_item,
-                    )
+                    if JOB_QUEUE_ENABLED:
+                        from services.job_workers import follow_job
+                        job_dict = _consume_stream(
+                            follow_job(cancel_token.job_id), on_item=handle_stream_item, on_idle=handle_idle
+                        )
+                    else:
+                        job_dict = _run_async_stream(
+                            generate_with_graph_stream(
+                                job_title,
+                                config,
+                                user_id=user_id,
+                                company_urls=company_urls if company_urls else None,
+                                regenerate=regenerate,
+                                num_candidates=num_candidates,
+                                cancel_token=cancel_token,
+                            ),
+                            on_item=handle_stream_item,
+                            on_idle=handle_idle,
+                        )
+                    st.session_state.pop("generation_cancel_token", None)
                     
+                    draft_container.empty()
                     if job_dict:
+                        total_ms = (time.perf_counter() - started_at) * 1000
+                        st.session_state["last_ttft_ms"] = ttft_ms
+                        st.session_state["last_generation_ms"] = total_ms
+                        if ttft_ms is not None:
+                            ttft_container.caption(
+                                f"⚡ First tokens after {ttft_ms / 1000:.2f} s · complete after {total_ms / 1000:.2f} s"
+                            )
                         # Update session state immediately as content streams in
                         update_session_from_job_body(job_dict)
                         
@@ -250,6 +317,8 @@ def render_content_editor():
                             st.session_state["last_ruler_score"] = job_dict.get("ruler_score")
                         if "ruler_num_candidates" in job_dict:
                             st.session_state["last_ruler_num_candidates"] = job_dict.get("ruler_num_candidates", 0)
+                        st.session_state["last_ruler_judged"] = job_dict.get("ruler_judged", True)
+                        st.session_state["last_timings"] = job_dict.get("timings")
                         
                         # Log interaction
                         db = get_db_manager()
@@ -258,18 +327,38 @@ def render_content_editor():
                             "generation",
                             input_data={"job_title": job_title, "config": config.model_dump()},
                             output_data=job_dict,
-                            metadata={"method": "blackboard", "ruler_score": job_dict.get("ruler_score")},
+                            metadata={
+                                "method": "blackboard",
+                                "ruler_score": job_dict.get("ruler_score"),
+                                "ruler_judged": job_dict.get("ruler_judged", True),
+                                "cache_hit": bool(job_dict.get("cache_hit")),
+                            },
                             job_title=job_title
                         )
                         
-                        if use_ruler:
-                            status_container.success(f"✅ Job description generated using RULER (best of {num_candidates} candidates)!")
+                        shed = job_dict.get("load_shed") or {}
+                        if job_dict.get("cache_hit"):
+                            status_container.success("✅ Loaded identical job description from cache (tick Regenerate for a fresh run).")
+                        elif shed.get("tier"):
+                            status_container.warning(f"⚠️ Generated in reduced mode ({shed.get('name')}) because the service is busy.")
+                        elif use_ruler and job_dict.get("ruler_judged", True):
+                            status_container.success(
+                                "✅ Job description generated using RULER "
+                                f"(best of {job_dict.get('ruler_num_candidates') or num_candidates} candidates)!"
+                            )
+                        elif use_ruler:
+                            status_container.success("✅ Job description generated (RULER judging skipped, ranked by local pre-score).")
                         else:
                             status_container.success("✅ Job description generated!")
                     else:
                         status_container.error("❌ No result generated")
                     
+                except GenerationCancelled as e:
+                    st.session_state.pop("generation_cancel_token", None)
+                    draft_container.empty()
+                    status_container.info(f"⏹ Generation {e.reason}.")
                 except Exception as e:
+                    st.session_state.pop("generation_cancel_token", None)
                     status_container.error(f"❌ Generation failed: {str(e)}")
                     st.exception(e)
             else:
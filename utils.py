@@ -1,5 +1,9 @@
+import hashlib
+import json
 import re
 
+from pydantic import BaseModel
+
 from models.job_models import JobBody
 
 
@@ -75,3 +79,33 @@ def _parse_bullets(text: str) -> list[str]:
     # Remove bullet markers if present (reuse the shared regex helper)
     cleaned = [strip_bullet_prefix(l) for l in lines]
     return [c for c in cleaned if c]
+
+
+# ── canonical hashing ────────────────────────────────────────────────
+# Used for request fingerprints (singleflight / result caches): two requests
+# that only differ in dict ordering or pydantic-vs-dict form hash the same.
+
+def _to_canonical(value):
+    if isinstance(value, BaseModel):
+        return _to_canonical(value.model_dump(mode="json"))
+    if isinstance(value, dict):
+        return {str(k): _to_canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_canonical(v) for v in value]
+    return value
+
+
+def canonical_json(value) -> str:
+    """Serialize *value* (dicts, lists, pydantic models) deterministically."""
+    return json.dumps(
+        _to_canonical(value),
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+
+
+def stable_hash(value) -> str:
+    """SHA-256 hex digest of ``canonical_json(value)``."""
+    return hashlib.sha256(canonical_json(value).encode("utf-8")).hexdigest()